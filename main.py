@@ -1,10 +1,20 @@
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QCoreApplication
 from src.gui.main_window import MainWindow
+from src.gui.maintenance import create_maintenance_scheduler
 from src.utils.logger import get_logger, setup_logging
 from src.utils.config import load_config
 
+def run_headless():
+    """Executa apenas o agendador de manutenção, sem interface"""
+    app = QCoreApplication(sys.argv)
+    scheduler = create_maintenance_scheduler()
+    scheduler.start()
+    return app.exec_()
+
 def main():
     # Configura o logging
     setup_logging()
@@ -14,6 +24,10 @@ def main():
         # Carrega a configuração
         config = load_config()
         
+        # Modo sem janela (ex.: tarefa agendada do Windows)
+        if '--headless' in sys.argv:
+            sys.exit(run_headless())
+        
         # Cria a aplicação
         app = QApplication(sys.argv)
         
@@ -29,4 +43,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Necessário para os pools de processos no executável empacotado
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -14,6 +14,9 @@ from .tabs.backup_tab import BackupTab
 from .tabs.tools_tab import ToolsTab
 from .tabs.settings_tab import SettingsTab
 from .tabs.documents_tab import DocumentsTab
+from .tabs.disk_tab import DiskTab
+from .tabs.processes_tab import ProcessesTab
+from .tabs.logs_tab import LogsTab
 from ..utils.themes import set_theme, ThemeManager
 from ..utils.updater import UpdateWorker
 from ..utils.logger import get_logger
@@ -21,6 +24,8 @@ from ..utils.report import export_report
 from ..utils.i18n import get_i18n, _
 from ..utils.config import get_config_value, update_config
 from ..utils.theme import apply_theme
+from .maintenance import create_maintenance_scheduler
+from ..utils.process_governor import get_process_governor
 from ..version import get_version
 import os
 import sys
@@ -61,6 +66,16 @@ class MainWindow(QMainWindow):
         if self.config.get('update_check', True):
             self.check_for_updates()
         
+        # Inicia o agendador de backup e limpeza automáticos
+        self.scheduler = create_maintenance_scheduler(self)
+        self.scheduler.job_started.connect(self.maintenance_started)
+        self.scheduler.job_finished.connect(self.maintenance_finished)
+        self.scheduler.start()
+        
+        # Mantém as prioridades de processos definidas pelas regras
+        if get_config_value('process_governor.enabled', False):
+            get_process_governor().start()
+        
     def setup_ui(self):
         """Configura a interface da janela principal."""
         # Cria o widget de abas
@@ -78,6 +93,9 @@ class MainWindow(QMainWindow):
         self.monitoring_tab = MonitoringTab()
         self.settings_tab = SettingsTab()
         self.documents_tab = DocumentsTab()
+        self.disk_tab = DiskTab()
+        self.processes_tab = ProcessesTab()
+        self.logs_tab = LogsTab()
         
         # Mapeia o nome da classe para a chave de tradução
         self.tab_translations = {
@@ -90,17 +108,23 @@ class MainWindow(QMainWindow):
             'AboutTab': 'about',
             'MonitoringTab': 'monitoring',
             'SettingsTab': 'settings',
-            'DocumentsTab': 'documents'
+            'DocumentsTab': 'documents',
+            'DiskTab': 'disk',
+            'ProcessesTab': 'processes',
+            'LogsTab': 'logs'
         }
         
         # Adiciona as abas com suas traduções
         self.tabs.addTab(self.system_tab, _("tabs.system"))
         self.tabs.addTab(self.tools_tab, _("tabs.tools"))
+        self.tabs.addTab(self.disk_tab, _("tabs.disk"))
         self.tabs.addTab(self.updates_tab, _("tabs.updates"))
         self.tabs.addTab(self.software_tab, _("tabs.software"))
         self.tabs.addTab(self.domain_tab, _("tabs.domain"))
         self.tabs.addTab(self.backup_tab, _("tabs.backup"))
         self.tabs.addTab(self.monitoring_tab, _("tabs.monitoring"))
+        self.tabs.addTab(self.processes_tab, _("tabs.processes"))
+        self.tabs.addTab(self.logs_tab, _("tabs.logs"))
         self.tabs.addTab(self.about_tab, _("tabs.about"))
         self.tabs.addTab(self.settings_tab, _("tabs.settings"))
         self.tabs.addTab(self.documents_tab, _("tabs.documents"))
@@ -197,7 +221,8 @@ class MainWindow(QMainWindow):
             for tab in [self.system_tab, self.tools_tab, self.updates_tab, 
                        self.software_tab, self.domain_tab, self.backup_tab, 
                        self.about_tab, self.monitoring_tab, self.settings_tab, 
-                       self.documents_tab]:
+                       self.documents_tab, self.disk_tab, self.processes_tab,
+                       self.logs_tab]:
                 if hasattr(tab, 'update_translations'):
                     tab.update_translations()
         
@@ -206,6 +231,21 @@ class MainWindow(QMainWindow):
         set_theme(theme)
         self.config['theme'] = theme
         
+    def maintenance_title(self, job):
+        """Retorna o nome traduzido de uma tarefa de manutenção"""
+        keys = {'backup': "tabs.backup", 'cleanup': "tools.cleanup_group",
+                'quarantine': "tools.quarantine_title"}
+        return _(keys.get(job, job))
+        
+    def maintenance_started(self, job):
+        """Mostra na barra de status a tarefa automática em execução"""
+        self.status_bar.showMessage(_("status.job_started").format(job=self.maintenance_title(job)))
+        
+    def maintenance_finished(self, job, success):
+        """Mostra na barra de status o resultado de uma tarefa automática"""
+        key = "status.job_finished" if success else "status.job_failed"
+        self.status_bar.showMessage(_(key).format(job=self.maintenance_title(job)))
+        
     def check_for_updates(self):
         """Verifica se há atualizações disponíveis"""
         self.status_bar.showMessage(_("status.processing"))
@@ -352,6 +392,7 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            get_process_governor().stop()
             event.accept()
         else:
             event.ignore()
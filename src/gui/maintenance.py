@@ -0,0 +1,57 @@
+"""
+Tarefas de manutenção automática do ADF System Manager.
+
+Liga as configurações backup.auto_backup, cleanup.auto_cleanup e
+cleanup.quarantine aos workers de backup, limpeza e expiração da quarentena,
+tanto na interface quanto no modo sem janela.
+"""
+
+import os
+import psutil
+from ..utils.logger import get_logger
+from ..utils.config import get_config_value
+from ..utils.scheduler import MaintenanceScheduler, get_system_drive
+from .tabs.backup_tab import BackupWorker
+from .tabs.tools_tab import CleanupWorker, QuarantinePurgeWorker
+
+logger = get_logger(__name__)
+
+
+def create_backup_worker():
+    """Cria o worker do backup automático com as últimas origens usadas"""
+    destination = get_config_value('backup.backup_path', '')
+    sources = [path for path in get_config_value('backup.sources', []) if os.path.isdir(path)]
+
+    if not destination or not os.path.isdir(destination) or not sources:
+        logger.warning("Backup automático ignorado: origem ou destino não configurados")
+        return None
+
+    return BackupWorker(
+        sources,
+        destination,
+        get_config_value('backup.compress_backup', True),
+        get_config_value('backup.deduplicate', False),
+        get_config_value('backup.compression_algorithm', 'deflate'),
+        get_config_value('backup.compression_level', 6),
+        get_config_value('backup.verify_after_backup', False)
+    )
+
+
+def is_low_on_space():
+    """Indica se a unidade do sistema está abaixo de cleanup.min_free_space"""
+    min_free = get_config_value('cleanup.min_free_space', 10) * 1024 ** 3
+    return psutil.disk_usage(get_system_drive()).free < min_free
+
+
+def create_maintenance_scheduler(parent=None):
+    """Cria o agendador com as tarefas de backup, limpeza e quarentena registradas"""
+    scheduler = MaintenanceScheduler(parent)
+    scheduler.register_job('backup', create_backup_worker,
+                           'backup.auto_backup', 'backup.backup_interval')
+    scheduler.register_job('cleanup', CleanupWorker,
+                           'cleanup.auto_cleanup', 'cleanup.cleanup_interval',
+                           urgent=is_low_on_space)
+    scheduler.register_job('quarantine', QuarantinePurgeWorker,
+                           'cleanup.quarantine', 'cleanup.quarantine_interval',
+                           urgent=is_low_on_space)
+    return scheduler
@@ -1,14 +1,28 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                             QPushButton, QLabel, QProgressBar,
-                            QFileDialog, QCheckBox, QSpinBox,
+                            QFileDialog, QCheckBox, QSpinBox, QComboBox,
                             QGroupBox, QFormLayout, QMessageBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import os
 import shutil
+import threading
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from ...utils.logger import get_logger
+from ...utils.logger import get_logger, LogManager
 from ...utils.config import get_config_value, update_config
+from ...utils.chunkstore import ChunkStore, STORE_DIR_NAME
+from ...utils.compression import CompressionPolicy, COMPRESSION_METHODS
+from ...utils.backup_manifest import write_manifest
+from ...utils.retention import apply_retention, RETENTION_MODES
+from ...utils.archive_index import load_archive_index, select_entries
+from ...utils.backup_verify import verify_backup
+from ...utils.hashing import get_hash_service
+from ...utils.fastcopy import ParallelCopier, find_incomplete_copies, PARTIAL_SUFFIX, COPY_JOURNAL_NAME
+from ...utils.governor import JobGovernor, lower_thread_priority
+from ...utils.scheduler import record_job_run
+from ..viewers.archive_browser import ArchiveBrowser
 from ...utils.i18n import _
 from .base_tab import BaseTab
 
@@ -18,22 +32,42 @@ class BackupWorker(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal(bool, str)
     
-    def __init__(self, source_paths, destination, compress=True):
+    def __init__(self, source_paths, destination, compress=True, deduplicate=False,
+                 algorithm='deflate', level=6, verify=False, resume_path=None):
         super().__init__()
         self.source_paths = source_paths
         self.destination = destination
         self.compress = compress
+        self.deduplicate = deduplicate
+        self.verify = verify
+        self.resume_path = resume_path
+        self._last_progress = -1
+        self.policy = CompressionPolicy(algorithm, level)
+        self.governor = JobGovernor('backup')
         
     def run(self):
+        # Prioridade baixa e limites de taxa durante todo o backup
+        with self.governor:
+            self.run_backup()
+        
+    def run_backup(self):
         try:
             # Cria pasta de backup com data
             backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             backup_path = os.path.join(self.destination, backup_name)
             
-            if self.compress:
+            if self.deduplicate:
+                # Backup deduplicado em repositório de blocos
+                store = ChunkStore(os.path.join(self.destination, STORE_DIR_NAME))
+                store.create_snapshot(backup_name, self.source_paths, self.progress.emit,
+                                      policy=self.policy, governor=self.governor)
+                result_path = os.path.join(store.snapshots_dir, f"{backup_name}.json")
+                
+            elif self.compress:
                 # Backup compactado
                 zip_path = f"{backup_path}.zip"
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                manifest_files = {}
+                with zipfile.ZipFile(zip_path, 'w', self.policy.method) as zipf:
                     total_files = sum([len(files) for path in self.source_paths 
                                      for _, _, files in os.walk(path)])
                     processed_files = 0
@@ -43,33 +77,306 @@ class BackupWorker(QThread):
                             for file in files:
                                 file_path = os.path.join(root, file)
                                 arcname = os.path.relpath(file_path, os.path.dirname(source))
-                                zipf.write(file_path, arcname)
+                                zinfo, digest = self.policy.write(zipf, file_path, arcname,
+                                                                  self.governor)
+                                manifest_files[zinfo.filename] = {
+                                    'size': zinfo.file_size,
+                                    'mtime_ns': os.stat(file_path).st_mtime_ns,
+                                    'sha256': digest
+                                }
                                 
                                 processed_files += 1
                                 progress = int((processed_files / total_files) * 100)
                                 self.progress.emit(progress)
+                
+                write_manifest(zip_path, 'zip', self.source_paths, manifest_files,
+                               self.policy.stats)
+                result_path = zip_path
+                
+                # Estatísticas de compressão por tipo de arquivo
+                for line in self.policy.summary():
+                    LogManager.log_backup_operation("compressão", backup_name, line)
                                 
             else:
-                # Backup normal
-                os.makedirs(backup_path)
-                total_files = sum([len(files) for path in self.source_paths 
-                                 for _, _, files in os.walk(path)])
-                processed_files = 0
+                # Backup normal, com cópias paralelas e retomada de cópias interrompidas
+                if self.resume_path:
+                    backup_path = self.resume_path
+                    backup_name = os.path.basename(backup_path)
                 
-                for source in self.source_paths:
-                    dest = os.path.join(backup_path, os.path.basename(source))
-                    shutil.copytree(source, dest)
-                    
-                    for _, _, files in os.walk(source):
-                        processed_files += len(files)
-                        progress = int((processed_files / total_files) * 100)
-                        self.progress.emit(progress)
+                copier = ParallelCopier(self.source_paths, backup_path,
+                                        progress_callback=self.copy_progress,
+                                        governor=self.governor)
+                stats = copier.run()
+                if stats['errors']:
+                    raise IOError(f"{stats['errors']} arquivos não foram copiados; o backup pode ser retomado")
+                
+                manifest_files = {}
+                hash_futures = {}
+                hash_service = get_hash_service()
+                
+                for root, _, files in os.walk(backup_path):
+                    for file in files:
+                        # Restos de uma execução anterior não fazem parte do backup
+                        if file.endswith(PARTIAL_SUFFIX) or file == COPY_JOURNAL_NAME:
+                            continue
+                        file_path = os.path.join(root, file)
+                        st = os.stat(file_path)
+                        arcname = os.path.relpath(file_path, backup_path).replace(os.sep, '/')
+                        manifest_files[arcname] = {
+                            'size': st.st_size,
+                            'mtime_ns': st.st_mtime_ns
+                        }
+                        # Hash das cópias calculado em paralelo
+                        hash_futures[arcname] = hash_service.hash_file(
+                            file_path, progress_callback=lambda size: self.governor.transfer(read=size)
+                        )
+                
+                for arcname, future in hash_futures.items():
+                    manifest_files[arcname]['sha256'] = future.result()
+                
+                write_manifest(backup_path, 'folder', self.source_paths, manifest_files)
+                result_path = backup_path
+            
+            # Um backup corrompido não deve apagar os anteriores pela retenção
+            if self.verify:
+                result = verify_backup(result_path, governor=self.governor)
+                if not result['ok']:
+                    failure = result['first_failure']
+                    self.finished.emit(False, f"{failure['name']}: {failure['reason']}")
+                    return
+            
+            self.apply_retention()
                         
             self.finished.emit(True, "Backup concluído com sucesso!")
             
         except Exception as e:
             logger.error(f"Erro durante o backup: {e}")
             self.finished.emit(False, f"Erro durante o backup: {str(e)}")
+    
+    def copy_progress(self, done_bytes, total_bytes):
+        """Converte o progresso da cópia em bytes para porcentagem"""
+        progress = int(done_bytes * 100 / total_bytes) if total_bytes else 100
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self.progress.emit(progress)
+    
+    def apply_retention(self):
+        """Remove os backups antigos conforme a política configurada"""
+        try:
+            result = apply_retention(
+                self.destination,
+                mode=get_config_value('backup.retention_mode', 'count'),
+                max_backups=get_config_value('backup.max_backups', 5),
+                daily=get_config_value('backup.keep_daily', 7),
+                weekly=get_config_value('backup.keep_weekly', 4),
+                monthly=get_config_value('backup.keep_monthly', 12)
+            )
+            if result['deleted']:
+                logger.info(
+                    f"Retenção: {len(result['deleted'])} backups removidos, "
+                    f"{result['space_freed']} bytes liberados"
+                )
+        except Exception as e:
+            # Falha na retenção não invalida o backup concluído
+            logger.error(f"Erro ao aplicar retenção de backups: {e}")
+
+class VerifyWorker(QThread):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(bool, str)
+    
+    def __init__(self, backup_path):
+        super().__init__()
+        self.backup_path = backup_path
+        self.governor = JobGovernor('verify')
+        
+    def run(self):
+        with self.governor:
+            self.run_verify()
+        
+    def run_verify(self):
+        try:
+            result = verify_backup(self.backup_path, self.progress.emit, self.governor)
+            message = _("backup.verify_summary").format(
+                files=result['files'],
+                seconds=result['seconds'],
+                throughput=result['throughput'] / (1024 * 1024)
+            )
+            if result['first_failure']:
+                message += "\n" + _("backup.verify_failure").format(
+                    failures=result['failures'], **result['first_failure']
+                )
+            self.finished.emit(result['ok'], message)
+        except Exception as e:
+            logger.error(f"Erro ao verificar backup: {e}")
+            self.finished.emit(False, str(e))
+
+class ArchiveIndexWorker(QThread):
+    """Carrega o índice de conteúdo de um backup fora da thread da interface"""
+    finished = pyqtSignal(list, str)
+    
+    def __init__(self, archive_path):
+        super().__init__()
+        self.archive_path = archive_path
+        
+    def run(self):
+        try:
+            self.finished.emit(load_archive_index(self.archive_path), "")
+        except Exception as e:
+            logger.error(f"Erro ao ler o conteúdo do backup: {e}")
+            self.finished.emit([], str(e))
+
+class RestoreWorker(QThread):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(bool, str)
+    
+    # Tamanho dos blocos copiados ao extrair
+    BUFFER_SIZE = 1024 * 1024
+    
+    def __init__(self, archive_path, entries, target, max_workers=None):
+        super().__init__()
+        self.archive_path = archive_path
+        self.entries = entries
+        self.target = os.path.abspath(target)
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.result = {'restored': 0, 'skipped': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open_archives = []
+        self._done_bytes = 0
+        self._total_bytes = 0
+        self._last_progress = -1
+        self.governor = JobGovernor('restore')
+        
+    def run(self):
+        with self.governor:
+            self.run_restore()
+        
+    def run_restore(self):
+        try:
+            self._total_bytes = sum(entry['size'] for entry in self.entries)
+            
+            if self.archive_path.endswith('.json'):
+                # Snapshot do repositório deduplicado
+                store = ChunkStore(os.path.dirname(os.path.dirname(self.archive_path)))
+                result = store.restore_snapshot(
+                    os.path.splitext(os.path.basename(self.archive_path))[0],
+                    self.target,
+                    files={entry['name'] for entry in self.entries},
+                    skip_unchanged=True,
+                    progress_callback=self._write_progress
+                )
+                self.result.update(result)
+            else:
+                # Extração em paralelo, cada thread com o seu handle do zip
+                with ThreadPoolExecutor(max_workers=self.max_workers,
+                                        initializer=lower_thread_priority) as executor:
+                    list(executor.map(self.restore_entry, self.entries))
+                for archive in self._open_archives:
+                    archive.close()
+            
+            message = _("backup.restore_summary").format(**self.result)
+            failed = self.result.get('failed')
+            if failed:
+                # Os primeiros na mensagem; a lista completa fica no log
+                message += "\n" + _("backup.restore_failed").format(
+                    files=", ".join(failed[:10]) + (", ..." if len(failed) > 10 else "")
+                )
+            LogManager.log_backup_operation("restauração", os.path.basename(self.archive_path), message)
+            self.finished.emit(self.result['errors'] == 0, message)
+            
+        except Exception as e:
+            logger.error(f"Erro ao restaurar backup: {e}")
+            self.finished.emit(False, str(e))
+    
+    def _archive(self):
+        """Retorna o ZipFile da thread atual"""
+        archive = getattr(self._local, 'archive', None)
+        if archive is None:
+            archive = zipfile.ZipFile(self.archive_path, 'r')
+            self._local.archive = archive
+            with self._lock:
+                self._open_archives.append(archive)
+        return archive
+    
+    def _advance(self, size):
+        """Atualiza o progresso em bytes"""
+        with self._lock:
+            self._done_bytes += size
+            progress = int(self._done_bytes * 100 / self._total_bytes) if self._total_bytes else 100
+            if progress == self._last_progress:
+                return
+            self._last_progress = progress
+        self.progress.emit(progress)
+    
+    def _write_progress(self, size):
+        """Aplica os limites de gravação e atualiza o progresso"""
+        self.governor.transfer(written=size)
+        self._advance(size)
+    
+    def _count(self, key):
+        with self._lock:
+            self.result[key] += 1
+    
+    def target_path(self, name):
+        """Resolve o destino de uma entrada impedindo caminhos fora do alvo"""
+        parts = [part for part in name.split('/') if part not in ('', '.', '..')]
+        path = os.path.abspath(os.path.join(self.target, *parts))
+        if os.path.commonpath([path, self.target]) != self.target:
+            raise ValueError(f"Caminho inválido no backup: {name}")
+        return path
+    
+    def is_unchanged(self, path, entry):
+        """Verifica se o arquivo existente já é igual ao do backup"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        
+        # Datas do zip têm resolução de 2 segundos
+        if st.st_size != entry['size'] or abs(st.st_mtime - entry['mtime']) > 2:
+            return False
+        
+        crc = 0
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(self.BUFFER_SIZE)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+        return crc == entry['crc']
+    
+    def restore_entry(self, entry):
+        """Extrai uma entrada do zip, se necessário"""
+        tmp_path = None
+        try:
+            path = self.target_path(entry['name'])
+            if self.is_unchanged(path, entry):
+                self._count('skipped')
+                self._advance(entry['size'])
+                return
+            
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.adf_restore"
+            with self._archive().open(entry['name']) as src, open(tmp_path, 'wb') as dest:
+                while True:
+                    block = src.read(self.BUFFER_SIZE)
+                    if not block:
+                        break
+                    dest.write(block)
+                    self._write_progress(len(block))
+            os.replace(tmp_path, path)
+            os.utime(path, (entry['mtime'], entry['mtime']))
+            self._count('restored')
+            
+        except Exception as e:
+            logger.warning(f"Erro ao restaurar {entry['name']}: {e}")
+            # Não deixa o arquivo parcial ao lado do destino
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            self._count('errors')
 
 class BackupTab(BaseTab):
     def __init__(self):
@@ -115,6 +422,65 @@ class BackupTab(BaseTab):
         self.compress_label = QLabel()
         config_layout.addRow(self.compress_label, self.compress_backup)
         
+        # Algoritmo de compressão
+        self.compression_algorithm = QComboBox()
+        self.compression_algorithm.addItems(list(COMPRESSION_METHODS))
+        self.compression_algorithm.setCurrentText(
+            get_config_value('backup.compression_algorithm', 'deflate')
+        )
+        self.compression_algorithm.currentTextChanged.connect(
+            lambda value: update_config('backup.compression_algorithm', value)
+        )
+        self.algorithm_label = QLabel()
+        config_layout.addRow(self.algorithm_label, self.compression_algorithm)
+        
+        # Nível de compressão
+        self.compression_level = QSpinBox()
+        self.compression_level.setRange(1, 9)
+        self.compression_level.setValue(get_config_value('backup.compression_level', 6))
+        self.compression_level.valueChanged.connect(
+            lambda value: update_config('backup.compression_level', value)
+        )
+        self.level_label = QLabel()
+        config_layout.addRow(self.level_label, self.compression_level)
+        
+        # Retenção
+        self.retention_mode = QComboBox()
+        self.retention_mode.addItems(list(RETENTION_MODES))
+        self.retention_mode.setCurrentText(get_config_value('backup.retention_mode', 'count'))
+        self.retention_mode.currentTextChanged.connect(
+            lambda value: update_config('backup.retention_mode', value)
+        )
+        self.retention_label = QLabel()
+        config_layout.addRow(self.retention_label, self.retention_mode)
+        
+        self.max_backups = QSpinBox()
+        self.max_backups.setRange(1, 365)
+        self.max_backups.setValue(get_config_value('backup.max_backups', 5))
+        self.max_backups.valueChanged.connect(
+            lambda value: update_config('backup.max_backups', value)
+        )
+        self.max_backups_label = QLabel()
+        config_layout.addRow(self.max_backups_label, self.max_backups)
+        
+        # Deduplicação
+        self.deduplicate_backup = QCheckBox()
+        self.deduplicate_backup.setChecked(get_config_value('backup.deduplicate', False))
+        self.deduplicate_backup.stateChanged.connect(
+            lambda state: update_config('backup.deduplicate', bool(state))
+        )
+        self.deduplicate_label = QLabel()
+        config_layout.addRow(self.deduplicate_label, self.deduplicate_backup)
+        
+        # Verificação após o backup
+        self.verify_after_backup = QCheckBox()
+        self.verify_after_backup.setChecked(get_config_value('backup.verify_after_backup', False))
+        self.verify_after_backup.stateChanged.connect(
+            lambda state: update_config('backup.verify_after_backup', bool(state))
+        )
+        self.verify_after_label = QLabel()
+        config_layout.addRow(self.verify_after_label, self.verify_after_backup)
+        
         self.config_group.setLayout(config_layout)
         layout.addWidget(self.config_group)
         
@@ -152,6 +518,10 @@ class BackupTab(BaseTab):
         self.restore_btn.clicked.connect(self.restore_backup)
         button_layout.addWidget(self.restore_btn)
         
+        self.verify_btn = QPushButton()
+        self.verify_btn.clicked.connect(self.verify_backup)
+        button_layout.addWidget(self.verify_btn)
+        
         layout.addLayout(button_layout)
         
         # Barra de progresso
@@ -168,6 +538,11 @@ class BackupTab(BaseTab):
         self.auto_backup_label.setText(_("backup.auto_backup"))
         self.interval_label.setText(_("backup.interval"))
         self.compress_label.setText(_("backup.compress"))
+        self.algorithm_label.setText(_("backup.compression_algorithm"))
+        self.level_label.setText(_("backup.compression_level"))
+        self.retention_label.setText(_("backup.retention_mode"))
+        self.max_backups_label.setText(_("backup.max_backups"))
+        self.deduplicate_label.setText(_("backup.deduplicate"))
         
         self.folders_group.setTitle(_("backup.folders"))
         self.desktop_check.setText(_("backup.desktop"))
@@ -177,6 +552,8 @@ class BackupTab(BaseTab):
         
         self.backup_btn.setText(_("backup.start"))
         self.restore_btn.setText(_("backup.restore"))
+        self.verify_btn.setText(_("backup.verify"))
+        self.verify_after_label.setText(_("backup.verify_after_backup"))
         
     def start_backup(self):
         """Inicia o processo de backup"""
@@ -206,27 +583,55 @@ class BackupTab(BaseTab):
         )
         
         if destination:
+            # O backup automático reutiliza a última origem e destino
+            update_config('backup.backup_path', destination)
+            update_config('backup.sources', selected_paths)
+            
+            # Oferece retomar uma cópia sem compressão interrompida
+            resume_path = None
+            if not self.compress_backup.isChecked() and not self.deduplicate_backup.isChecked():
+                incomplete = find_incomplete_copies(destination)
+                if incomplete:
+                    reply = QMessageBox.question(
+                        self, _("backup.resume_title"),
+                        _("backup.resume_question").format(name=os.path.basename(incomplete[-1])),
+                        QMessageBox.Yes | QMessageBox.No
+                    )
+                    if reply == QMessageBox.Yes:
+                        resume_path = incomplete[-1]
+            
             self.progress_bar.show()
-            self.backup_btn.setEnabled(False)
-            self.restore_btn.setEnabled(False)
+            self.set_buttons_enabled(False)
             
             # Inicia o worker
             self.worker = BackupWorker(
                 selected_paths,
                 destination,
-                self.compress_backup.isChecked()
+                self.compress_backup.isChecked(),
+                self.deduplicate_backup.isChecked(),
+                self.compression_algorithm.currentText(),
+                self.compression_level.value(),
+                self.verify_after_backup.isChecked(),
+                resume_path
             )
             self.worker.progress.connect(self.progress_bar.setValue)
             self.worker.finished.connect(self.backup_finished)
             self.worker.start()
             
+    def set_buttons_enabled(self, enabled):
+        """Habilita ou desabilita as ações enquanto um worker executa"""
+        self.backup_btn.setEnabled(enabled)
+        self.restore_btn.setEnabled(enabled)
+        self.verify_btn.setEnabled(enabled)
+        
     def backup_finished(self, success, message):
         """Callback quando o backup é concluído"""
         self.progress_bar.hide()
-        self.backup_btn.setEnabled(True)
-        self.restore_btn.setEnabled(True)
+        self.set_buttons_enabled(True)
         
         if success:
+            # O backup automático usa as mesmas origens: o próximo conta a partir deste
+            record_job_run('backup')
             QMessageBox.information(self, _("backup.success"), _("backup.backup_success"))
         else:
             QMessageBox.warning(self, _("backup.error"), _("backup.backup_error").format(error=message))
@@ -237,25 +642,88 @@ class BackupTab(BaseTab):
         backup_file = QFileDialog.getOpenFileName(
             self, _("backup.select_backup"),
             os.path.expanduser('~'),
-            "Arquivos ZIP (*.zip);;Todos os arquivos (*.*)"
+            "Arquivos ZIP (*.zip);;Snapshots deduplicados (*.json);;Todos os arquivos (*.*)"
         )[0]
         
         if backup_file:
-            reply = QMessageBox.question(
-                self,
-                _("backup.confirm_restore"),
-                _("backup.restore_warning"),
-                QMessageBox.Yes | QMessageBox.No
+            # O índice é lido em segundo plano e reaproveitado do cache
+            self.set_buttons_enabled(False)
+            self.index_worker = ArchiveIndexWorker(backup_file)
+            self.index_worker.finished.connect(
+                lambda entries, error: self.show_archive_browser(backup_file, entries, error)
             )
+            self.index_worker.start()
             
-            if reply == QMessageBox.Yes:
-                try:
-                    # Extrai o backup
-                    with zipfile.ZipFile(backup_file, 'r') as zip_ref:
-                        zip_ref.extractall(os.path.expanduser('~'))
-                        
-                    QMessageBox.information(self, _("backup.success"), _("backup.restore_success"))
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao restaurar backup: {e}")
-                    QMessageBox.warning(self, _("backup.error"), _("backup.restore_error").format(error=str(e))) 
\ No newline at end of file
+    def show_archive_browser(self, backup_file, entries, error):
+        """Mostra o conteúdo do backup para escolher o que restaurar"""
+        self.set_buttons_enabled(True)
+        
+        if error:
+            QMessageBox.warning(self, _("backup.error"), _("backup.restore_error").format(error=error))
+            return
+        
+        browser = ArchiveBrowser(entries, self)
+        if browser.exec_() != ArchiveBrowser.Accepted:
+            return
+        
+        selected = select_entries(entries, browser.selected_paths())
+        if not selected:
+            QMessageBox.warning(self, _("backup.warning"), _("backup.select_files"))
+            return
+        
+        reply = QMessageBox.question(
+            self,
+            _("backup.confirm_restore"),
+            _("backup.restore_warning"),
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply == QMessageBox.Yes:
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+            self.set_buttons_enabled(False)
+            
+            self.restore_worker = RestoreWorker(backup_file, selected, os.path.expanduser('~'))
+            self.restore_worker.progress.connect(self.progress_bar.setValue)
+            self.restore_worker.finished.connect(self.restore_finished)
+            self.restore_worker.start()
+            
+    def restore_finished(self, success, message):
+        """Callback quando a restauração é concluída"""
+        self.progress_bar.hide()
+        self.set_buttons_enabled(True)
+        
+        if success:
+            QMessageBox.information(
+                self, _("backup.success"), f"{_('backup.restore_success')}\n{message}"
+            )
+        else:
+            QMessageBox.warning(self, _("backup.error"), _("backup.restore_error").format(error=message))
+            
+    def verify_backup(self):
+        """Verifica a integridade de um backup"""
+        backup_file = QFileDialog.getOpenFileName(
+            self, _("backup.select_verify"),
+            os.path.expanduser('~'),
+            "Backups (*.zip *.json);;Todos os arquivos (*.*)"
+        )[0]
+        
+        if backup_file:
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+            self.set_buttons_enabled(False)
+            
+            self.verify_worker = VerifyWorker(backup_file)
+            self.verify_worker.progress.connect(self.progress_bar.setValue)
+            self.verify_worker.finished.connect(self.verify_finished)
+            self.verify_worker.start()
+            
+    def verify_finished(self, success, message):
+        """Callback quando a verificação é concluída"""
+        self.progress_bar.hide()
+        self.set_buttons_enabled(True)
+        
+        if success:
+            QMessageBox.information(self, _("backup.success"), f"{_('backup.verify_success')}\n{message}")
+        else:
+            QMessageBox.warning(self, _("backup.error"), f"{_('backup.verify_error')}\n{message}")
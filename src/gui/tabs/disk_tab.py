@@ -0,0 +1,252 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                            QLabel, QComboBox, QCheckBox, QSplitter,
+                            QTreeWidget, QTreeWidgetItem, QHeaderView, QMessageBox)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import psutil
+from ...utils.logger import get_logger
+from ...utils.disk_index import DiskScanner, load_disk_tree, get_index_path
+from ...utils.governor import background_priority
+from ...utils.i18n import _
+from ..viewers.treemap import TreemapWidget
+from ..viewers.archive_browser import format_size
+from .base_tab import BaseTab
+
+logger = get_logger(__name__)
+
+# Papel usado para guardar o nó da DiskTree de cada item
+NODE_ROLE = Qt.UserRole
+
+# Quantidade máxima de subpastas listadas por nível
+MAX_LISTED = 200
+
+class DiskScanWorker(QThread):
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object, str)
+
+    def __init__(self, root, full=False):
+        super().__init__()
+        self.root = root
+        self.full = full
+        self.scanner = None
+
+    def run(self):
+        """Atualiza o índice de disco da raiz"""
+        try:
+            with background_priority():
+                previous = load_disk_tree(self.root)
+                self.scanner = DiskScanner(self.root, previous, self.full,
+                                           progress_callback=self.progress.emit)
+                tree = self.scanner.run()
+
+                if self.scanner.cancelled.is_set():
+                    self.finished.emit(None, _("disk.cancelled"))
+                    return
+
+                tree.save(get_index_path(self.root))
+            self.finished.emit(tree, "")
+
+        except Exception as e:
+            logger.error(f"Erro ao analisar disco {self.root}: {e}")
+            self.finished.emit(None, str(e))
+
+    def cancel(self):
+        if self.scanner:
+            self.scanner.cancelled.set()
+
+class DiskTab(BaseTab):
+    def __init__(self):
+        super().__init__()
+        self.tree = None
+        self.current_node = 0
+        self.scan_worker = None
+        self.setup_ui()
+        self.load_index()
+
+    def setup_ui(self):
+        # Remove o layout antigo se existir
+        if self.layout():
+            QWidget().setLayout(self.layout())
+
+        layout = QVBoxLayout()
+
+        # Seleção do volume e varredura
+        controls = QHBoxLayout()
+
+        self.volume_label = QLabel()
+        self.set_translation_key(self.volume_label, "disk.volume")
+        controls.addWidget(self.volume_label)
+
+        self.volume_combo = QComboBox()
+        for partition in psutil.disk_partitions():
+            self.volume_combo.addItem(partition.mountpoint)
+        self.volume_combo.currentTextChanged.connect(self.load_index)
+        controls.addWidget(self.volume_combo)
+
+        self.full_scan = QCheckBox()
+        self.set_translation_key(self.full_scan, "disk.full_scan")
+        controls.addWidget(self.full_scan)
+
+        self.scan_btn = QPushButton()
+        self.set_translation_key(self.scan_btn, "disk.scan")
+        self.scan_btn.clicked.connect(self.start_scan)
+        controls.addWidget(self.scan_btn)
+
+        self.cancel_btn = QPushButton()
+        self.set_translation_key(self.cancel_btn, "disk.cancel")
+        self.cancel_btn.clicked.connect(self.cancel_scan)
+        self.cancel_btn.setEnabled(False)
+        controls.addWidget(self.cancel_btn)
+
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        # Navegação
+        navigation = QHBoxLayout()
+
+        self.up_btn = QPushButton()
+        self.set_translation_key(self.up_btn, "disk.up")
+        self.up_btn.clicked.connect(self.go_up)
+        navigation.addWidget(self.up_btn)
+
+        self.path_label = QLabel()
+        self.path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        navigation.addWidget(self.path_label, 1)
+        layout.addLayout(navigation)
+
+        # Maiores diretórios e treemap lado a lado
+        splitter = QSplitter(Qt.Horizontal)
+
+        self.dir_list = QTreeWidget()
+        self.dir_list.setHeaderLabels([
+            _("disk.name"), _("disk.size"), _("disk.files"), _("disk.percent")
+        ])
+        self.dir_list.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in (1, 2, 3):
+            self.dir_list.header().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.dir_list.itemExpanded.connect(self.populate_item)
+        self.dir_list.itemDoubleClicked.connect(
+            lambda item, column: self.open_node(item.data(0, NODE_ROLE))
+        )
+        splitter.addWidget(self.dir_list)
+
+        self.treemap = TreemapWidget()
+        self.treemap.node_activated.connect(self.open_node)
+        splitter.addWidget(self.treemap)
+        splitter.setSizes([350, 650])
+
+        layout.addWidget(splitter, 1)
+
+        self.setLayout(layout)
+        self.update_translations()
+
+    def update_translations(self):
+        """Atualiza as traduções, incluindo os cabeçalhos da lista"""
+        super().update_translations()
+        if hasattr(self, 'dir_list'):
+            self.dir_list.setHeaderLabels([
+                _("disk.name"), _("disk.size"), _("disk.files"), _("disk.percent")
+            ])
+            self.update_status()
+
+    def load_index(self, *args):
+        """Mostra o índice salvo do volume selecionado, se houver"""
+        root = self.volume_combo.currentText()
+        self.tree = load_disk_tree(root) if root else None
+        self.open_node(0)
+
+    def start_scan(self):
+        """Inicia a varredura incremental (ou completa) do volume"""
+        root = self.volume_combo.currentText()
+        if not root:
+            return
+
+        self.scan_worker = DiskScanWorker(root, self.full_scan.isChecked())
+        self.scan_worker.progress.connect(self.update_progress)
+        self.scan_worker.finished.connect(self.scan_finished)
+
+        self.scan_btn.setEnabled(False)
+        self.volume_combo.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.scan_worker.start()
+
+    def cancel_scan(self):
+        if self.scan_worker:
+            self.scan_worker.cancel()
+
+    def update_progress(self, directories, path):
+        """Mostra o andamento da varredura"""
+        self.status_label.setText(_("disk.scanning").format(directories=directories, path=path))
+
+    def scan_finished(self, tree, error):
+        """Mostra o resultado da varredura"""
+        self.scan_btn.setEnabled(True)
+        self.volume_combo.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+        if tree is None:
+            self.update_status()
+            if error:
+                QMessageBox.warning(self, _("status.error"), error)
+            return
+
+        self.tree = tree
+        self.open_node(0)
+
+    def update_status(self):
+        """Mostra o resumo do índice carregado"""
+        if self.tree is None or not len(self.tree):
+            self.status_label.setText(_("disk.no_data"))
+            return
+        self.status_label.setText(_("disk.summary").format(
+            size=format_size(self.tree.total_bytes[0]),
+            files=self.tree.total_files[0],
+            directories=len(self.tree)
+        ))
+
+    def open_node(self, node):
+        """Entra em um diretório na lista e no treemap"""
+        if node is None:
+            return
+        self.current_node = node if self.tree is not None and node < len(self.tree) else 0
+        self.update_status()
+
+        self.dir_list.clear()
+        if self.tree is None or not len(self.tree):
+            self.path_label.clear()
+            self.up_btn.setEnabled(False)
+            self.treemap.set_tree(None)
+            return
+
+        self.path_label.setText(self.tree.path(self.current_node))
+        self.up_btn.setEnabled(self.current_node != 0)
+        self.add_children(self.dir_list.invisibleRootItem(), self.current_node)
+        self.treemap.set_tree(self.tree, self.current_node)
+
+    def go_up(self):
+        if self.tree is not None and self.current_node > 0:
+            self.open_node(self.tree.parent[self.current_node])
+
+    def add_children(self, parent_item, node):
+        """Cria os itens dos maiores subdiretórios de um nó"""
+        tree = self.tree
+        base = tree.total_bytes[self.current_node] or 1
+        for child in tree.largest_children(node, MAX_LISTED):
+            item = QTreeWidgetItem(parent_item)
+            item.setText(0, tree.names[child])
+            item.setText(1, format_size(tree.total_bytes[child]))
+            item.setText(2, str(tree.total_files[child]))
+            item.setText(3, f"{tree.total_bytes[child] * 100 / base:.1f}%")
+            for column in (1, 2, 3):
+                item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+            item.setData(0, NODE_ROLE, child)
+            if tree.children(child):
+                # Os filhos só são criados ao expandir
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+
+    def populate_item(self, item):
+        """Cria os filhos de um diretório na primeira expansão"""
+        if item.childCount() == 0:
+            self.add_children(item, item.data(0, NODE_ROLE))
@@ -3,11 +3,11 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                                QMessageBox, QGroupBox, QFormLayout)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import socket
-import subprocess
 import winreg
 import os
 import getpass
 from ...utils.logger import get_logger
+from ...utils.commands import get_command_runner
 from .base_tab import BaseTab
 from ...utils.i18n import _
 
@@ -16,6 +16,9 @@ logger = get_logger(__name__)
 class DomainWorker(QThread):
     status_updated = pyqtSignal(str)
     finished = pyqtSignal(bool)
+
+    # Tempo limite dos comandos do PowerShell, em segundos
+    COMMAND_TIMEOUT = 300
     
     def __init__(self, action, **kwargs):
         super().__init__()
@@ -37,6 +40,15 @@ class DomainWorker(QThread):
             self.status_updated.emit(_("domain.error").format(error=str(e)))
             self.finished.emit(False)
     
+    def _run_powershell(self, cmd):
+        """Executa o comando e retorna (sucesso, mensagem de erro)"""
+        result = get_command_runner().run(cmd, timeout=self.COMMAND_TIMEOUT, name='powershell')
+        if result['returncode'] == 0:
+            return True, ''
+        if result['timed_out']:
+            return False, _("domain.timeout", "Tempo limite excedido")
+        return False, result['error'] or result['stderr'].strip()
+
     def _join_domain(self):
         """Adiciona o computador ao domínio"""
         try:
@@ -59,13 +71,12 @@ class DomainWorker(QThread):
             
             # Executa o comando
             self.status_updated.emit(_("domain.joining"))
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            success, error = self._run_powershell(cmd)
             
-            if result.returncode == 0:
+            if success:
                 self.status_updated.emit(_("domain.join_success"))
                 self.finished.emit(True)
             else:
-                error = result.stderr.strip()
                 self.status_updated.emit(_("domain.join_error").format(error=error))
                 self.finished.emit(False)
                 
@@ -92,13 +103,12 @@ class DomainWorker(QThread):
             
             # Executa o comando
             self.status_updated.emit(_("domain.leaving"))
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            success, error = self._run_powershell(cmd)
             
-            if result.returncode == 0:
+            if success:
                 self.status_updated.emit(_("domain.leave_success"))
                 self.finished.emit(True)
             else:
-                error = result.stderr.strip()
                 self.status_updated.emit(_("domain.leave_error").format(error=error))
                 self.finished.emit(False)
                 
@@ -125,13 +135,12 @@ class DomainWorker(QThread):
             
             # Executa o comando
             self.status_updated.emit(_("domain.updating"))
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            success, error = self._run_powershell(cmd)
             
-            if result.returncode == 0:
+            if success:
                 self.status_updated.emit(_("domain.update_success"))
                 self.finished.emit(True)
             else:
-                error = result.stderr.strip()
                 self.status_updated.emit(_("domain.update_error").format(error=error))
                 self.finished.emit(False)
                 
@@ -0,0 +1,281 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                            QLineEdit, QComboBox, QCheckBox, QTableView,
+                            QHeaderView, QAbstractItemView, QApplication)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+import threading
+import time
+from ...utils.logger import get_logger
+from ...utils.config import get_config_value
+from ...utils.log_tail import (LogParser, LogTail, LEVELS, viewer_log_path,
+                               load_history, filter_entries)
+from ...utils.i18n import _
+from ..viewers.log_model import LogTableModel, MAX_LINES
+from .base_tab import BaseTab
+
+logger = get_logger(__name__)
+
+# Intervalo entre leituras do final do log, em segundos
+TAIL_INTERVAL = 0.5
+
+# Períodos carregados, em segundos; 0 = todo o histórico
+PERIODS = [3600, 86400, 7 * 86400, 0]
+
+# Níveis mínimos do filtro; o primeiro (0) mostra todos
+LEVEL_FILTERS = [0, *LEVELS.values()]
+
+# Espera após a digitação antes de filtrar
+FILTER_DELAY = 300
+
+class LogTailWorker(QThread):
+    loaded = pyqtSignal(object, str)
+    appended = pyqtSignal(object)
+
+    def __init__(self, period):
+        super().__init__()
+        self.period = period
+        self.active = True
+        self._reload = threading.Event()
+        self._reload.set()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def reload(self, period):
+        """Recarrega o histórico do período"""
+        self.period = period
+        self._reload.set()
+        self._wake.set()
+
+    def run(self):
+        """Carrega o histórico e lê o final do log até ser interrompido"""
+        tail = None
+        while not self._stop.is_set():
+            try:
+                if self._reload.is_set():
+                    self._reload.clear()
+                    tail = self.load()
+                elif self.active and tail is not None:
+                    entries = tail.read()
+                    # Um atraso grande (aba oculta) é lido em blocos seguidos
+                    while tail.pending() and not self._stop.is_set() and not self._reload.is_set():
+                        entries.extend(tail.read())
+                    if entries:
+                        self.appended.emit(entries)
+            except Exception as e:
+                logger.error(f"Erro ao ler o log: {e}")
+            self._wake.wait(TAIL_INTERVAL)
+            self._wake.clear()
+
+    def load(self):
+        """Lê o histórico e o arquivo atual; retorna o leitor incremental"""
+        start = time.time() - self.period if self.period else None
+        path, structured = viewer_log_path(get_config_value('logging.structured', False))
+        parser = LogParser(structured)
+        cancelled = lambda: self._reload.is_set() or self._stop.is_set()
+        entries, offset = load_history(path, parser, start, MAX_LINES, cancelled)
+
+        tail = LogTail(path, parser, start)
+        tail.seek(offset)
+        while tail.pending():
+            if cancelled():
+                return None
+            entries.extend(tail.read())
+            if len(entries) > MAX_LINES * 2:
+                del entries[:-MAX_LINES]
+        self.loaded.emit(entries[-MAX_LINES:], path)
+        return tail
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+class LogFilterWorker(QThread):
+    filtered = pyqtSignal(int, object, int)
+
+    def __init__(self, generation, entries, last_seq, level, text):
+        super().__init__()
+        self.generation = generation
+        self.entries = entries
+        self.last_seq = last_seq
+        self.level = level
+        self.text = text
+
+    def run(self):
+        """Filtra as entradas fora da thread da interface"""
+        self.filtered.emit(self.generation, filter_entries(self.entries, self.level, self.text), self.last_seq)
+
+class LogsTab(BaseTab):
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.filter_workers = []
+        self.generation = 0
+        self.path = ''
+        self.loading = True
+        self.setup_ui()
+
+    def setup_ui(self):
+        # Remove o layout antigo se existir
+        if self.layout():
+            QWidget().setLayout(self.layout())
+
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+
+        self.period_combo = QComboBox()
+        self.level_combo = QComboBox()
+        self.fill_combos()
+        self.period_combo.setCurrentIndex(PERIODS.index(86400))
+        self.period_combo.currentIndexChanged.connect(self.reload)
+        self.level_combo.currentIndexChanged.connect(self.start_filter)
+        controls.addWidget(self.period_combo)
+        controls.addWidget(self.level_combo)
+
+        self.filter_edit = QLineEdit()
+        self.set_placeholder_key(self.filter_edit, "logs.filter")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY)
+        self.filter_timer.timeout.connect(self.start_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        controls.addWidget(self.filter_edit, 1)
+
+        self.follow_check = QCheckBox()
+        self.set_translation_key(self.follow_check, "logs.follow")
+        self.follow_check.setChecked(True)
+        controls.addWidget(self.follow_check)
+
+        layout.addLayout(controls)
+
+        # Tabela virtual: só as linhas visíveis são desenhadas
+        self.model = LogTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        # Altura e larguras fixas: nada é medido linha a linha
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(20)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        for column, width in enumerate((140, 80, 200)):
+            header.resizeSection(column, width)
+        layout.addWidget(self.table)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.setLayout(layout)
+
+    def fill_combos(self):
+        for combo, items in (
+            (self.period_combo, [_(f"logs.period_{period}") for period in PERIODS]),
+            (self.level_combo, [_("logs.all_levels"), *LEVELS])
+        ):
+            index = combo.currentIndex()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(items)
+            combo.setCurrentIndex(max(index, 0))
+            combo.blockSignals(False)
+
+    def showEvent(self, event):
+        """Lê o log só enquanto a aba está visível"""
+        super().showEvent(event)
+        if self.worker is None:
+            self.worker = LogTailWorker(PERIODS[self.period_combo.currentIndex()])
+            self.worker.loaded.connect(self.on_loaded)
+            self.worker.appended.connect(self.on_appended)
+            QApplication.instance().aboutToQuit.connect(self.stop_workers)
+            self.worker.start()
+            self.summary.setText(_("logs.loading"))
+        self.worker.active = True
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.worker:
+            self.worker.active = False
+
+    def reload(self):
+        if self.worker:
+            self.loading = True
+            self.summary.setText(_("logs.loading"))
+            self.worker.reload(PERIODS[self.period_combo.currentIndex()])
+
+    def on_loaded(self, entries, path):
+        self.loading = False
+        self.path = path
+        level, text = self.current_filter()
+        if level or text:
+            # Exibe vazio até a filtragem em segundo plano terminar
+            self.model.reset(entries, [])
+            self.start_filter()
+        else:
+            self.model.reset(entries, list(entries))
+        self.scroll_to_end()
+        self.update_summary()
+
+    def on_appended(self, entries):
+        if self.loading:
+            # Entradas do período anterior; o novo histórico já as inclui
+            return
+        scrollbar = self.table.verticalScrollBar()
+        at_end = scrollbar.value() >= scrollbar.maximum()
+        self.model.append(entries)
+        if at_end:
+            self.scroll_to_end()
+        self.update_summary()
+
+    def scroll_to_end(self):
+        if self.follow_check.isChecked():
+            self.table.scrollToBottom()
+
+    def current_filter(self):
+        return LEVEL_FILTERS[max(self.level_combo.currentIndex(), 0)], self.filter_edit.text().strip()
+
+    def start_filter(self):
+        """Filtra as entradas em uma thread; resultados de filtros anteriores são ignorados"""
+        level, text = self.current_filter()
+        self.model.set_filter(level, text)
+        self.generation += 1
+        entries, last_seq = self.model.snapshot()
+        worker = LogFilterWorker(self.generation, entries, last_seq, level, text.lower())
+        worker.filtered.connect(self.on_filtered)
+        worker.finished.connect(lambda worker=worker: self.filter_workers.remove(worker))
+        self.filter_workers.append(worker)
+        worker.start()
+
+    def on_filtered(self, generation, visible, last_seq):
+        if generation != self.generation:
+            return
+        self.model.apply_filter(visible, last_seq)
+        self.scroll_to_end()
+        self.update_summary()
+
+    def update_summary(self):
+        if self.loading:
+            self.summary.setText(_("logs.loading"))
+            return
+        self.summary.setText(_("logs.summary").format(
+            visible=len(self.model.visible), total=len(self.model.entries), file=self.path
+        ))
+
+    def update_translations(self):
+        """Atualiza as traduções, incluindo cabeçalhos e opções dos filtros"""
+        super().update_translations()
+        self.fill_combos()
+        self.model.headerDataChanged.emit(Qt.Horizontal, 0, self.model.columnCount() - 1)
+
+    def stop_workers(self):
+        """Para a leitura do log e aguarda as filtragens em andamento"""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+        for worker in list(self.filter_workers):
+            worker.wait()
+
+    def closeEvent(self, event):
+        self.stop_workers()
+        super().closeEvent(event)
@@ -1,15 +1,48 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGridLayout,
-                            QLabel, QFrame, QProgressBar)
-from PyQt5.QtCore import Qt, QTimer
+                            QLabel, QFrame, QProgressBar, QGroupBox,
+                            QTreeWidget, QTreeWidgetItem, QHeaderView, QApplication)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import threading
+import time
 from ...utils.system_info import SystemInfo
+from ...utils.metric_history import MetricHistory
 from ...utils.styles import StyleSheet
+from ..viewers.archive_browser import format_size
 from .base_tab import BaseTab
 from ...utils.i18n import _
 
+# Intervalo entre medições, em segundos
+SAMPLE_INTERVAL = 1.0
+
+class MetricsWorker(QThread):
+    sampled = pyqtSignal(object, object)
+
+    def __init__(self, system_info, history):
+        super().__init__()
+        self.system_info = system_info
+        self.history = history
+        self._stop = threading.Event()
+
+    def run(self):
+        """Mede, captura os picos e grava o histórico fora da thread da interface"""
+        while not self._stop.is_set():
+            try:
+                # Sem intervalo: o uso de CPU é o acumulado desde a medição anterior
+                metrics = self.system_info.get_performance_metrics(cpu_interval=None)
+                spikes = self.history.record(metrics['cpu_percent'], metrics['ram_percent'])
+                self.sampled.emit(metrics, spikes)
+            except Exception as e:
+                print(_("monitoring.error").format(error=str(e)))
+            self._stop.wait(SAMPLE_INTERVAL)
+
+    def stop(self):
+        self._stop.set()
+
 class MonitoringTab(BaseTab):
     def __init__(self):
         super().__init__()
         self.system_info = SystemInfo()
+        self.history = MetricHistory()
         self.setup_ui()
         self.start_monitoring()
         
@@ -36,6 +69,19 @@ class MonitoringTab(BaseTab):
         self.gpu_card = self.create_metric_card(_("monitoring.gpu"), "0%")
         grid.addWidget(self.gpu_card, 1, 1)
         
+        # Picos recentes e os processos que os causaram
+        self.spikes_group = QGroupBox(_("monitoring.spikes"))
+        spikes_layout = QVBoxLayout(self.spikes_group)
+        self.spikes_tree = QTreeWidget()
+        self.spikes_tree.setHeaderLabels([_("monitoring.spike_time"), _("monitoring.spike_resource"),
+                                          _("monitoring.spike_value")])
+        self.spikes_tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.spikes_tree.header().setSectionResizeMode(1, QHeaderView.Stretch)
+        spikes_layout.addWidget(self.spikes_tree)
+        layout.addWidget(self.spikes_group)
+        for spike in self.history.spikes:
+            self.add_spike(spike)
+        
         # Aplicar estilos
         self.setStyleSheet(StyleSheet.MONITORING_TAB)
         
@@ -72,14 +118,21 @@ class MonitoringTab(BaseTab):
         
     def start_monitoring(self):
         """Inicia o monitoramento em tempo real"""
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_metrics)
-        self.timer.start(1000)  # Atualiza a cada segundo
+        self.worker = MetricsWorker(self.system_info, self.history)
+        self.worker.sampled.connect(self.update_metrics)
+        QApplication.instance().aboutToQuit.connect(self.stop_monitoring)
+        self.worker.start()
+        
+    def stop_monitoring(self):
+        if self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
         
-    def update_metrics(self):
+    def update_metrics(self, metrics, spikes):
         """Atualiza as métricas em tempo real"""
         try:
-            metrics = self.system_info.get_performance_metrics()
+            for spike in spikes:
+                self.add_spike(spike)
             
             # Atualiza CPU
             self.update_card(self.cpu_card, 
@@ -104,6 +157,28 @@ class MonitoringTab(BaseTab):
         except Exception as e:
             print(_("monitoring.error").format(error=str(e)))
             
+    def format_usage(self, resource, value):
+        """Formata o uso de um recurso por um processo"""
+        if resource == 'cpu':
+            return f"{value:.1f}%"
+        if resource == 'memory':
+            return format_size(value)
+        return f"{format_size(value)}/s"
+
+    def add_spike(self, spike):
+        """Adiciona um pico no topo da lista, com os processos como filhos"""
+        resource = spike['resource']
+        item = QTreeWidgetItem([
+            time.strftime('%d/%m %H:%M:%S', time.localtime(spike['time'])),
+            _(f"monitoring.spike_{resource}"),
+            f"{format_size(spike['value'])}/s" if resource == 'disk_io' else f"{spike['value']:.1f}%"
+        ])
+        for pid, name, amount in spike['processes']:
+            QTreeWidgetItem(item, ["", f"{name} ({pid})", self.format_usage(resource, amount)])
+        self.spikes_tree.insertTopLevelItem(0, item)
+        while self.spikes_tree.topLevelItemCount() > self.history.spikes.maxlen:
+            self.spikes_tree.takeTopLevelItem(self.spikes_tree.topLevelItemCount() - 1)
+
     def update_card(self, card, value_text, progress_value):
         """Atualiza um card de métrica"""
         card.value_label.setText(value_text)
@@ -123,8 +198,11 @@ class MonitoringTab(BaseTab):
         self.ram_card.title_label.setText(_("monitoring.ram"))
         self.disk_card.title_label.setText(_("monitoring.disk"))
         self.gpu_card.title_label.setText(_("monitoring.gpu"))
+        self.spikes_group.setTitle(_("monitoring.spikes"))
+        self.spikes_tree.setHeaderLabels([_("monitoring.spike_time"), _("monitoring.spike_resource"),
+                                          _("monitoring.spike_value")])
             
     def closeEvent(self, event):
-        """Para o timer quando a aba é fechada"""
-        self.timer.stop()
+        """Para as medições quando a aba é fechada"""
+        self.stop_monitoring()
         super().closeEvent(event) 
\ No newline at end of file
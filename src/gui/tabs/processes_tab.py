@@ -0,0 +1,167 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                            QLineEdit, QComboBox, QPushButton, QTableView,
+                            QHeaderView, QAbstractItemView, QMessageBox,
+                            QApplication)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import threading
+import time
+import psutil
+from ...utils.logger import get_logger
+from ...utils.process_sampler import ProcessSampler, terminate_process, CPU, NAME
+from ...utils.i18n import _
+from ..viewers.process_model import ProcessTableModel
+from .base_tab import BaseTab
+
+logger = get_logger(__name__)
+
+# Intervalo entre amostras, em segundos
+SAMPLE_INTERVAL = 1.0
+
+# Opções de quantidade de processos exibidos; 0 = todos
+LIMITS = [25, 50, 100, 250, 0]
+
+class ProcessSamplerWorker(QThread):
+    sampled = pyqtSignal(object, object, int, float)
+
+    def __init__(self):
+        super().__init__()
+        self.active = True
+        self._stop = threading.Event()
+
+    def run(self):
+        """Amostra os processos até ser interrompido"""
+        sampler = ProcessSampler()
+        while not self._stop.is_set():
+            if self.active:
+                try:
+                    start = time.perf_counter()
+                    changed, removed = sampler.sample()
+                    self.sampled.emit(changed, removed, len(sampler.rows), time.perf_counter() - start)
+                except Exception as e:
+                    logger.error(f"Erro ao amostrar processos: {e}")
+            self._stop.wait(SAMPLE_INTERVAL)
+
+    def stop(self):
+        self._stop.set()
+
+class ProcessesTab(BaseTab):
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        # Remove o layout antigo se existir
+        if self.layout():
+            QWidget().setLayout(self.layout())
+
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+
+        self.filter_edit = QLineEdit()
+        self.set_placeholder_key(self.filter_edit, "processes.filter")
+        self.filter_edit.textChanged.connect(lambda text: self.model.set_filter(text))
+        controls.addWidget(self.filter_edit, 1)
+
+        self.limit_label = QLabel()
+        self.set_translation_key(self.limit_label, "processes.show")
+        controls.addWidget(self.limit_label)
+
+        self.limit_combo = QComboBox()
+        self.fill_limits()
+        self.limit_combo.setCurrentIndex(LIMITS.index(50))
+        self.limit_combo.currentIndexChanged.connect(
+            lambda index: self.model.set_limit(LIMITS[index])
+        )
+        controls.addWidget(self.limit_combo)
+
+        self.end_btn = QPushButton()
+        self.set_translation_key(self.end_btn, "processes.end")
+        self.end_btn.clicked.connect(self.end_process)
+        controls.addWidget(self.end_btn)
+
+        layout.addLayout(controls)
+
+        # Tabela virtual: só as linhas visíveis são desenhadas
+        self.model = ProcessTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(CPU, Qt.DescendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(NAME, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.setLayout(layout)
+
+    def fill_limits(self):
+        index = self.limit_combo.currentIndex()
+        self.limit_combo.blockSignals(True)
+        self.limit_combo.clear()
+        for limit in LIMITS:
+            self.limit_combo.addItem(_("processes.top").format(count=limit) if limit else _("processes.all"))
+        self.limit_combo.setCurrentIndex(max(index, 0))
+        self.limit_combo.blockSignals(False)
+
+    def showEvent(self, event):
+        """Amostra só enquanto a aba está visível"""
+        super().showEvent(event)
+        if self.worker is None:
+            self.worker = ProcessSamplerWorker()
+            self.worker.sampled.connect(self.update_processes)
+            QApplication.instance().aboutToQuit.connect(self.stop_sampler)
+            self.worker.start()
+        self.worker.active = True
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.worker:
+            self.worker.active = False
+
+    def update_processes(self, changed, removed, total, elapsed):
+        """Aplica as linhas alteradas da última amostra"""
+        self.model.apply(changed, removed)
+        self.summary.setText(_("processes.summary").format(count=total, time=int(elapsed * 1000)))
+
+    def end_process(self):
+        """Encerra o processo selecionado"""
+        indexes = self.table.selectionModel().selectedRows()
+        if not indexes:
+            return
+        pid = self.model.pid_at(indexes[0].row())
+        name = self.model.rows.get(pid, (pid, ''))[NAME]
+        reply = QMessageBox.question(
+            self, _("processes.end"), _("processes.confirm_end").format(name=name, pid=pid),
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        try:
+            terminate_process(pid)
+        except psutil.Error as e:
+            logger.error(f"Erro ao encerrar processo {pid}: {e}")
+            QMessageBox.warning(self, _("status.error"), _("processes.end_error").format(error=str(e)))
+
+    def update_translations(self):
+        """Atualiza as traduções, incluindo cabeçalhos e opções de quantidade"""
+        super().update_translations()
+        self.fill_limits()
+        self.model.headerDataChanged.emit(Qt.Horizontal, 0, self.model.columnCount() - 1)
+
+    def stop_sampler(self):
+        """Para o amostrador"""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+
+    def closeEvent(self, event):
+        self.stop_sampler()
+        super().closeEvent(event)
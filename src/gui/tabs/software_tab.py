@@ -4,10 +4,10 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                                QHeaderView)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import winreg
-import os
 import psutil
 from win32com.client import Dispatch
 from ...utils.logger import get_logger
+from ...utils.commands import get_command_runner
 from .base_tab import BaseTab
 from ...utils.i18n import _
 
@@ -103,9 +103,12 @@ class SoftwareScanner(QThread):
             # Verifica Microsoft Store apps
             self.progress.emit(90, _("software.checking_store_apps"))
             try:
-                powershell_command = "pwsh -Command \"Get-AppxPackage | Select-Object Name,Publisher,Version,InstallLocation\""
-                with os.popen(powershell_command) as p:
-                    for line in p:
+                result = get_command_runner().run(
+                    ['pwsh', '-Command', 'Get-AppxPackage | Select-Object Name,Publisher,Version,InstallLocation'],
+                    timeout=120
+                )
+                if result['returncode'] == 0:
+                    for line in result['stdout'].splitlines():
                         try:
                             if line.strip() and not line.startswith("Name"):
                                 parts = line.strip().split()
@@ -360,7 +363,7 @@ class SoftwareTab(BaseTab):
                     if msg.exec_() == QMessageBox.Yes:
                         uninstall_cmd = info.get('uninstall')
                         if uninstall_cmd:
-                            os.system(f'start "" "{uninstall_cmd}"')
+                            get_command_runner().submit(f'start "" "{uninstall_cmd}"', shell=True, name='uninstall')
                         else:
                             QMessageBox.warning(
                                 self,
@@ -425,7 +428,7 @@ class SoftwareTab(BaseTab):
         try:
             uninstall_cmd = info.get('uninstall', '')
             if '/repair' in uninstall_cmd.lower():
-                os.system(f'start "" "{uninstall_cmd} /repair"')
+                get_command_runner().submit(f'start "" "{uninstall_cmd} /repair"', shell=True, name='repair')
                 return True
         except:
             pass
@@ -435,7 +438,8 @@ class SoftwareTab(BaseTab):
         """Tenta reparar usando DISM (Windows)"""
         try:
             if 'Microsoft' in info['publisher']:
-                os.system('DISM /Online /Cleanup-Image /RestoreHealth')
+                # Roda em segundo plano; o resultado fica no log
+                get_command_runner().submit(['DISM', '/Online', '/Cleanup-Image', '/RestoreHealth'])
                 return True
         except:
             pass
@@ -445,7 +449,7 @@ class SoftwareTab(BaseTab):
         """Tenta reparar usando SFC (Windows)"""
         try:
             if 'Microsoft' in info['publisher']:
-                os.system('sfc /scannow')
+                get_command_runner().submit(['sfc', '/scannow'])
                 return True
         except:
             pass
@@ -1,15 +1,33 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                             QPushButton, QLabel, QProgressBar,
-                            QMessageBox, QFileDialog, QGroupBox)
+                            QMessageBox, QFileDialog, QGroupBox, QCheckBox,
+                            QSpinBox, QComboBox, QTabWidget, QTreeWidget,
+                            QTreeWidgetItem, QHeaderView)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import os
 import sys
 import shutil
-import subprocess
-import tempfile
 import ctypes
+import re
+import time
 import psutil
-from ...utils.logger import get_logger
+from ...utils.logger import get_logger, LogManager
+from ...utils.config import get_config_value, update_config
+from ...utils.governor import JobGovernor, background_priority
+from ...utils.cleanup_engine import CleanupEngine, CleanupAnalyzer
+from ...utils.cleanup_rules import load_cleanup_rules, category_label
+from ...utils.quarantine import QuarantineSession, purge_quarantine
+from ...utils.scheduler import get_system_drive
+from ...utils.duplicates import DuplicateFinder
+from ...utils.file_report import TopFilesScanner
+from ...utils.commands import get_command_runner
+from ...utils.task_graph import Task, TaskGraph, TaskCancelled, RUNNING, DONE
+from ...utils.process_governor import ProcessGovernor, get_process_governor
+from ...utils.constants import DEFAULT_PROCESS_RULES
+from ..viewers.cleanup_preview import CleanupPreview
+from ..viewers.duplicates_view import DuplicatesDialog
+from ..viewers.cleanup_rules_dialog import CleanupRulesDialog
+from ..viewers.quarantine_view import QuarantineDialog
 from .base_tab import BaseTab
 from ...utils.i18n import _
 
@@ -33,166 +51,256 @@ def run_as_admin():
         logger.error(f"Erro ao tentar executar como administrador: {e}")
         return False
 
+def purge_quarantine_now():
+    """Apaga as sessões vencidas e libera espaço na unidade do sistema se necessário"""
+    return purge_quarantine(
+        get_config_value('cleanup.quarantine_days', 7),
+        get_system_drive(),
+        get_config_value('cleanup.min_free_space', 10) * 1024 ** 3
+    )
+
 class CleanupWorker(QThread):
-    progress = pyqtSignal(int, str)
+    # Arquivos removidos, bytes liberados e diretório atual
+    progress = pyqtSignal(int, object, str)
     finished = pyqtSignal(dict)
     
+    def __init__(self, categories=None):
+        super().__init__()
+        self.categories = categories
+        self.governor = JobGovernor('cleanup')
+    
     def run(self):
+        """Executa a limpeza com prioridade baixa"""
+        with self.governor:
+            self.run_cleanup()
+    
+    def run_cleanup(self):
         """Executa a limpeza de arquivos temporários"""
         try:
-            space_saved = 0
-            files_removed = 0
-            
-            # Lista de diretórios para limpar
-            temp_dirs = [
-                tempfile.gettempdir(),  # Temp do sistema
-                os.path.join(os.getenv('LOCALAPPDATA'), 'Temp'),  # Temp do usuário
-                os.path.join(os.getenv('WINDIR'), 'Temp'),  # Temp do Windows
-                os.path.join(os.getenv('LOCALAPPDATA'), 'Microsoft', 'Windows', 'INetCache'),  # Cache IE/Edge
-                os.path.join(os.getenv('LOCALAPPDATA'), 'Microsoft', 'Windows', 'Explorer'),  # Cache do Explorer
-            ]
-            
-            total_dirs = len(temp_dirs)
-            
-            for i, directory in enumerate(temp_dirs, 1):
-                try:
-                    if os.path.exists(directory):
-                        # Calcula espaço usado
-                        initial_size = self.get_dir_size(directory)
-                        
-                        # Remove arquivos
-                        for root, dirs, files in os.walk(directory, topdown=False):
-                            for name in files:
-                                try:
-                                    file_path = os.path.join(root, name)
-                                    if os.path.exists(file_path):
-                                        file_size = os.path.getsize(file_path)
-                                        os.unlink(file_path)
-                                        space_saved += file_size
-                                        files_removed += 1
-                                except Exception as e:
-                                    logger.warning(f"Erro ao remover arquivo {name}: {e}")
-                            
-                            # Remove diretórios vazios
-                            for name in dirs:
-                                try:
-                                    dir_path = os.path.join(root, name)
-                                    if os.path.exists(dir_path):
-                                        os.rmdir(dir_path)
-                                except Exception as e:
-                                    logger.warning(f"Erro ao remover diretório {name}: {e}")
-                        
-                        # Calcula progresso
-                        progress = int((i / total_dirs) * 100)
-                        self.progress.emit(progress, f"Limpando {os.path.basename(directory)}...")
-                        
-                except Exception as e:
-                    logger.error(f"Erro ao limpar diretório {directory}: {e}")
-            
-            # Emite resultado
-            result = {
-                'space_saved': space_saved,
-                'files_removed': files_removed
-            }
+            rules = load_cleanup_rules()
+            quarantine = QuarantineSession() if get_config_value('cleanup.quarantine', False) else None
+            engine = CleanupEngine(rules.targets_for(self.categories), rules,
+                                   progress_callback=self.progress.emit,
+                                   governor=self.governor, quarantine=quarantine)
+            try:
+                result = engine.run()
+            finally:
+                # Registra o que já foi movido mesmo se a limpeza falhar
+                if quarantine is not None:
+                    quarantine.close()
+            
+            if quarantine is not None:
+                result['quarantine'] = quarantine.id
+                # Se ainda falta espaço, a quarentena é apagada (da mais antiga)
+                purge_quarantine_now()
+            
+            LogManager.log_cleanup_operation(
+                "limpeza", "concluída",
+                f"{result['files_removed']} arquivos, {result['space_saved']} bytes, "
+                f"{result['errors']} erros"
+            )
             self.finished.emit(result)
             
         except Exception as e:
             logger.error(f"Erro durante limpeza: {e}")
             self.finished.emit({})
-    
-    def get_dir_size(self, path):
-        """Calcula o tamanho total de um diretório"""
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if os.path.exists(fp):
-                    total_size += os.path.getsize(fp)
-        return total_size
 
-class OptimizeWorker(QThread):
-    progress = pyqtSignal(int, str)
-    finished = pyqtSignal(bool)
+class QuarantinePurgeWorker(QThread):
+    finished = pyqtSignal(dict)
     
     def run(self):
-        """Executa otimizações do sistema"""
+        """Apaga a quarentena vencida em segundo plano"""
         try:
-            # Lista de otimizações
-            steps = [
-                ("Liberando memória", self.free_memory),
-                ("Otimizando processos", self.optimize_processes),
-                ("Verificando disco", self.check_disk),
-                ("Limpando cache DNS", self.clear_dns_cache)
-            ]
-            
-            total_steps = len(steps)
-            
-            for i, (message, func) in enumerate(steps, 1):
-                # Atualiza progresso
-                progress = int((i / total_steps) * 100)
-                self.progress.emit(progress, message)
-                
-                # Executa otimização
-                func()
-            
-            self.finished.emit(True)
-            
+            with background_priority():
+                self.finished.emit(purge_quarantine_now())
         except Exception as e:
-            logger.error(f"Erro durante otimização: {e}")
-            self.finished.emit(False)
+            logger.error(f"Erro ao apagar quarentena: {e}")
+            self.finished.emit({})
+
+class AnalyzeWorker(QThread):
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict)
     
-    def free_memory(self):
-        """Libera memória do sistema"""
+    def run(self):
+        """Calcula o espaço de cada categoria sem apagar nada"""
         try:
-            # Força coleta de lixo do Python
-            import gc
-            gc.collect()
-            
-            # No Windows, pode-se usar o WMI para liberar memória
-            if os.name == 'nt':
-                os.system('powershell -Command "Get-Process | ForEach-Object { $_.Refresh() }"')
-                
+            analyzer = CleanupAnalyzer(progress_callback=self.progress.emit)
+            self.finished.emit(analyzer.run())
         except Exception as e:
-            logger.error(f"Erro ao liberar memória: {e}")
+            logger.error(f"Erro ao analisar limpeza: {e}")
+            self.finished.emit({})
+
+class DuplicatesWorker(QThread):
+    # Etapa, concluídos e total (0 quando desconhecido)
+    progress = pyqtSignal(str, int, int)
+    finished = pyqtSignal(object, str)
+    
+    def __init__(self, roots, min_size):
+        super().__init__()
+        self.finder = DuplicateFinder(roots, min_size, progress_callback=self.progress.emit)
     
-    def optimize_processes(self):
-        """Otimiza processos do sistema"""
+    def run(self):
+        """Procura arquivos duplicados com prioridade baixa"""
         try:
-            # Ajusta prioridade de processos não essenciais
-            for proc in psutil.process_iter(['name', 'pid']):
-                try:
-                    # Processos que podem ter prioridade reduzida
-                    low_priority = ['chrome.exe', 'firefox.exe', 'explorer.exe']
-                    if proc.info['name'] in low_priority:
-                        p = psutil.Process(proc.info['pid'])
-                        p.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
-                except Exception as e:
-                    logger.warning(f"Erro ao ajustar processo {proc.info['name']}: {e}")
-                    
+            with background_priority():
+                groups = self.finder.run()
+            if self.finder.cancelled.is_set():
+                self.finished.emit(None, "")
+            else:
+                self.finished.emit(groups, "")
         except Exception as e:
-            logger.error(f"Erro ao otimizar processos: {e}")
+            logger.error(f"Erro ao procurar duplicados: {e}")
+            self.finished.emit(None, str(e))
     
-    def check_disk(self):
-        """Verifica e otimiza disco"""
+    def cancel(self):
+        self.finder.cancelled.set()
+
+class LargeFilesWorker(QThread):
+    # Arquivos vistos e diretório atual
+    progress = pyqtSignal(int, str)
+    # Líderes parciais: maiores e sem uso
+    leaders = pyqtSignal(object, object)
+    finished = pyqtSignal(object, str)
+    
+    def __init__(self, root, count, days):
+        super().__init__()
+        self.scanner = TopFilesScanner(root, count, days, progress_callback=self.progress.emit,
+                                       leaders_callback=self.leaders.emit)
+    
+    def run(self):
+        """Gera o relatório de maiores arquivos com prioridade baixa"""
         try:
-            if os.name == 'nt':
-                # Executa chkdsk em modo de verificação
-                os.system('chkdsk /f /scan')
-                
-                # Desfragmenta discos (apenas HDD)
-                os.system('defrag /C /H /O')
-                
+            with background_priority():
+                result = self.scanner.run()
+            self.finished.emit(result, "")
         except Exception as e:
-            logger.error(f"Erro ao verificar disco: {e}")
+            logger.error(f"Erro ao gerar relatório de arquivos: {e}")
+            self.finished.emit(None, str(e))
     
-    def clear_dns_cache(self):
-        """Limpa cache DNS"""
+    def cancel(self):
+        self.scanner.cancelled.set()
+
+# Etapas da otimização: (nome, dependências, recurso)
+OPTIMIZE_STEPS = [
+    ('free_memory', (), 'cpu'),
+    ('optimize_processes', ('free_memory',), 'cpu'),
+    ('check_disk', (), 'disk'),
+    ('defrag', ('check_disk',), 'disk'),
+    ('clear_dns_cache', (), 'network')
+]
+
+# Percentual informado na saída de chkdsk e defrag
+PERCENT_PATTERN = re.compile(r'(\d{1,3})\s*%')
+
+
+class OptimizeWorker(QThread):
+    progress = pyqtSignal(int, str)
+    step_changed = pyqtSignal(str, str, float)
+    output = pyqtSignal(str, str)
+    finished = pyqtSignal(bool)
+
+    # Tempo limite de cada comando, em segundos
+    COMMAND_TIMEOUT = 3600
+
+    def __init__(self, steps=None):
+        super().__init__()
+        self.steps = steps or [name for name, depends, resource in OPTIMIZE_STEPS]
+        self.handles = set()
+        self.graph = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Interrompe os comandos em execução e as etapas pendentes"""
+        self.cancelled = True
+        if self.graph:
+            self.graph.cancel()
+        for handle in list(self.handles):
+            handle.cancel()
+
+    def run_command(self, command, progress, accepted=(0,)):
+        """Executa um comando repassando a saída
+
+        Levanta RuntimeError se falhar ou terminar com código de saída fora
+        de accepted, e TaskCancelled se for cancelado, para que as etapas
+        dependentes não sejam executadas.
+        """
+        if self.cancelled:
+            raise TaskCancelled(command[0])
+
+        def on_line(kind, line):
+            self.output.emit(kind, line)
+            match = PERCENT_PATTERN.search(line)
+            if match:
+                progress(int(match.group(1)) / 100)
+
+        handle = get_command_runner().submit(command, self.COMMAND_TIMEOUT, on_line)
+        self.handles.add(handle)
         try:
-            if os.name == 'nt':
-                os.system('ipconfig /flushdns')
-                
+            result = handle.result()
+        finally:
+            self.handles.discard(handle)
+        if result['cancelled'] or self.cancelled:
+            raise TaskCancelled(result['name'])
+        if result['error'] or result['timed_out']:
+            raise RuntimeError(f"{result['name']}: {result['error'] or 'tempo limite'}")
+        if result['returncode'] not in accepted:
+            raise RuntimeError(f"{result['name']}: código de saída {result['returncode']}")
+
+    def build_graph(self):
+        """Monta o grafo com as etapas selecionadas"""
+        tasks = [Task(name, getattr(self, name), depends, resource)
+                 for name, depends, resource in OPTIMIZE_STEPS]
+        return TaskGraph(tasks, callback=self.task_changed).select(self.steps)
+
+    def task_changed(self, task):
+        self.step_changed.emit(task.name, task.state, task.duration)
+        running = [_(f"tools.step_{t.name}") for t in self.graph.tasks.values() if t.state == RUNNING]
+        self.progress.emit(int(self.graph.progress * 100), ', '.join(running))
+
+    def run(self):
+        """Executa otimizações do sistema"""
+        try:
+            self.graph = self.build_graph()
+            tasks = self.graph.run()
+            success = not self.cancelled and all(task.state == DONE for task in tasks.values())
+            self.finished.emit(success)
+
         except Exception as e:
-            logger.error(f"Erro ao limpar cache DNS: {e}")
+            logger.error(f"Erro durante otimização: {e}")
+            self.finished.emit(False)
+
+    def free_memory(self, progress):
+        """Libera memória do sistema"""
+        # Força coleta de lixo do Python
+        import gc
+        gc.collect()
+
+        # No Windows, pode-se usar o WMI para liberar memória
+        if os.name == 'nt':
+            self.run_command(['powershell', '-Command', 'Get-Process | ForEach-Object { $_.Refresh() }'],
+                             progress)
+
+    def optimize_processes(self, progress):
+        """Aplica uma vez as regras do governador a todos os processos"""
+        governor = ProcessGovernor(get_config_value('process_governor.rules', DEFAULT_PROCESS_RULES))
+        governor.tick()
+        logger.info(f"Regras de processos aplicadas {governor.applied} vezes")
+
+    def check_disk(self, progress):
+        """Verifica o disco com chkdsk em modo de verificação"""
+        if os.name == 'nt':
+            # 1: erros encontrados e corrigidos; 2: limpeza do disco feita
+            self.run_command(['chkdsk', '/f', '/scan'], progress, accepted=(0, 1, 2))
+
+    def defrag(self, progress):
+        """Desfragmenta discos (apenas HDD)"""
+        if os.name == 'nt':
+            self.run_command(['defrag', '/C', '/H', '/O'], progress)
+
+    def clear_dns_cache(self, progress):
+        """Limpa cache DNS"""
+        if os.name == 'nt':
+            self.run_command(['ipconfig', '/flushdns'], progress)
 
 class ToolsTab(BaseTab):
     def __init__(self):
@@ -224,14 +332,159 @@ class ToolsTab(BaseTab):
         self.cleanup_status.setVisible(False)
         cleanup_layout.addWidget(self.cleanup_status)
         
-        cleanup_btn = QPushButton()
-        self.set_translation_key(cleanup_btn, "tools.clean_temp")
-        cleanup_btn.clicked.connect(self.clean_temp_files)
-        cleanup_layout.addWidget(cleanup_btn)
+        cleanup_buttons = QHBoxLayout()
+        
+        self.analyze_btn = QPushButton()
+        self.set_translation_key(self.analyze_btn, "tools.analyze")
+        self.analyze_btn.clicked.connect(self.analyze_cleanup)
+        cleanup_buttons.addWidget(self.analyze_btn)
+        
+        self.cleanup_btn = QPushButton()
+        self.set_translation_key(self.cleanup_btn, "tools.clean_temp")
+        self.cleanup_btn.clicked.connect(self.clean_temp_files)
+        cleanup_buttons.addWidget(self.cleanup_btn)
+        
+        self.rules_btn = QPushButton()
+        self.set_translation_key(self.rules_btn, "tools.rules")
+        self.rules_btn.clicked.connect(lambda: CleanupRulesDialog(self).exec_())
+        cleanup_buttons.addWidget(self.rules_btn)
+        
+        self.quarantine_btn = QPushButton()
+        self.set_translation_key(self.quarantine_btn, "tools.quarantine_open")
+        self.quarantine_btn.clicked.connect(lambda: QuarantineDialog(self).exec_())
+        cleanup_buttons.addWidget(self.quarantine_btn)
+        
+        cleanup_layout.addLayout(cleanup_buttons)
+        
+        # Limpeza automática pelo agendador de manutenção
+        self.auto_cleanup = QCheckBox()
+        self.set_translation_key(self.auto_cleanup, "tools.auto_cleanup")
+        self.auto_cleanup.setChecked(get_config_value('cleanup.auto_cleanup', False))
+        self.auto_cleanup.stateChanged.connect(
+            lambda state: update_config('cleanup.auto_cleanup', bool(state))
+        )
+        cleanup_layout.addWidget(self.auto_cleanup)
+        
+        # Move para a quarentena em vez de apagar
+        self.quarantine = QCheckBox()
+        self.set_translation_key(self.quarantine, "tools.quarantine")
+        self.quarantine.setChecked(get_config_value('cleanup.quarantine', False))
+        self.quarantine.stateChanged.connect(
+            lambda state: update_config('cleanup.quarantine', bool(state))
+        )
+        cleanup_layout.addWidget(self.quarantine)
         
         cleanup_group.setLayout(cleanup_layout)
         layout.addWidget(cleanup_group)
         
+        # Grupo de Duplicados
+        duplicates_group = QGroupBox()
+        self.set_title_key(duplicates_group, "tools.duplicates_group")
+        duplicates_layout = QVBoxLayout()
+        
+        duplicates_desc = QLabel()
+        self.set_translation_key(duplicates_desc, "tools.duplicates_desc")
+        duplicates_desc.setWordWrap(True)
+        duplicates_layout.addWidget(duplicates_desc)
+        
+        folder_layout = QHBoxLayout()
+        self.duplicates_path = QLabel(get_config_value('cleanup.duplicates_path', ''))
+        folder_layout.addWidget(self.duplicates_path, 1)
+        
+        self.duplicates_folder_btn = QPushButton()
+        self.set_translation_key(self.duplicates_folder_btn, "tools.select_folder")
+        self.duplicates_folder_btn.clicked.connect(self.select_duplicates_folder)
+        folder_layout.addWidget(self.duplicates_folder_btn)
+        duplicates_layout.addLayout(folder_layout)
+        
+        options_layout = QHBoxLayout()
+        min_size_label = QLabel()
+        self.set_translation_key(min_size_label, "tools.min_size")
+        options_layout.addWidget(min_size_label)
+        
+        self.duplicates_min_size = QSpinBox()
+        self.duplicates_min_size.setRange(0, 100000)
+        self.duplicates_min_size.setSuffix(" MB")
+        self.duplicates_min_size.setValue(get_config_value('cleanup.duplicates_min_size', 1))
+        options_layout.addWidget(self.duplicates_min_size)
+        options_layout.addStretch()
+        
+        self.duplicates_btn = QPushButton()
+        self.set_translation_key(self.duplicates_btn, "tools.find_duplicates")
+        self.duplicates_btn.clicked.connect(self.find_duplicates)
+        options_layout.addWidget(self.duplicates_btn)
+        
+        self.duplicates_cancel_btn = QPushButton()
+        self.set_translation_key(self.duplicates_cancel_btn, "disk.cancel")
+        self.duplicates_cancel_btn.clicked.connect(self.cancel_duplicates)
+        self.duplicates_cancel_btn.setEnabled(False)
+        options_layout.addWidget(self.duplicates_cancel_btn)
+        duplicates_layout.addLayout(options_layout)
+        
+        self.duplicates_progress = QProgressBar()
+        self.duplicates_progress.setVisible(False)
+        duplicates_layout.addWidget(self.duplicates_progress)
+        
+        self.duplicates_status = QLabel()
+        self.duplicates_status.setVisible(False)
+        duplicates_layout.addWidget(self.duplicates_status)
+        
+        duplicates_group.setLayout(duplicates_layout)
+        layout.addWidget(duplicates_group)
+        
+        # Grupo de Maiores Arquivos
+        report_group = QGroupBox()
+        self.set_title_key(report_group, "tools.report_group")
+        report_layout = QVBoxLayout()
+        
+        report_options = QHBoxLayout()
+        self.report_root = QComboBox()
+        self.report_root.setEditable(True)
+        for partition in psutil.disk_partitions():
+            self.report_root.addItem(partition.mountpoint)
+        report_options.addWidget(self.report_root, 1)
+        
+        count_label = QLabel()
+        self.set_translation_key(count_label, "tools.report_count")
+        report_options.addWidget(count_label)
+        self.report_count = QSpinBox()
+        self.report_count.setRange(10, 1000)
+        self.report_count.setValue(get_config_value('cleanup.report_count', 50))
+        report_options.addWidget(self.report_count)
+        
+        days_label = QLabel()
+        self.set_translation_key(days_label, "tools.report_days")
+        report_options.addWidget(days_label)
+        self.report_days = QSpinBox()
+        self.report_days.setRange(1, 3650)
+        self.report_days.setValue(get_config_value('cleanup.report_days', 180))
+        report_options.addWidget(self.report_days)
+        
+        self.report_btn = QPushButton()
+        self.set_translation_key(self.report_btn, "tools.report_scan")
+        self.report_btn.clicked.connect(self.start_report)
+        report_options.addWidget(self.report_btn)
+        
+        self.report_cancel_btn = QPushButton()
+        self.set_translation_key(self.report_cancel_btn, "disk.cancel")
+        self.report_cancel_btn.clicked.connect(self.cancel_report)
+        self.report_cancel_btn.setEnabled(False)
+        report_options.addWidget(self.report_cancel_btn)
+        report_layout.addLayout(report_options)
+        
+        self.report_status = QLabel()
+        report_layout.addWidget(self.report_status)
+        
+        self.report_tabs = QTabWidget()
+        self.largest_list = self.create_report_list()
+        self.report_tabs.addTab(self.largest_list, _("tools.report_largest"))
+        self.old_list = self.create_report_list()
+        self.report_tabs.addTab(self.old_list, _("tools.report_old"))
+        report_layout.addWidget(self.report_tabs)
+        
+        report_group.setLayout(report_layout)
+        layout.addWidget(report_group)
+        
         # Grupo de Otimização
         optimize_group = QGroupBox()
         self.set_title_key(optimize_group, "tools.optimize_group")
@@ -242,6 +495,22 @@ class ToolsTab(BaseTab):
         optimize_desc.setWordWrap(True)
         optimize_layout.addWidget(optimize_desc)
         
+        # Etapas selecionáveis, com estado e duração
+        self.optimize_steps = QTreeWidget()
+        self.optimize_steps.setRootIsDecorated(False)
+        self.optimize_steps.setHeaderLabels([_("tools.step"), _("tools.step_status"), _("tools.step_time")])
+        self.optimize_steps.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.optimize_steps.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.optimize_steps.header().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        selected_steps = get_config_value('optimize.steps', [name for name, depends, resource in OPTIMIZE_STEPS])
+        for name, depends, resource in OPTIMIZE_STEPS:
+            item = QTreeWidgetItem(self.optimize_steps, [_(f"tools.step_{name}"), "", ""])
+            item.setData(0, Qt.UserRole, name)
+            item.setCheckState(0, Qt.Checked if name in selected_steps else Qt.Unchecked)
+            item.setTextAlignment(2, Qt.AlignRight | Qt.AlignVCenter)
+        self.optimize_steps.setMaximumHeight(140)
+        optimize_layout.addWidget(self.optimize_steps)
+        
         self.optimize_progress = QProgressBar()
         self.optimize_progress.setVisible(False)
         optimize_layout.addWidget(self.optimize_progress)
@@ -250,10 +519,25 @@ class ToolsTab(BaseTab):
         self.optimize_status.setVisible(False)
         optimize_layout.addWidget(self.optimize_status)
         
-        optimize_btn = QPushButton()
-        self.set_translation_key(optimize_btn, "tools.optimize")
-        optimize_btn.clicked.connect(self.optimize_system)
-        optimize_layout.addWidget(optimize_btn)
+        # Governador contínuo de prioridade de processos
+        self.process_governor = QCheckBox()
+        self.set_translation_key(self.process_governor, "tools.process_governor")
+        self.process_governor.setChecked(get_config_value('process_governor.enabled', False))
+        self.process_governor.stateChanged.connect(self.toggle_process_governor)
+        optimize_layout.addWidget(self.process_governor)
+        
+        optimize_buttons = QHBoxLayout()
+        self.optimize_btn = QPushButton()
+        self.set_translation_key(self.optimize_btn, "tools.optimize")
+        self.optimize_btn.clicked.connect(self.optimize_system)
+        optimize_buttons.addWidget(self.optimize_btn)
+        
+        self.optimize_cancel_btn = QPushButton()
+        self.set_translation_key(self.optimize_cancel_btn, "disk.cancel")
+        self.optimize_cancel_btn.clicked.connect(self.cancel_optimize)
+        self.optimize_cancel_btn.setEnabled(False)
+        optimize_buttons.addWidget(self.optimize_cancel_btn)
+        optimize_layout.addLayout(optimize_buttons)
         
         optimize_group.setLayout(optimize_layout)
         layout.addWidget(optimize_group)
@@ -265,7 +549,55 @@ class ToolsTab(BaseTab):
         self.update_translations()
         
     def clean_temp_files(self):
-        """Inicia processo de limpeza"""
+        """Inicia processo de limpeza de todas as categorias"""
+        self.start_cleanup()
+        
+    def analyze_cleanup(self):
+        """Analisa o espaço a liberar sem apagar nada"""
+        try:
+            self.analyze_worker = AnalyzeWorker()
+            self.analyze_worker.progress.connect(self.update_analyze_progress)
+            self.analyze_worker.finished.connect(self.analysis_finished)
+            
+            self.set_cleanup_enabled(False)
+            self.cleanup_progress.setVisible(True)
+            self.cleanup_status.setVisible(True)
+            self.cleanup_progress.setValue(0)
+            
+            self.analyze_worker.start()
+            
+        except Exception as e:
+            logger.error(f"Erro ao iniciar análise: {e}")
+            QMessageBox.warning(self, _("status.error"), str(e))
+            
+    def update_analyze_progress(self, value, category):
+        """Atualiza progresso da análise"""
+        self.cleanup_progress.setValue(value)
+        self.cleanup_status.setText(category_label(category))
+        
+    def analysis_finished(self, results):
+        """Mostra o resultado da análise e limpa as categorias escolhidas"""
+        self.cleanup_progress.setVisible(False)
+        self.cleanup_status.setVisible(False)
+        self.set_cleanup_enabled(True)
+        
+        if not results:
+            QMessageBox.warning(self, _("status.error"), _("tools.analysis_error"))
+            return
+        
+        preview = CleanupPreview(results, self)
+        if preview.exec_() == CleanupPreview.Accepted:
+            self.start_cleanup(preview.selected_categories())
+            
+    def set_cleanup_enabled(self, enabled):
+        """Habilita ou desabilita os botões de limpeza"""
+        self.analyze_btn.setEnabled(enabled)
+        self.cleanup_btn.setEnabled(enabled)
+        self.rules_btn.setEnabled(enabled)
+        self.quarantine_btn.setEnabled(enabled)
+        
+    def start_cleanup(self, categories=None):
+        """Inicia a limpeza das categorias informadas (todas por padrão)"""
         try:
             # Verifica privilégios de administrador
             if not is_admin():
@@ -283,14 +615,16 @@ class ToolsTab(BaseTab):
                     return
             
             # Inicia worker
-            self.cleanup_worker = CleanupWorker()
+            self.cleanup_worker = CleanupWorker(categories)
             self.cleanup_worker.progress.connect(self.update_cleanup_progress)
             self.cleanup_worker.finished.connect(self.cleanup_finished)
             
             # Mostra progresso
             self.cleanup_progress.setVisible(True)
             self.cleanup_status.setVisible(True)
-            self.cleanup_progress.setValue(0)
+            # Sem contagem prévia o total é desconhecido: barra indeterminada
+            self.cleanup_progress.setRange(0, 0)
+            self.set_cleanup_enabled(False)
             
             self.cleanup_worker.start()
             
@@ -298,10 +632,12 @@ class ToolsTab(BaseTab):
             logger.error(f"Erro ao iniciar limpeza: {e}")
             QMessageBox.warning(self, _("status.error"), str(e))
             
-    def update_cleanup_progress(self, value, status):
+    def update_cleanup_progress(self, files, space_saved, directory):
         """Atualiza progresso da limpeza"""
-        self.cleanup_progress.setValue(value)
-        self.cleanup_status.setText(status)
+        self.cleanup_status.setText(
+            f"{_('messages.files_removed')}: {files} - "
+            f"{_('messages.space_freed')}: {self.format_size(space_saved)}"
+        )
         
     def cleanup_finished(self, result):
         """Chamado quando a limpeza é concluída"""
@@ -309,6 +645,8 @@ class ToolsTab(BaseTab):
             # Oculta progresso
             self.cleanup_progress.setVisible(False)
             self.cleanup_status.setVisible(False)
+            self.cleanup_progress.setRange(0, 100)
+            self.set_cleanup_enabled(True)
             
             # Mostra resultado
             space_saved = result.get('space_saved', 0)
@@ -316,13 +654,16 @@ class ToolsTab(BaseTab):
             
             if space_saved > 0:
                 space_text = self.format_size(space_saved)
-                QMessageBox.information(
-                    self,
-                    _("status.completed"),
+                message = (
                     f"{_('messages.cleanup_completed')}\n"
                     f"{_('messages.space_freed')}: {space_text}\n"
                     f"{_('messages.files_removed')}: {files_removed}"
                 )
+                if result.get('quarantine'):
+                    message += "\n" + _("tools.quarantine_done").format(
+                        days=get_config_value('cleanup.quarantine_days', 7)
+                    )
+                QMessageBox.information(self, _("status.completed"), message)
             else:
                 QMessageBox.information(
                     self,
@@ -334,6 +675,161 @@ class ToolsTab(BaseTab):
             logger.error(f"Erro ao finalizar limpeza: {e}")
             QMessageBox.warning(self, _("status.error"), str(e))
             
+    def select_duplicates_folder(self):
+        """Escolhe a pasta onde procurar duplicados"""
+        folder = QFileDialog.getExistingDirectory(
+            self, _("tools.select_folder"), self.duplicates_path.text()
+        )
+        if folder:
+            self.duplicates_path.setText(folder)
+            update_config('cleanup.duplicates_path', folder)
+            
+    def find_duplicates(self):
+        """Inicia a busca de arquivos duplicados na pasta escolhida"""
+        folder = self.duplicates_path.text()
+        if not folder or not os.path.isdir(folder):
+            QMessageBox.warning(self, _("status.error"), _("tools.select_folder_first"))
+            return
+        
+        try:
+            min_size = self.duplicates_min_size.value()
+            update_config('cleanup.duplicates_min_size', min_size)
+            
+            self.duplicates_worker = DuplicatesWorker([folder], min_size * 1024 * 1024)
+            self.duplicates_worker.progress.connect(self.update_duplicates_progress)
+            self.duplicates_worker.finished.connect(self.duplicates_finished)
+            
+            self.duplicates_progress.setVisible(True)
+            self.duplicates_status.setVisible(True)
+            self.duplicates_progress.setRange(0, 0)
+            self.duplicates_btn.setEnabled(False)
+            self.duplicates_folder_btn.setEnabled(False)
+            self.duplicates_cancel_btn.setEnabled(True)
+            
+            self.duplicates_worker.start()
+            
+        except Exception as e:
+            logger.error(f"Erro ao iniciar busca de duplicados: {e}")
+            QMessageBox.warning(self, _("status.error"), str(e))
+            
+    def cancel_duplicates(self):
+        if hasattr(self, 'duplicates_worker'):
+            self.duplicates_worker.cancel()
+            
+    def update_duplicates_progress(self, stage, done, total):
+        """Atualiza progresso da busca de duplicados"""
+        if total:
+            self.duplicates_progress.setRange(0, total)
+            self.duplicates_progress.setValue(done)
+        self.duplicates_status.setText(_(f"tools.duplicates_{stage}").format(done=done, total=total))
+        
+    def duplicates_finished(self, groups, error):
+        """Mostra os grupos de duplicados encontrados"""
+        self.duplicates_progress.setVisible(False)
+        self.duplicates_status.setVisible(False)
+        self.duplicates_btn.setEnabled(True)
+        self.duplicates_folder_btn.setEnabled(True)
+        self.duplicates_cancel_btn.setEnabled(False)
+        
+        if groups is None:
+            if error:
+                QMessageBox.warning(self, _("status.error"), error)
+            return
+        
+        if not groups:
+            QMessageBox.information(self, _("tools.duplicates_title"), _("tools.no_duplicates"))
+            return
+        
+        DuplicatesDialog(groups, self).exec_()
+        
+    def create_report_list(self):
+        """Cria uma lista do relatório de arquivos"""
+        report_list = QTreeWidget()
+        report_list.setRootIsDecorated(False)
+        report_list.setMinimumHeight(150)
+        report_list.setHeaderLabels([_("tools.file"), _("tools.size"), _("tools.last_used")])
+        report_list.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        report_list.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        report_list.header().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        return report_list
+        
+    def update_translations(self):
+        """Atualiza as traduções, incluindo as abas e cabeçalhos do relatório"""
+        super().update_translations()
+        if hasattr(self, 'report_tabs'):
+            self.report_tabs.setTabText(0, _("tools.report_largest"))
+            self.report_tabs.setTabText(1, _("tools.report_old"))
+            for report_list in (self.largest_list, self.old_list):
+                report_list.setHeaderLabels([_("tools.file"), _("tools.size"), _("tools.last_used")])
+        if hasattr(self, 'optimize_steps'):
+            self.optimize_steps.setHeaderLabels([_("tools.step"), _("tools.step_status"), _("tools.step_time")])
+            for i in range(self.optimize_steps.topLevelItemCount()):
+                item = self.optimize_steps.topLevelItem(i)
+                item.setText(0, _(f"tools.step_{item.data(0, Qt.UserRole)}"))
+        
+    def start_report(self):
+        """Inicia o relatório de maiores arquivos e arquivos sem uso"""
+        root = self.report_root.currentText()
+        if not root or not os.path.isdir(root):
+            QMessageBox.warning(self, _("status.error"), _("tools.select_folder_first"))
+            return
+        
+        try:
+            update_config('cleanup.report_count', self.report_count.value())
+            update_config('cleanup.report_days', self.report_days.value())
+            
+            self.report_worker = LargeFilesWorker(root, self.report_count.value(),
+                                                  self.report_days.value())
+            self.report_worker.progress.connect(self.update_report_progress)
+            self.report_worker.leaders.connect(self.update_report_lists)
+            self.report_worker.finished.connect(self.report_finished)
+            
+            self.largest_list.clear()
+            self.old_list.clear()
+            self.report_btn.setEnabled(False)
+            self.report_cancel_btn.setEnabled(True)
+            
+            self.report_worker.start()
+            
+        except Exception as e:
+            logger.error(f"Erro ao iniciar relatório de arquivos: {e}")
+            QMessageBox.warning(self, _("status.error"), str(e))
+            
+    def cancel_report(self):
+        if hasattr(self, 'report_worker'):
+            self.report_worker.cancel()
+            
+    def update_report_progress(self, files, directory):
+        """Atualiza progresso do relatório"""
+        self.report_status.setText(_("tools.report_progress").format(files=files, path=directory))
+        
+    def update_report_lists(self, largest, old):
+        """Mostra os líderes parciais ou finais"""
+        for report_list, items in ((self.largest_list, largest), (self.old_list, old)):
+            report_list.clear()
+            for size, last_used, path in items:
+                item = QTreeWidgetItem(report_list)
+                item.setText(0, path)
+                item.setToolTip(0, path)
+                item.setText(1, self.format_size(size))
+                item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+                item.setText(2, time.strftime('%d/%m/%Y', time.localtime(last_used)))
+                
+    def report_finished(self, result, error):
+        """Mostra o resumo do relatório"""
+        self.report_btn.setEnabled(True)
+        self.report_cancel_btn.setEnabled(False)
+        
+        if result is None:
+            self.report_status.clear()
+            QMessageBox.warning(self, _("status.error"), error)
+            return
+        
+        key = "tools.report_cancelled" if self.report_worker.scanner.cancelled.is_set() else "tools.report_summary"
+        self.report_status.setText(_(key).format(
+            files=result['files'], size=self.format_size(result['bytes'])
+        ))
+        
     def optimize_system(self):
         """Inicia processo de otimização"""
         try:
@@ -352,10 +848,27 @@ class ToolsTab(BaseTab):
                 else:
                     return
             
+            steps = []
+            for i in range(self.optimize_steps.topLevelItemCount()):
+                item = self.optimize_steps.topLevelItem(i)
+                item.setText(1, "")
+                item.setText(2, "")
+                if item.checkState(0) == Qt.Checked:
+                    steps.append(item.data(0, Qt.UserRole))
+            if not steps:
+                QMessageBox.information(self, _("tools.optimize_group"), _("tools.no_steps"))
+                return
+            update_config('optimize.steps', steps)
+            
             # Inicia worker
-            self.optimize_worker = OptimizeWorker()
+            self.optimize_worker = OptimizeWorker(steps)
             self.optimize_worker.progress.connect(self.update_optimize_progress)
+            self.optimize_worker.step_changed.connect(self.update_optimize_step)
+            self.optimize_worker.output.connect(self.update_optimize_output)
             self.optimize_worker.finished.connect(self.optimize_finished)
+            self.optimize_step = ""
+            self.optimize_btn.setEnabled(False)
+            self.optimize_cancel_btn.setEnabled(True)
             
             # Mostra progresso
             self.optimize_progress.setVisible(True)
@@ -371,7 +884,36 @@ class ToolsTab(BaseTab):
     def update_optimize_progress(self, value, status):
         """Atualiza progresso da otimização"""
         self.optimize_progress.setValue(value)
+        self.optimize_step = status
         self.optimize_status.setText(status)
+
+    def update_optimize_step(self, name, state, duration):
+        """Mostra o estado e a duração de uma etapa"""
+        for i in range(self.optimize_steps.topLevelItemCount()):
+            item = self.optimize_steps.topLevelItem(i)
+            if item.data(0, Qt.UserRole) == name:
+                item.setText(1, _(f"tools.step_{state}"))
+                item.setText(2, f"{duration:.1f} s" if duration else "")
+                break
+
+    def toggle_process_governor(self, state):
+        """Liga ou desliga o governador de processos"""
+        update_config('process_governor.enabled', bool(state))
+        if state:
+            get_process_governor().start()
+        else:
+            get_process_governor().stop()
+
+    def cancel_optimize(self):
+        """Cancela a otimização em andamento"""
+        if hasattr(self, 'optimize_worker') and self.optimize_worker.isRunning():
+            self.optimize_worker.cancel()
+            self.optimize_cancel_btn.setEnabled(False)
+
+    def update_optimize_output(self, stream, line):
+        """Mostra a última linha de saída do comando em execução"""
+        if line.strip():
+            self.optimize_status.setText(f"{self.optimize_step}\n{line.strip()}")
         
     def optimize_finished(self, success):
         """Chamado quando a otimização é concluída"""
@@ -379,6 +921,11 @@ class ToolsTab(BaseTab):
             # Oculta progresso
             self.optimize_progress.setVisible(False)
             self.optimize_status.setVisible(False)
+            self.optimize_btn.setEnabled(True)
+            self.optimize_cancel_btn.setEnabled(False)
+            
+            if self.optimize_worker.cancelled:
+                return
             
             # Mostra resultado
             if success:
@@ -412,8 +959,16 @@ class ToolsTab(BaseTab):
             self.cleanup_worker.terminate()
             self.cleanup_worker.wait()
             
+        if hasattr(self, 'duplicates_worker') and self.duplicates_worker.isRunning():
+            self.duplicates_worker.cancel()
+            self.duplicates_worker.wait()
+            
+        if hasattr(self, 'report_worker') and self.report_worker.isRunning():
+            self.report_worker.cancel()
+            self.report_worker.wait()
+            
         if hasattr(self, 'optimize_worker') and self.optimize_worker.isRunning():
-            self.optimize_worker.terminate()
+            self.optimize_worker.cancel()
             self.optimize_worker.wait()
             
         event.accept() 
\ No newline at end of file
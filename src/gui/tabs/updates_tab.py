@@ -5,9 +5,8 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import wmi
 import pythoncom
 from datetime import datetime
-import os
-import subprocess
 from ...utils.logger import get_logger
+from ...utils.commands import get_command_runner
 from .base_tab import BaseTab
 from ...utils.i18n import _
 
@@ -179,20 +178,19 @@ class UpdatesTab(BaseTab):
         
     def install_updates(self):
         """Abre as configurações do Windows Update"""
-        try:
-            # Tenta abrir usando o comando moderno
-            subprocess.Popen(['start', 'ms-settings:windowsupdate'], shell=True)
-        except Exception as e1:
-            logger.warning(f"Erro ao abrir configurações modernas: {e1}")
-            try:
-                # Fallback para o método antigo
-                os.system('control update')
-            except Exception as e2:
-                logger.error(f"Erro ao abrir Windows Update: {e2}")
+        runner = get_command_runner()
+        # Tenta abrir usando o comando moderno
+        result = runner.run('start "" ms-settings:windowsupdate', shell=True, timeout=15)
+        if result['returncode'] != 0:
+            logger.warning(f"Erro ao abrir configurações modernas: {result['error'] or result['stderr']}")
+            # Fallback para o método antigo
+            result = runner.run(['control', 'update'], timeout=15)
+            if result['error']:
+                logger.error(f"Erro ao abrir Windows Update: {result['error']}")
                 QMessageBox.warning(
                     self,
                     _("status.error"),
-                    str(e2)
+                    result['error']
                 )
                 
     def closeEvent(self, event):
@@ -3,5 +3,15 @@ Módulo de visualizadores do ADF System Manager.
 """
 
 from .document_viewer import DocumentViewer
+from .archive_browser import ArchiveBrowser
+from .cleanup_preview import CleanupPreview
+from .treemap import TreemapWidget
+from .duplicates_view import DuplicatesDialog
+from .cleanup_rules_dialog import CleanupRulesDialog
+from .quarantine_view import QuarantineDialog
+from .process_model import ProcessTableModel
+from .log_model import LogTableModel
 
-__all__ = ['DocumentViewer'] 
\ No newline at end of file
+__all__ = ['DocumentViewer', 'ArchiveBrowser', 'CleanupPreview', 'TreemapWidget',
+           'DuplicatesDialog', 'CleanupRulesDialog',
+           'QuarantineDialog', 'ProcessTableModel', 'LogTableModel'] 
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Navegador de conteúdo dos backups do ADF System Manager.
+Permite escolher arquivos e pastas específicos para restaurar.
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QPushButton, QLabel, QHeaderView
+)
+from PyQt5.QtCore import Qt
+from src.utils.archive_index import build_tree
+from src.utils.i18n import _
+
+# Papel usado para guardar o caminho de cada item
+PATH_ROLE = Qt.UserRole
+
+
+def format_size(size):
+    """Formata tamanho em bytes para formato legível"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} PB"
+
+
+class ArchiveBrowser(QDialog):
+    """Diálogo com a árvore de conteúdo de um backup"""
+
+    def __init__(self, entries, parent=None):
+        super().__init__(parent)
+        self.entries = entries
+        self.tree_data = build_tree(entries)
+        # Subárvore de cada pasta ainda não expandida, por caminho
+        self.pending_nodes = {}
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle(_("backup.browser_title"))
+        self.resize(700, 500)
+
+        layout = QVBoxLayout(self)
+
+        total = sum(entry['size'] for entry in self.entries)
+        summary = QLabel(_("backup.browser_summary").format(
+            files=len(self.entries), size=format_size(total)
+        ))
+        layout.addWidget(summary)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels([_("backup.browser_name"), _("backup.browser_size")])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        # Os filhos só são criados ao expandir a pasta
+        self.tree.itemExpanded.connect(self.populate_item)
+        layout.addWidget(self.tree)
+
+        self.add_children(self.tree.invisibleRootItem(), self.tree_data, '', Qt.Checked)
+        self.tree.itemChanged.connect(self.propagate_check)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        restore_btn = QPushButton(_("backup.restore_selected"))
+        restore_btn.clicked.connect(self.accept)
+        button_layout.addWidget(restore_btn)
+
+        cancel_btn = QPushButton(_("backup.cancel"))
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+
+    def add_children(self, parent, node, prefix, state):
+        """Cria os itens de um nível da árvore"""
+        for name in sorted(node['dirs'], key=str.lower):
+            item = self.create_item(parent, name, state)
+            item.setData(0, PATH_ROLE, f"{prefix}{name}/")
+            self.pending_nodes[f"{prefix}{name}/"] = node['dirs'][name]
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+
+        for name in sorted(node['files'], key=str.lower):
+            item = self.create_item(parent, name, state)
+            item.setData(0, PATH_ROLE, f"{prefix}{name}")
+            item.setText(1, format_size(node['files'][name]['size']))
+
+    def create_item(self, parent, name, state):
+        item = QTreeWidgetItem(parent)
+        item.setText(0, name)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(0, state)
+        return item
+
+    def populate_item(self, item):
+        """Cria os filhos de uma pasta na primeira expansão"""
+        node = self.pending_nodes.pop(item.data(0, PATH_ROLE), None)
+        if node is None:
+            return
+        self.add_children(item, node, item.data(0, PATH_ROLE), item.checkState(0))
+
+    def propagate_check(self, item, column):
+        """Mantém pastas e filhos coerentes ao marcar ou desmarcar"""
+        self.tree.blockSignals(True)
+        state = item.checkState(0)
+
+        pending = [item.child(i) for i in range(item.childCount())]
+        while pending:
+            child = pending.pop()
+            child.setCheckState(0, state)
+            pending.extend(child.child(i) for i in range(child.childCount()))
+
+        # Uma pasta só continua marcada se todo o conteúdo estiver marcado
+        parent = item.parent()
+        while state == Qt.Unchecked and parent is not None:
+            parent.setCheckState(0, Qt.Unchecked)
+            parent = parent.parent()
+
+        self.tree.blockSignals(False)
+
+    def selected_paths(self):
+        """Retorna os caminhos marcados; pastas terminam com '/'"""
+        paths = []
+        pending = [self.tree.topLevelItem(i) for i in range(self.tree.topLevelItemCount())]
+        while pending:
+            item = pending.pop()
+            if item.checkState(0) == Qt.Checked:
+                # Uma pasta marcada inclui todo o seu conteúdo
+                paths.append(item.data(0, PATH_ROLE))
+            else:
+                pending.extend(item.child(i) for i in range(item.childCount()))
+        return paths
@@ -0,0 +1,86 @@
+"""
+Prévia da limpeza do ADF System Manager.
+Mostra o espaço ocupado por categoria e permite escolher o que limpar.
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QPushButton, QLabel, QHeaderView
+)
+from PyQt5.QtCore import Qt
+from src.utils.i18n import _
+from src.utils.cleanup_rules import category_label
+from .archive_browser import format_size
+
+# Papel usado para guardar a categoria de cada item
+CATEGORY_ROLE = Qt.UserRole
+
+
+class CleanupPreview(QDialog):
+    """Diálogo com o resultado da análise de limpeza por categoria"""
+
+    def __init__(self, results, parent=None):
+        super().__init__(parent)
+        self.results = results
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle(_("tools.analysis_title"))
+        self.resize(600, 350)
+
+        layout = QVBoxLayout(self)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.tree = QTreeWidget()
+        self.tree.setRootIsDecorated(False)
+        self.tree.setHeaderLabels([_("tools.category"), _("tools.files"), _("tools.size")])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.tree)
+
+        ordered = sorted(self.results.items(), key=lambda item: item[1]['bytes'], reverse=True)
+        for category, result in ordered:
+            item = QTreeWidgetItem(self.tree)
+            item.setText(0, category_label(category))
+            item.setToolTip(0, result['path'])
+            item.setText(1, str(result['files']))
+            item.setText(2, format_size(result['bytes']))
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            item.setTextAlignment(2, Qt.AlignRight | Qt.AlignVCenter)
+            item.setData(0, CATEGORY_ROLE, category)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.Checked)
+
+        self.tree.itemChanged.connect(self.update_summary)
+        self.update_summary()
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        self.clean_btn = QPushButton(_("tools.clean_selected"))
+        self.clean_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.clean_btn)
+
+        cancel_btn = QPushButton(_("backup.cancel"))
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+
+    def update_summary(self, *args):
+        """Atualiza o total das categorias marcadas"""
+        selected = self.selected_categories()
+        files = sum(self.results[category]['files'] for category in selected)
+        size = sum(self.results[category]['bytes'] for category in selected)
+        self.summary.setText(_("tools.analysis_summary").format(files=files, size=format_size(size)))
+        if hasattr(self, 'clean_btn'):
+            self.clean_btn.setEnabled(bool(selected))
+
+    def selected_categories(self):
+        """Retorna as categorias marcadas"""
+        return [
+            self.tree.topLevelItem(i).data(0, CATEGORY_ROLE)
+            for i in range(self.tree.topLevelItemCount())
+            if self.tree.topLevelItem(i).checkState(0) == Qt.Checked
+        ]
@@ -0,0 +1,159 @@
+"""
+Editor das regras de limpeza do ADF System Manager.
+Permite ajustar caminhos, padrões, idade e tamanho de cada regra e as exclusões.
+"""
+
+import copy
+import re
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPushButton, QLabel, QPlainTextEdit, QHeaderView, QMessageBox
+)
+from PyQt5.QtCore import Qt
+from src.utils.i18n import _
+from src.utils.config import get_config_value, update_config
+from src.utils.constants import DEFAULT_CLEANUP_RULES
+from src.utils.cleanup_rules import RuleMatcher, category_label
+
+# Colunas da tabela de regras
+NAME, PATH, PATTERNS, MIN_AGE, MIN_SIZE, MAX_SIZE = range(6)
+
+
+class CleanupRulesDialog(QDialog):
+    """Diálogo de edição das regras de limpeza salvas na configuração"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+        self.load_rules(get_config_value('cleanup.rules', DEFAULT_CLEANUP_RULES),
+                        get_config_value('cleanup.exclusions', []))
+
+    def setup_ui(self):
+        self.setWindowTitle(_("tools.rules_title"))
+        self.resize(900, 500)
+
+        layout = QVBoxLayout(self)
+
+        help_label = QLabel(_("tools.rules_help"))
+        help_label.setWordWrap(True)
+        layout.addWidget(help_label)
+
+        self.table = QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels([
+            _("tools.rule_name"), _("tools.rule_path"), _("tools.rule_patterns"),
+            _("tools.rule_min_age"), _("tools.rule_min_size"), _("tools.rule_max_size")
+        ])
+        self.table.horizontalHeader().setSectionResizeMode(PATH, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table, 1)
+
+        rule_buttons = QHBoxLayout()
+        add_btn = QPushButton(_("tools.rule_add"))
+        add_btn.clicked.connect(lambda: self.add_rule({
+            "name": "", "path": "", "patterns": ["*"],
+            "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True
+        }))
+        rule_buttons.addWidget(add_btn)
+
+        remove_btn = QPushButton(_("tools.rule_remove"))
+        remove_btn.clicked.connect(self.remove_rule)
+        rule_buttons.addWidget(remove_btn)
+
+        defaults_btn = QPushButton(_("tools.rule_defaults"))
+        defaults_btn.clicked.connect(lambda: self.load_rules(DEFAULT_CLEANUP_RULES, []))
+        rule_buttons.addWidget(defaults_btn)
+        rule_buttons.addStretch()
+        layout.addLayout(rule_buttons)
+
+        layout.addWidget(QLabel(_("tools.exclusions")))
+        self.exclusions = QPlainTextEdit()
+        self.exclusions.setMaximumHeight(100)
+        layout.addWidget(self.exclusions)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        save_btn = QPushButton(_("settings.save"))
+        save_btn.clicked.connect(self.save)
+        button_layout.addWidget(save_btn)
+
+        cancel_btn = QPushButton(_("backup.cancel"))
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+
+    def load_rules(self, rules, exclusions):
+        """Preenche a tabela e as exclusões"""
+        self.table.setRowCount(0)
+        for rule in copy.deepcopy(rules):
+            self.add_rule(rule)
+        self.exclusions.setPlainText('\n'.join(exclusions))
+
+    def add_rule(self, rule):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+
+        name_item = QTableWidgetItem(rule['name'])
+        name_item.setToolTip(category_label(rule['name']))
+        name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
+        name_item.setCheckState(Qt.Checked if rule.get('enabled', True) else Qt.Unchecked)
+        self.table.setItem(row, NAME, name_item)
+        self.table.setItem(row, PATH, QTableWidgetItem(rule['path']))
+        self.table.setItem(row, PATTERNS, QTableWidgetItem('; '.join(rule.get('patterns') or ['*'])))
+        self.table.setItem(row, MIN_AGE, QTableWidgetItem(str(rule.get('min_age_days', 0))))
+        self.table.setItem(row, MIN_SIZE, QTableWidgetItem(str(rule.get('min_size', 0) // 1024)))
+        self.table.setItem(row, MAX_SIZE, QTableWidgetItem(str(rule.get('max_size', 0) // 1024)))
+
+    def remove_rule(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.table.removeRow(row)
+
+    def collect_rules(self):
+        """Lê as regras da tabela; levanta ValueError com a linha inválida"""
+        rules = []
+        names = set()
+        for row in range(self.table.rowCount()):
+            def text(column):
+                item = self.table.item(row, column)
+                return item.text().strip() if item else ''
+
+            name = text(NAME)
+            path = text(PATH)
+            if not name or not path or name in names:
+                raise ValueError(_("tools.rule_invalid").format(row=row + 1))
+            names.add(name)
+
+            patterns = [pattern.strip() for pattern in text(PATTERNS).split(';') if pattern.strip()]
+            try:
+                rule = {
+                    "name": name,
+                    "path": path,
+                    "patterns": patterns or ['*'],
+                    "min_age_days": int(text(MIN_AGE) or 0),
+                    "min_size": int(text(MIN_SIZE) or 0) * 1024,
+                    "max_size": int(text(MAX_SIZE) or 0) * 1024,
+                    "enabled": self.table.item(row, NAME).checkState() == Qt.Checked
+                }
+                if min(rule['min_age_days'], rule['min_size'], rule['max_size']) < 0:
+                    raise ValueError
+                # Garante que os padrões compilam antes de salvar
+                RuleMatcher(rule['patterns'])
+            except (ValueError, re.error):
+                raise ValueError(_("tools.rule_invalid").format(row=row + 1))
+            rules.append(rule)
+        return rules
+
+    def save(self):
+        """Valida e grava as regras e exclusões na configuração"""
+        try:
+            rules = self.collect_rules()
+        except ValueError as e:
+            QMessageBox.warning(self, _("tools.rules_title"), str(e))
+            return
+
+        exclusions = [line.strip() for line in self.exclusions.toPlainText().splitlines() if line.strip()]
+        update_config('cleanup.rules', rules)
+        update_config('cleanup.exclusions', exclusions)
+        self.accept()
@@ -0,0 +1,162 @@
+"""
+Resultado da busca de duplicados do ADF System Manager.
+Lista os grupos de arquivos idênticos e aplica hardlink ou exclusão nas cópias marcadas.
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QPushButton, QLabel, QHeaderView, QMessageBox
+)
+from PyQt5.QtCore import Qt
+from src.utils.i18n import _
+from src.utils.logger import get_logger, LogManager
+from src.utils.duplicates import replace_with_hardlinks, delete_duplicates
+from .archive_browser import format_size
+
+logger = get_logger(__name__)
+
+# Papel usado para guardar o grupo ou o arquivo de cada item
+DATA_ROLE = Qt.UserRole
+
+# Quantidade máxima de grupos listados
+MAX_GROUPS = 2000
+
+
+class DuplicatesDialog(QDialog):
+    """Diálogo com os grupos de duplicados; a primeira cópia de cada grupo é mantida"""
+
+    def __init__(self, groups, parent=None):
+        super().__init__(parent)
+        self.groups = groups
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle(_("tools.duplicates_title"))
+        self.resize(800, 500)
+
+        layout = QVBoxLayout(self)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels([_("tools.file"), _("tools.size")])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        layout.addWidget(self.tree)
+
+        for group in self.groups[:MAX_GROUPS]:
+            group_item = QTreeWidgetItem(self.tree)
+            group_item.setText(0, _("tools.duplicate_group").format(
+                count=len(group['files']), size=format_size(group['size'])
+            ))
+            group_item.setText(1, format_size(group['wasted']))
+            group_item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            group_item.setData(0, DATA_ROLE, group)
+            for index, entry in enumerate(group['files']):
+                item = QTreeWidgetItem(group_item)
+                item.setText(0, entry['path'])
+                item.setData(0, DATA_ROLE, entry)
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(0, Qt.Unchecked if index == 0 else Qt.Checked)
+            group_item.setExpanded(len(self.groups) <= 50)
+
+        self.tree.itemChanged.connect(self.update_summary)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        self.link_btn = QPushButton(_("tools.replace_hardlinks"))
+        self.link_btn.clicked.connect(lambda: self.apply_action('hardlink'))
+        button_layout.addWidget(self.link_btn)
+
+        self.delete_btn = QPushButton(_("tools.delete_selected"))
+        self.delete_btn.clicked.connect(lambda: self.apply_action('delete'))
+        button_layout.addWidget(self.delete_btn)
+
+        close_btn = QPushButton(_("viewer.close"))
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+
+        layout.addLayout(button_layout)
+        self.update_summary()
+
+    def selection(self):
+        """Retorna (item do grupo, arquivo mantido, cópias marcadas) de cada grupo
+
+        Grupos com todas as cópias marcadas são ignorados para nunca apagar
+        o último exemplar de um arquivo.
+        """
+        selected = []
+        for i in range(self.tree.topLevelItemCount()):
+            group_item = self.tree.topLevelItem(i)
+            kept = []
+            marked = []
+            for j in range(group_item.childCount()):
+                child = group_item.child(j)
+                entry = child.data(0, DATA_ROLE)
+                (marked if child.checkState(0) == Qt.Checked else kept).append(entry)
+            if kept and marked:
+                selected.append((group_item, kept[0], marked))
+        return selected
+
+    def update_summary(self, *args):
+        """Atualiza o total de cópias marcadas"""
+        files = 0
+        size = 0
+        for group_item, keep, marked in self.selection():
+            files += len(marked)
+            size += len(marked) * group_item.data(0, DATA_ROLE)['size']
+        self.summary.setText(_("tools.duplicates_summary").format(
+            groups=len(self.groups), files=files, size=format_size(size)
+        ))
+        self.link_btn.setEnabled(files > 0)
+        self.delete_btn.setEnabled(files > 0)
+
+    def apply_action(self, action):
+        """Substitui por hardlinks ou apaga as cópias marcadas"""
+        selection = self.selection()
+        question = "tools.confirm_hardlinks" if action == 'hardlink' else "tools.confirm_delete"
+        reply = QMessageBox.question(
+            self, _("tools.duplicates_title"),
+            _(question).format(files=sum(len(marked) for group_item, keep, marked in selection)),
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        done = 0
+        freed = 0
+        errors = 0
+        self.tree.blockSignals(True)
+        for group_item, keep, marked in selection:
+            size = group_item.data(0, DATA_ROLE)['size']
+            try:
+                if action == 'hardlink':
+                    result = replace_with_hardlinks(size, keep, marked)
+                    done += result['replaced']
+                else:
+                    result = delete_duplicates(size, keep, marked)
+                    done += result['deleted']
+                freed += result['freed']
+                errors += result['errors']
+            except OSError as e:
+                logger.error(f"Erro ao tratar duplicados de {keep['path']}: {e}")
+                errors += len(marked)
+                continue
+            if not result['errors']:
+                # O grupo já foi resolvido
+                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(group_item))
+        self.tree.blockSignals(False)
+
+        LogManager.log_cleanup_operation(
+            "duplicados", action, f"{done} arquivos, {freed} bytes, {errors} erros"
+        )
+        self.update_summary()
+
+        message = _("tools.duplicates_done").format(files=done, size=format_size(freed))
+        if errors:
+            message += "\n" + _("tools.duplicates_errors").format(errors=errors)
+            QMessageBox.warning(self, _("tools.duplicates_title"), message)
+        else:
+            QMessageBox.information(self, _("tools.duplicates_title"), message)
@@ -0,0 +1,115 @@
+"""
+Modelo da tabela do visualizador de logs do ADF System Manager.
+Guarda as entradas lidas e exibe só as que passam pelos filtros; a view pede apenas as células visíveis.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+from src.utils.i18n import _
+from src.utils.log_tail import SEQ, TIME, LEVEL, MODULE, MESSAGE, matches
+
+# Colunas exibidas e o campo da entrada de cada uma
+COLUMNS = ('time', 'level', 'module', 'message')
+FIELDS = (TIME, LEVEL, MODULE, MESSAGE)
+MESSAGE_COLUMN = FIELDS.index(MESSAGE)
+
+# Máximo de entradas mantidas; as mais antigas saem em blocos de 10%
+MAX_LINES = 1000000
+
+LEVEL_COLORS = {
+    'WARNING': QColor(200, 120, 0),
+    'ERROR': QColor(200, 0, 0),
+    'CRITICAL': QColor(200, 0, 0)
+}
+
+
+class LogTableModel(QAbstractTableModel):
+    """Tabela virtual das entradas de log"""
+
+    def __init__(self, parent=None, max_lines=MAX_LINES):
+        super().__init__(parent)
+        self.entries = []
+        self.visible = []
+        self.level = 0
+        self.text = ''
+        self.max_lines = max_lines
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return _(f"logs.column_{COLUMNS[section]}")
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.visible[index.row()]
+        if role == Qt.DisplayRole:
+            value = entry[FIELDS[index.column()]]
+            # Mensagens com várias linhas (tracebacks) mostram só a primeira
+            return value.split('\n', 1)[0] if index.column() == MESSAGE_COLUMN else value
+        if role == Qt.ToolTipRole and index.column() == MESSAGE_COLUMN and '\n' in entry[MESSAGE]:
+            return entry[MESSAGE]
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(entry[LEVEL])
+        return None
+
+    def set_filter(self, level, text):
+        """Define os filtros; a filtragem das entradas existentes é feita fora da thread da interface"""
+        self.level = level
+        self.text = text.lower()
+
+    def reset(self, entries, visible):
+        self.beginResetModel()
+        self.entries = entries
+        self.visible = visible
+        self.endResetModel()
+
+    def append(self, entries):
+        """Acrescenta entradas novas, exibindo as que passam pelos filtros"""
+        self.entries.extend(entries)
+        rows = [entry for entry in entries if matches(entry, self.level, self.text)]
+        if rows:
+            first = len(self.visible)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.visible.extend(rows)
+            self.endInsertRows()
+        self.trim()
+
+    def trim(self):
+        """Descarta as entradas mais antigas acima do limite"""
+        excess = len(self.entries) - self.max_lines
+        if excess < max(self.max_lines // 10, 1):
+            return
+        first_seq = self.entries[excess][SEQ]
+        del self.entries[:excess]
+        count = 0
+        while count < len(self.visible) and self.visible[count][SEQ] < first_seq:
+            count += 1
+        if count:
+            self.beginRemoveRows(QModelIndex(), 0, count - 1)
+            del self.visible[:count]
+            self.endRemoveRows()
+
+    def apply_filter(self, visible, last_seq):
+        """Aplica o resultado da filtragem feita em segundo plano até a entrada last_seq"""
+        # Entradas descartadas pelo limite durante a filtragem
+        first_seq = self.entries[0][SEQ] if self.entries else 0
+        skip = 0
+        while skip < len(visible) and visible[skip][SEQ] < first_seq:
+            skip += 1
+        # Entradas que chegaram durante a filtragem
+        start = len(self.entries)
+        while start > 0 and self.entries[start - 1][SEQ] > last_seq:
+            start -= 1
+        newer = [entry for entry in self.entries[start:] if matches(entry, self.level, self.text)]
+        self.reset(self.entries, visible[skip:] + newer)
+
+    def snapshot(self):
+        """Cópia das entradas e a última sequência, para filtrar em outra thread"""
+        return list(self.entries), (self.entries[-1][SEQ] if self.entries else 0)
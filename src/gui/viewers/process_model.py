@@ -0,0 +1,117 @@
+"""
+Modelo da tabela de processos do ADF System Manager.
+Recebe só as linhas alteradas do amostrador e exibe os maiores N pela coluna escolhida.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from src.utils.i18n import _
+from src.utils.process_sampler import (
+    top_rows, COLUMNS, PID, NAME, USER, CPU, MEMORY, MEMORY_DELTA, READ_RATE, WRITE_RATE, THREADS
+)
+from .archive_browser import format_size
+
+# Papel usado para obter o PID de uma linha
+PID_ROLE = Qt.UserRole
+
+# Colunas numéricas, alinhadas à direita
+NUMERIC_COLUMNS = {PID, CPU, MEMORY, MEMORY_DELTA, READ_RATE, WRITE_RATE, THREADS}
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Tabela virtual dos processos; a view só pede as células visíveis"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = {}
+        self.visible = []
+        self.positions = {}
+        self.sort_column = CPU
+        self.ascending = False
+        self.limit = 50
+        self.filter_text = ''
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return _(f"processes.column_{COLUMNS[section]}")
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.visible[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = row[column]
+            if column == CPU:
+                return f"{value:.1f}"
+            if column == MEMORY:
+                return format_size(value)
+            if column == MEMORY_DELTA:
+                return ('-' if value < 0 else '+') + format_size(abs(value)) if value else ''
+            if column in (READ_RATE, WRITE_RATE):
+                return f"{format_size(value)}/s" if value else ''
+            return str(value)
+        if role == Qt.TextAlignmentRole and column in NUMERIC_COLUMNS:
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == PID_ROLE:
+            return row[PID]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Chamado pela view ao clicar no cabeçalho"""
+        self.sort_column = column
+        self.ascending = order == Qt.AscendingOrder
+        self.refresh(force=True)
+
+    def set_limit(self, limit):
+        self.limit = limit
+        self.refresh(force=True)
+
+    def set_filter(self, text):
+        self.filter_text = text.lower()
+        self.refresh(force=True)
+
+    def apply(self, changed, removed):
+        """Aplica as linhas alteradas e os processos encerrados"""
+        self.rows.update(changed)
+        for pid in removed:
+            self.rows.pop(pid, None)
+        self.refresh(changed)
+
+    def refresh(self, changed=None, force=False):
+        """Recalcula as linhas exibidas pelo heap da coluna de ordenação"""
+        predicate = None
+        if self.filter_text:
+            text = self.filter_text
+            predicate = lambda row: text in row[NAME].lower() or text in row[USER].lower()
+        visible = top_rows(self.rows.values(), self.sort_column, self.limit, self.ascending, predicate)
+
+        order = [row[PID] for row in visible]
+        if force or order != [row[PID] for row in self.visible]:
+            # A ordem mudou: só as linhas exibidas são reorganizadas
+            self.layoutAboutToBeChanged.emit()
+            previous = self.visible
+            self.visible = visible
+            self.positions = {pid: i for i, pid in enumerate(order)}
+            # Mantém a seleção no mesmo processo
+            for index in self.persistentIndexList():
+                row = self.positions.get(previous[index.row()][PID]) if index.row() < len(previous) else None
+                self.changePersistentIndex(
+                    index, self.index(row, index.column()) if row is not None else QModelIndex()
+                )
+            self.layoutChanged.emit()
+            return
+
+        self.visible = visible
+        rows = sorted(self.positions[pid] for pid in (changed or ()) if pid in self.positions)
+        if rows:
+            self.dataChanged.emit(self.index(rows[0], 0), self.index(rows[-1], len(COLUMNS) - 1))
+
+    def pid_at(self, row):
+        return self.visible[row][PID] if 0 <= row < len(self.visible) else None
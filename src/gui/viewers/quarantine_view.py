@@ -0,0 +1,122 @@
+"""
+Sessões em quarentena do ADF System Manager.
+Lista as limpezas feitas em modo quarentena e permite desfazê-las ou apagá-las.
+"""
+
+import time
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QPushButton, QLabel, QHeaderView, QMessageBox
+)
+from PyQt5.QtCore import Qt
+from src.utils.i18n import _
+from src.utils.config import get_config_value
+from src.utils.quarantine import load_sessions, restore_session, purge_session
+from .archive_browser import format_size
+
+# Papel usado para guardar o id da sessão de cada item
+SESSION_ROLE = Qt.UserRole
+
+
+class QuarantineDialog(QDialog):
+    """Diálogo com as sessões de quarentena, da mais recente para a mais antiga"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+        self.load_sessions()
+
+    def setup_ui(self):
+        self.setWindowTitle(_("tools.quarantine_title"))
+        self.resize(600, 350)
+
+        layout = QVBoxLayout(self)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        self.tree = QTreeWidget()
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSelectionMode(QTreeWidget.ExtendedSelection)
+        self.tree.setHeaderLabels([_("tools.quarantine_date"), _("tools.files"),
+                                   _("tools.size"), _("tools.quarantine_expires")])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.itemSelectionChanged.connect(self.update_buttons)
+        layout.addWidget(self.tree)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        self.restore_btn = QPushButton(_("tools.quarantine_restore"))
+        self.restore_btn.clicked.connect(self.restore_selected)
+        button_layout.addWidget(self.restore_btn)
+
+        self.purge_btn = QPushButton(_("tools.quarantine_purge"))
+        self.purge_btn.clicked.connect(self.purge_selected)
+        button_layout.addWidget(self.purge_btn)
+
+        close_btn = QPushButton(_("viewer.close"))
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+
+        layout.addLayout(button_layout)
+
+    def load_sessions(self):
+        """Lista as sessões registradas"""
+        self.tree.clear()
+        days = get_config_value('cleanup.quarantine_days', 7)
+        sessions = sorted(load_sessions().items(), key=lambda item: item[1]['created'], reverse=True)
+        for session_id, session in sessions:
+            item = QTreeWidgetItem(self.tree)
+            item.setText(0, time.strftime('%d/%m/%Y %H:%M', time.localtime(session['created'])))
+            item.setToolTip(0, '\n'.join(session['folders']))
+            item.setText(1, str(session['files']))
+            item.setText(2, format_size(session['bytes']))
+            item.setText(3, time.strftime('%d/%m/%Y', time.localtime(session['created'] + days * 86400)))
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            item.setTextAlignment(2, Qt.AlignRight | Qt.AlignVCenter)
+            item.setData(0, SESSION_ROLE, session_id)
+
+        total = sum(session['bytes'] for session_id, session in sessions)
+        self.summary.setText(_("tools.quarantine_summary").format(
+            sessions=len(sessions), size=format_size(total)
+        ))
+        self.update_buttons()
+
+    def update_buttons(self):
+        selected = bool(self.tree.selectedItems())
+        self.restore_btn.setEnabled(selected)
+        self.purge_btn.setEnabled(selected)
+
+    def selected_sessions(self):
+        return [item.data(0, SESSION_ROLE) for item in self.tree.selectedItems()]
+
+    def restore_selected(self):
+        """Devolve os arquivos das sessões selecionadas"""
+        restored = conflicts = errors = 0
+        for session_id in self.selected_sessions():
+            result = restore_session(session_id)
+            restored += result['restored']
+            conflicts += result['conflicts']
+            errors += result['errors']
+        self.load_sessions()
+
+        message = _("tools.quarantine_restored").format(files=restored)
+        if conflicts or errors:
+            message += "\n" + _("tools.quarantine_kept").format(files=conflicts + errors)
+            QMessageBox.warning(self, _("tools.quarantine_title"), message)
+        else:
+            QMessageBox.information(self, _("tools.quarantine_title"), message)
+
+    def purge_selected(self):
+        """Apaga definitivamente as sessões selecionadas"""
+        reply = QMessageBox.question(
+            self, _("tools.quarantine_title"), _("tools.quarantine_confirm_purge"),
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        freed = sum(purge_session(session_id) for session_id in self.selected_sessions())
+        self.load_sessions()
+        QMessageBox.information(self, _("tools.quarantine_title"),
+                                _("tools.quarantine_purged").format(size=format_size(freed)))
@@ -0,0 +1,195 @@
+"""
+Mapa de árvore (treemap) do uso de disco do ADF System Manager.
+Desenha os subdiretórios de um nó da DiskTree proporcionalmente ao tamanho.
+"""
+
+from PyQt5.QtWidgets import QWidget, QToolTip
+from PyQt5.QtCore import Qt, QRectF, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPen
+from src.utils.i18n import _
+from .archive_browser import format_size
+
+# Quantidade máxima de retângulos por nível
+MAX_ITEMS = 150
+
+# Retângulos menores que isso não recebem filhos nem texto
+MIN_NESTED_SIZE = 40
+
+
+def _worst_ratio(row, length):
+    total = sum(row)
+    return max(
+        max(row) * length * length / (total * total),
+        (total * total) / (length * length * min(row))
+    )
+
+
+def squarify(values, x, y, width, height):
+    """Distribui os valores (decrescentes) em retângulos de proporção próxima de 1
+
+    Retorna uma lista de (x, y, largura, altura) na mesma ordem dos valores.
+    """
+    total = sum(values)
+    if total <= 0 or width <= 0 or height <= 0:
+        return []
+
+    scale = width * height / total
+    areas = [value * scale for value in values]
+    rects = []
+    i = 0
+    while i < len(areas):
+        length = min(width, height)
+        row = [areas[i]]
+        i += 1
+        while i < len(areas) and _worst_ratio(row + [areas[i]], length) <= _worst_ratio(row, length):
+            row.append(areas[i])
+            i += 1
+
+        row_total = sum(row)
+        if width >= height:
+            # Linha vertical à esquerda
+            column = row_total / height
+            offset = y
+            for area in row:
+                rects.append((x, offset, column, area / column))
+                offset += area / column
+            x += column
+            width -= column
+        else:
+            # Linha horizontal no topo
+            line = row_total / width
+            offset = x
+            for area in row:
+                rects.append((offset, y, area / line, line))
+                offset += area / line
+            y += line
+            height -= line
+    return rects
+
+
+class TreemapWidget(QWidget):
+    """Treemap com dois níveis; duplo clique entra no diretório"""
+
+    node_selected = pyqtSignal(int)
+    node_activated = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = None
+        self.node = 0
+        self.selected = -1
+        # (retângulo, nó ou -1 para arquivos soltos, profundidade, diretório pai)
+        self.layout_rects = []
+        self.setMinimumSize(300, 200)
+        self.setMouseTracking(True)
+
+    def set_tree(self, tree, node=0):
+        self.tree = tree
+        self.set_node(node)
+
+    def set_node(self, node):
+        """Mostra o conteúdo de um diretório"""
+        self.node = node
+        self.selected = -1
+        self.update_layout()
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_layout()
+
+    def items_for(self, node):
+        """Retorna (nó, bytes) dos maiores filhos e dos arquivos do próprio nó"""
+        tree = self.tree
+        items = [(child, tree.total_bytes[child])
+                 for child in tree.largest_children(node, MAX_ITEMS) if tree.total_bytes[child] > 0]
+        if tree.own_bytes[node] > 0:
+            items.append((-1, tree.own_bytes[node]))
+            items.sort(key=lambda item: item[1], reverse=True)
+        return items
+
+    def update_layout(self):
+        """Calcula os retângulos a partir da árvore"""
+        self.layout_rects = []
+        if self.tree is None or not len(self.tree):
+            return
+
+        items = self.items_for(self.node)
+        rects = squarify([size for _, size in items], 0, 0, self.width() - 1, self.height() - 1)
+        for (node, _), rect in zip(items, rects):
+            rect = QRectF(*rect)
+            self.layout_rects.append((rect, node, 0, self.node))
+            # Segundo nível dentro de cada diretório grande o bastante
+            if node >= 0 and rect.width() > MIN_NESTED_SIZE and rect.height() > MIN_NESTED_SIZE:
+                inner = rect.adjusted(3, 18, -3, -3)
+                sub_items = self.items_for(node)
+                sub_rects = squarify([size for _, size in sub_items],
+                                     inner.x(), inner.y(), inner.width(), inner.height())
+                for (sub_node, _), sub_rect in zip(sub_items, sub_rects):
+                    self.layout_rects.append((QRectF(*sub_rect), sub_node, 1, node))
+
+    def color_for(self, index, depth):
+        color = QColor.fromHsv((index * 47) % 360, 90 if depth else 140, 235 if depth else 200)
+        return color
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        if not self.layout_rects:
+            painter.drawText(self.rect(), Qt.AlignCenter, _("disk.no_data"))
+            return
+
+        top_index = -1
+        for rect, node, depth, parent in self.layout_rects:
+            if depth == 0:
+                top_index += 1
+            color = self.color_for(top_index, depth)
+            if node == -1:
+                color = QColor(200, 200, 200)
+            painter.fillRect(rect, color)
+            pen = QPen(Qt.white if depth else Qt.black)
+            pen.setWidth(2 if node == self.selected and node >= 0 else 1)
+            painter.setPen(pen)
+            painter.drawRect(rect)
+
+            if depth == 0 and rect.width() > MIN_NESTED_SIZE and rect.height() > 16:
+                painter.setPen(Qt.black)
+                painter.drawText(rect.adjusted(4, 2, -4, 0), Qt.AlignLeft | Qt.AlignTop,
+                                 self.label_for(node, parent))
+
+    def label_for(self, node, parent):
+        """Nome e tamanho do nó; arquivos soltos (-1) usam os bytes do diretório pai"""
+        if node == -1:
+            return f"{_('disk.loose_files')} ({format_size(self.tree.own_bytes[parent])})"
+        return f"{self.tree.names[node]} ({format_size(self.tree.total_bytes[node])})"
+
+    def entry_at(self, pos):
+        """Retorna (nó, diretório pai) do retângulo mais interno sob o ponto, ou (None, None)"""
+        found = (None, None)
+        for rect, node, depth, parent in self.layout_rects:
+            if rect.contains(pos):
+                found = (node, parent)
+        return found
+
+    def node_at(self, pos):
+        """Retorna o nó mais interno sob o ponto, ou None"""
+        return self.entry_at(pos)[0]
+
+    def mouseMoveEvent(self, event):
+        node, parent = self.entry_at(event.pos())
+        if node is not None and self.tree is not None:
+            text = self.label_for(node, parent) if node == -1 else \
+                f"{self.tree.path(node)}\n{format_size(self.tree.total_bytes[node])}"
+            QToolTip.showText(event.globalPos(), text, self)
+
+    def mousePressEvent(self, event):
+        node = self.node_at(event.pos())
+        if node is not None and node >= 0:
+            self.selected = node
+            self.update()
+            self.node_selected.emit(node)
+
+    def mouseDoubleClickEvent(self, event):
+        node = self.node_at(event.pos())
+        if node is not None and node >= 0 and self.tree.children(node):
+            self.node_activated.emit(node)
@@ -0,0 +1,126 @@
+"""
+Índice de conteúdo dos backups do ADF System Manager.
+
+O índice de um zip é montado a partir do diretório central e guardado em
+cache, de forma que arquivos grandes abrem instantaneamente na segunda vez.
+"""
+
+import hashlib
+import json
+import os
+import time
+import zipfile
+from .logger import get_logger
+from .config import get_cache_dir
+from .chunkstore import ChunkStore
+
+logger = get_logger(__name__)
+
+INDEX_CACHE_VERSION = 1
+
+
+def _cache_path(archive_path):
+    key = hashlib.sha1(os.path.abspath(archive_path).encode('utf-8')).hexdigest()
+    return os.path.join(get_cache_dir('archive_index'), f"{key}.json")
+
+
+def _read_zip_entries(archive_path):
+    """Lê as entradas do diretório central do zip"""
+    entries = []
+    with zipfile.ZipFile(archive_path, 'r') as zipf:
+        for info in zipf.infolist():
+            if info.is_dir():
+                continue
+            entries.append([
+                info.filename,
+                info.file_size,
+                info.compress_size,
+                info.CRC,
+                time.mktime(info.date_time + (0, 0, -1))
+            ])
+    return entries
+
+
+def _read_snapshot_entries(snapshot_path):
+    """Lê as entradas de um snapshot do repositório deduplicado"""
+    store = ChunkStore(os.path.dirname(os.path.dirname(snapshot_path)))
+    snapshot = store.load_snapshot(os.path.splitext(os.path.basename(snapshot_path))[0])
+    return [
+        [arcname.replace(os.sep, '/'), entry['size'], entry['size'], None, entry['mtime_ns'] / 1e9]
+        for arcname, entry in snapshot['files'].items()
+    ]
+
+
+def load_archive_index(archive_path):
+    """Retorna as entradas do backup como dicionários
+
+    Cada entrada tem name, size, compress_size, crc (None para snapshots) e mtime.
+    """
+    st = os.stat(archive_path)
+    cache_path = _cache_path(archive_path)
+
+    entries = None
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached.get('version') == INDEX_CACHE_VERSION and cached.get('size') == st.st_size
+                    and cached.get('mtime_ns') == st.st_mtime_ns):
+                entries = cached['entries']
+        except Exception as e:
+            logger.warning(f"Cache de índice inválido para {archive_path}: {e}")
+
+    if entries is None:
+        if archive_path.endswith('.json'):
+            entries = _read_snapshot_entries(archive_path)
+        else:
+            entries = _read_zip_entries(archive_path)
+
+        try:
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': INDEX_CACHE_VERSION,
+                    'size': st.st_size,
+                    'mtime_ns': st.st_mtime_ns,
+                    'entries': entries
+                }, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Erro ao gravar cache de índice: {e}")
+
+    return [
+        {'name': name, 'size': size, 'compress_size': compress_size, 'crc': crc, 'mtime': mtime}
+        for name, size, compress_size, crc, mtime in entries
+    ]
+
+
+def build_tree(entries):
+    """Monta a árvore de pastas do backup
+
+    Cada nó é {'dirs': {nome: nó}, 'files': {nome: entrada}}.
+    """
+    tree = {'dirs': {}, 'files': {}}
+    for entry in entries:
+        node = tree
+        parts = entry['name'].split('/')
+        for part in parts[:-1]:
+            node = node['dirs'].setdefault(part, {'dirs': {}, 'files': {}})
+        node['files'][parts[-1]] = entry
+    return tree
+
+
+def select_entries(entries, selection):
+    """Filtra as entradas pelos caminhos selecionados
+
+    Caminhos terminados em '/' selecionam a pasta inteira.
+    """
+    if selection is None:
+        return list(entries)
+
+    files = {path for path in selection if not path.endswith('/')}
+    folders = tuple(path for path in selection if path.endswith('/'))
+    return [
+        entry for entry in entries
+        if entry['name'] in files or (folders and entry['name'].startswith(folders))
+    ]
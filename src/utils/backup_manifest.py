@@ -0,0 +1,49 @@
+"""
+Manifestos dos backups do ADF System Manager.
+
+Cada backup compactado ou em pasta recebe um arquivo
+``backup_AAAAMMDD_HHMMSS.manifest.json`` ao lado dele, com a lista de
+arquivos copiados. Os snapshots deduplicados já são o próprio manifesto.
+"""
+
+import json
+import os
+from datetime import datetime
+
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_VERSION = 1
+
+
+def get_manifest_path(backup_path):
+    """Retorna o caminho do manifesto de um backup (.zip ou pasta)"""
+    base = backup_path[:-4] if backup_path.endswith('.zip') else backup_path.rstrip('\\/')
+    return base + MANIFEST_SUFFIX
+
+
+def write_manifest(backup_path, kind, sources, files, stats=None):
+    """Grava o manifesto de um backup de forma atômica"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'name': os.path.basename(get_manifest_path(backup_path))[:-len(MANIFEST_SUFFIX)],
+        'kind': kind,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'sources': list(sources),
+        'files': files,
+        'stats': stats or {}
+    }
+
+    path = get_manifest_path(backup_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def read_manifest(backup_path):
+    """Lê o manifesto de um backup, ou None se não existir"""
+    path = get_manifest_path(backup_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,216 @@
+"""
+Verificação de integridade dos backups do ADF System Manager.
+
+Relê o conteúdo de cada backup e compara com os hashes do manifesto,
+usando o serviço de hashing compartilhado.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import zipfile
+from .logger import get_logger, LogManager
+from .backup_manifest import read_manifest, MANIFEST_SUFFIX
+from .chunkstore import ChunkStore
+from .hashing import get_hash_service, hash_file, hash_stream
+from .governor import background_priority
+
+logger = get_logger(__name__)
+
+
+def resolve_backup_path(path):
+    """Converte o caminho de um manifesto no caminho do backup correspondente"""
+    if path.endswith(MANIFEST_SUFFIX):
+        base = path[:-len(MANIFEST_SUFFIX)]
+        return f"{base}.zip" if os.path.exists(f"{base}.zip") else base
+    return path
+
+
+class BackupVerifier:
+    """Verifica um backup compactado, em pasta ou um snapshot deduplicado"""
+
+    def __init__(self, backup_path, progress_callback=None, governor=None):
+        self.backup_path = resolve_backup_path(backup_path)
+        self.progress_callback = progress_callback
+        self.governor = governor
+        self.result = {
+            'ok': False,
+            'files': 0,
+            'bytes': 0,
+            'failures': 0,
+            'first_failure': None,
+            'seconds': 0.0,
+            'throughput': 0.0
+        }
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open_archives = []
+        self._total_bytes = 0
+        self._last_progress = -1
+
+    def verify(self):
+        """Executa a verificação e retorna o resultado"""
+        start = time.perf_counter()
+
+        with background_priority():
+            if self.backup_path.endswith('.json'):
+                self._verify_snapshot()
+            elif self.backup_path.endswith('.zip'):
+                self._verify_zip()
+            else:
+                self._verify_folder()
+
+        elapsed = time.perf_counter() - start
+        self.result['seconds'] = elapsed
+        self.result['throughput'] = self.result['bytes'] / elapsed if elapsed else 0.0
+        self.result['ok'] = self.result['failures'] == 0
+
+        status = "íntegro" if self.result['ok'] else "corrompido"
+        details = (
+            f"{self.result['files']} arquivos, {self.result['bytes']} bytes em "
+            f"{elapsed:.1f}s ({self.result['throughput'] / (1024 * 1024):.1f} MB/s)"
+        )
+        if self.result['first_failure']:
+            details += f", primeira falha: {self.result['first_failure']['name']} " \
+                       f"({self.result['first_failure']['reason']})"
+        LogManager.log_backup_operation("verificação", status, f"{os.path.basename(self.backup_path)}: {details}")
+        return self.result
+
+    def _advance(self, size):
+        if self.governor:
+            self.governor.transfer(read=size)
+        with self._lock:
+            self.result['bytes'] += size
+            if not self.progress_callback or not self._total_bytes:
+                return
+            progress = min(int(self.result['bytes'] * 100 / self._total_bytes), 100)
+            if progress == self._last_progress:
+                return
+            self._last_progress = progress
+        self.progress_callback(progress)
+
+    def _fail(self, name, reason):
+        with self._lock:
+            self.result['failures'] += 1
+            if self.result['first_failure'] is None:
+                self.result['first_failure'] = {'name': name, 'reason': reason}
+        logger.warning(f"Falha na verificação de {name}: {reason}")
+
+    def _run_all(self, func, items):
+        """Distribui os itens no pool do serviço de hashing"""
+        service = get_hash_service()
+        futures = [service.submit(func, item) for item in items]
+        for future in futures:
+            future.result()
+
+    def _require_manifest(self):
+        manifest = read_manifest(self.backup_path)
+        if manifest is None:
+            self._fail(os.path.basename(self.backup_path), "manifesto não encontrado")
+        return manifest
+
+    def _verify_zip(self):
+        manifest = read_manifest(self.backup_path)
+        try:
+            with zipfile.ZipFile(self.backup_path, 'r') as zipf:
+                infos = [info for info in zipf.infolist() if not info.is_dir()]
+        except (zipfile.BadZipFile, OSError) as e:
+            self._fail(os.path.basename(self.backup_path), str(e))
+            return
+
+        expected = manifest['files'] if manifest else {}
+        present = {info.filename for info in infos}
+        for name in expected:
+            if name not in present:
+                self._fail(name, "ausente no arquivo")
+
+        self._total_bytes = sum(info.file_size for info in infos)
+
+        def verify_member(info):
+            try:
+                archive = getattr(self._local, 'archive', None)
+                if archive is None:
+                    archive = zipfile.ZipFile(self.backup_path, 'r')
+                    self._local.archive = archive
+                    with self._lock:
+                        self._open_archives.append(archive)
+
+                # A leitura completa também valida o CRC-32 do zip
+                with archive.open(info) as member:
+                    digest = hash_stream(member, progress_callback=self._advance).hexdigest()
+
+                entry = expected.get(info.filename)
+                if entry and entry.get('sha256') and entry['sha256'] != digest:
+                    self._fail(info.filename, "hash diferente do manifesto")
+            except Exception as e:
+                self._fail(info.filename, str(e))
+            with self._lock:
+                self.result['files'] += 1
+
+        try:
+            self._run_all(verify_member, infos)
+        finally:
+            for archive in self._open_archives:
+                archive.close()
+
+    def _verify_folder(self):
+        manifest = self._require_manifest()
+        if manifest is None:
+            return
+
+        files = manifest['files']
+        self._total_bytes = sum(entry['size'] for entry in files.values())
+
+        def verify_file(item):
+            name, entry = item
+            path = os.path.join(self.backup_path, *name.split('/'))
+            try:
+                size = os.path.getsize(path)
+                if size != entry['size']:
+                    self._fail(name, f"tamanho {size} diferente de {entry['size']}")
+                elif entry.get('sha256'):
+                    if hash_file(path, progress_callback=self._advance) != entry['sha256']:
+                        self._fail(name, "hash diferente do manifesto")
+                else:
+                    self._advance(size)
+            except OSError as e:
+                self._fail(name, str(e))
+            with self._lock:
+                self.result['files'] += 1
+
+        self._run_all(verify_file, files.items())
+
+    def _verify_snapshot(self):
+        store = ChunkStore(os.path.dirname(os.path.dirname(self.backup_path)))
+        snapshot = store.load_snapshot(os.path.splitext(os.path.basename(self.backup_path))[0])
+
+        # Cada bloco é verificado uma única vez, mesmo se usado por vários arquivos
+        chunk_owner = {}
+        for name, entry in snapshot['files'].items():
+            for digest in entry['chunks']:
+                chunk_owner.setdefault(digest, name)
+        self._total_bytes = sum(
+            store.index[digest][3] for digest in chunk_owner if digest in store.index
+        )
+
+        def verify_chunk(item):
+            digest, name = item
+            try:
+                if digest not in store.index:
+                    self._fail(name, f"bloco {digest[:12]} ausente do índice")
+                    return
+                data = store.read_chunk(digest)
+                if hashlib.sha256(data).hexdigest() != digest:
+                    self._fail(name, f"bloco {digest[:12]} corrompido")
+                self._advance(len(data))
+            except Exception as e:
+                self._fail(name, str(e))
+
+        self._run_all(verify_chunk, chunk_owner.items())
+        self.result['files'] = len(snapshot['files'])
+
+
+def verify_backup(backup_path, progress_callback=None, governor=None):
+    """Verifica um backup e retorna o dicionário de resultado"""
+    return BackupVerifier(backup_path, progress_callback, governor).verify()
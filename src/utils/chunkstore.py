@@ -0,0 +1,652 @@
+"""
+Armazenamento deduplicado de backups do ADF System Manager.
+
+Os arquivos são divididos em blocos definidos pelo conteúdo (FastCDC com
+gear hash), cada bloco é identificado pelo seu SHA-256 e gravado uma única
+vez em arquivos de pacote. Cada execução de backup gera apenas um snapshot
+com a lista de blocos de cada arquivo.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from bisect import bisect_left
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+)
+from datetime import datetime
+from .logger import get_logger
+from .governor import lower_process_priority, lower_thread_priority
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = get_logger(__name__)
+
+STORE_DIR_NAME = 'adf_dedup'
+STORE_VERSION = 1
+
+# Parâmetros do chunker (tamanho médio de 1MB)
+CHUNK_MIN_SIZE = 256 * 1024
+CHUNK_AVG_SIZE = 1024 * 1024
+CHUNK_MAX_SIZE = 4 * 1024 * 1024
+
+# Tamanho máximo de cada arquivo de pacote
+PACK_MAX_SIZE = 64 * 1024 * 1024
+
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Arquivos maiores são divididos em trechos processados em paralelo
+SEGMENT_SIZE = 32 * 1024 * 1024
+
+# Trecho varrido de cada vez pela busca vetorizada (cabe no cache da CPU)
+SCAN_BLOCK_SIZE = 128 * 1024
+
+# Cabeçalho de cada bloco dentro do pacote: digest, codec, tamanho gravado
+RECORD_HEADER = struct.Struct('>32sBI')
+CODEC_STORED = 0
+CODEC_ZLIB = 1
+
+_HASH_MASK = (1 << 48) - 1
+
+
+def _build_gear_table():
+    """Gera a tabela gear de forma determinística"""
+    return [
+        int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], 'big') & _HASH_MASK
+        for i in range(256)
+    ]
+
+
+GEAR = _build_gear_table()
+
+# Normalização do FastCDC: máscara mais difícil antes do tamanho médio,
+# mais fácil depois dele
+_AVG_BITS = CHUNK_AVG_SIZE.bit_length() - 1
+MASK_HARD = ((1 << (_AVG_BITS + 2)) - 1) << 8
+MASK_EASY = ((1 << (_AVG_BITS - 2)) - 1) << 8
+
+# O fingerprint é deslocado um bit por byte, então os bits das máscaras só
+# dependem dos últimos _WINDOW bytes: o teste de corte pode ser calculado
+# para todas as posições de uma vez, em aritmética de 32 bits
+_WINDOW = 32
+assert MASK_HARD < (1 << _WINDOW) and MASK_EASY & ~MASK_HARD == 0
+
+if numpy is not None:
+    _GEAR32 = numpy.array([g & 0xFFFFFFFF for g in GEAR], dtype=numpy.uint32)
+
+
+def _scan_candidates(data, lo, hi):
+    """Posições de data[lo:hi] que passam nas máscaras fácil e difícil
+
+    O fingerprint de cada posição é calculado só com a janela de _WINDOW
+    bytes anteriores, que precisa estar em data.
+    """
+    easy, hard = [], []
+    for block in range(lo, hi, SCAN_BLOCK_SIZE):
+        base = max(block - _WINDOW + 1, 0)
+        block_end = min(block + SCAN_BLOCK_SIZE, hi)
+        fp = _GEAR32[numpy.frombuffer(data, dtype=numpy.uint8,
+                                      count=block_end - base, offset=base)]
+        # Soma da janela por duplicação: fp(i) com 2w bytes = fp(i) com w
+        # bytes + (fp(i - w) com w bytes) << w
+        width = 1
+        while width < _WINDOW:
+            fp[width:] += fp[:-width] << numpy.uint32(width)
+            width *= 2
+        fp = fp[block - base:]
+        found = numpy.flatnonzero((fp & MASK_EASY) == 0)
+        easy.extend((found + block).tolist())
+        hard.extend((found[(fp[found] & MASK_HARD) == 0] + block).tolist())
+    return easy, hard
+
+
+def find_cut_point(data, start, end, candidates=None):
+    """Retorna a posição de corte do próximo bloco em data[start:end]
+
+    candidates são as listas (fácil, difícil) de _scan_candidates cobrindo
+    data[start:end]; sem elas o fingerprint é calculado byte a byte.
+    """
+    remaining = end - start
+    if remaining <= CHUNK_MIN_SIZE:
+        return end
+
+    limit = start + min(remaining, CHUNK_MAX_SIZE)
+    normal = start + min(remaining, CHUNK_AVG_SIZE)
+    gear = GEAR
+    fp = 0
+
+    i = start + CHUNK_MIN_SIZE
+    # Logo após o mínimo o fingerprint ainda não tem a janela completa e é
+    # calculado aqui; dali em diante vale o resultado da varredura
+    scan_end = limit if candidates is None else min(i + _WINDOW, limit)
+    while i < min(normal, scan_end):
+        fp = ((fp << 1) + gear[data[i]]) & _HASH_MASK
+        if not fp & MASK_HARD:
+            return i + 1
+        i += 1
+
+    while i < scan_end:
+        fp = ((fp << 1) + gear[data[i]]) & _HASH_MASK
+        if not fp & MASK_EASY:
+            return i + 1
+        i += 1
+
+    if candidates is not None and i < limit:
+        easy, hard = candidates
+        j = bisect_left(hard, i)
+        if j < len(hard) and hard[j] < normal:
+            return hard[j] + 1
+        j = bisect_left(easy, max(i, normal))
+        if j < len(easy) and easy[j] < limit:
+            return easy[j] + 1
+
+    return limit
+
+
+def chunk_range(path, start, end, known=None, sync=None, keep_data=True):
+    """Divide em blocos o trecho do arquivo que começa em start
+
+    Para no primeiro corte em end ou depois dele (o último bloco pode passar
+    de end) ou, se sync for informado, no primeiro corte que estiver em sync.
+    Retorna [(offset, tamanho, sha256, dados), ...]; dados é None para blocos
+    já presentes em known ou se keep_data for False.
+    Executado nos workers do pool, por isso é uma função de módulo.
+    """
+    chunks = []
+    buffer = bytearray()
+    base = start
+    pos = 0
+    easy, hard = [], []
+    eof = False
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while base + pos < end and not (sync and base + pos in sync):
+            # Mantém pelo menos um bloco máximo à frente de pos
+            if not eof and len(buffer) - pos < CHUNK_MAX_SIZE:
+                if pos:
+                    del buffer[:pos]
+                    easy = [p - pos for p in easy if p >= pos]
+                    hard = [p - pos for p in hard if p >= pos]
+                    base += pos
+                    pos = 0
+                data = f.read(READ_BUFFER_SIZE)
+                if data:
+                    scanned = len(buffer)
+                    buffer += data
+                    if numpy is not None:
+                        new_easy, new_hard = _scan_candidates(buffer, scanned, len(buffer))
+                        easy += new_easy
+                        hard += new_hard
+                else:
+                    eof = True
+                continue
+
+            if pos >= len(buffer):
+                break
+
+            cut = find_cut_point(buffer, pos, len(buffer),
+                                 (easy, hard) if numpy is not None else None)
+            view = memoryview(buffer)
+            digest = hashlib.sha256(view[pos:cut]).hexdigest()
+            data = None
+            if keep_data and (known is None or digest not in known):
+                data = bytes(view[pos:cut])
+            view.release()
+            chunks.append((base + pos, cut - pos, digest, data))
+            pos = cut
+
+    return chunks
+
+
+def chunk_file(path):
+    """Divide um arquivo em blocos e retorna [(tamanho, sha256), ...]"""
+    return [
+        (length, digest)
+        for _, length, digest, _ in chunk_range(path, 0, os.path.getsize(path), keep_data=False)
+    ]
+
+
+def _segments(size):
+    """Trechos (início, fim) em que um arquivo é dividido para o chunking"""
+    if not size:
+        return [(0, 0)]
+    return [(start, min(start + SEGMENT_SIZE, size)) for start in range(0, size, SEGMENT_SIZE)]
+
+
+def _merge_segments(path, segments, known=None):
+    """Junta os blocos dos trechos de um arquivo
+
+    Cada trecho foi dividido a partir do seu início, que não é um corte real.
+    Os blocos de um trecho só valem a partir de um corte em comum com a
+    sequência verdadeira; até lá o arquivo é dividido de novo aqui.
+    segments é a lista ordenada de (início, fim, blocos).
+    """
+    chunks = list(segments[0][2])
+    for _, end, segment_chunks in segments[1:]:
+        pos = chunks[-1][0] + chunks[-1][1] if chunks else 0
+        offsets = {chunk[0]: index for index, chunk in enumerate(segment_chunks)}
+        if pos not in offsets:
+            chunks += chunk_range(path, pos, end, known, sync=offsets)
+            pos = chunks[-1][0] + chunks[-1][1]
+        if pos in offsets:
+            chunks += segment_chunks[offsets[pos]:]
+    return chunks
+
+
+def _create_executor(max_workers):
+    """Cria o pool de workers do chunking
+
+    Com numpy a varredura e o SHA-256 liberam o GIL e threads bastam, sem
+    copiar os blocos entre processos; sem ele o chunking usa processos, com
+    fallback para threads.
+    """
+    if numpy is not None:
+        return ThreadPoolExecutor(max_workers=max_workers, initializer=lower_thread_priority)
+    try:
+        # Processos de chunking sempre com prioridade baixa
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=lower_process_priority)
+    except Exception as e:
+        logger.warning(f"Pool de processos indisponível, usando threads: {e}")
+        return ThreadPoolExecutor(max_workers=max_workers, initializer=lower_thread_priority)
+
+
+class ChunkStore:
+    """Repositório de blocos endereçados por conteúdo"""
+
+    def __init__(self, path):
+        self.path = path
+        self.packs_dir = os.path.join(path, 'packs')
+        self.snapshots_dir = os.path.join(path, 'snapshots')
+        self.index_file = os.path.join(path, 'index.json')
+        self.index = {}
+        self._pack_name = None
+        self._pack_file = None
+        self._pack_size = 0
+        self.open()
+
+    def open(self):
+        """Cria a estrutura do repositório e carrega o índice"""
+        os.makedirs(self.packs_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+        config_file = os.path.join(self.path, 'config.json')
+        if not os.path.exists(config_file):
+            self._write_json(config_file, {
+                'version': STORE_VERSION,
+                'chunk_min_size': CHUNK_MIN_SIZE,
+                'chunk_avg_size': CHUNK_AVG_SIZE,
+                'chunk_max_size': CHUNK_MAX_SIZE
+            })
+
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def _write_json(self, path, data):
+        """Grava um JSON de forma atômica"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def save_index(self):
+        """Persiste o índice de blocos"""
+        self._write_json(self.index_file, self.index)
+
+    def _next_pack(self):
+        """Fecha o pacote atual e abre um novo"""
+        self._close_pack()
+        numbers = [
+            int(name[5:-5]) for name in os.listdir(self.packs_dir)
+            if name.startswith('pack_') and name.endswith('.pack') and name[5:-5].isdigit()
+        ]
+        self._pack_name = f"pack_{max(numbers, default=0) + 1:06d}.pack"
+        self._pack_file = open(os.path.join(self.packs_dir, self._pack_name), 'ab')
+        self._pack_size = 0
+
+    def _close_pack(self):
+        if self._pack_file:
+            self._pack_file.flush()
+            os.fsync(self._pack_file.fileno())
+            self._pack_file.close()
+            self._pack_file = None
+
+    def has_chunk(self, digest):
+        return digest in self.index
+
+    def add_chunk(self, digest, data, compress=True):
+        """Grava um bloco no pacote atual se ainda não existir"""
+        if digest in self.index:
+            return 0
+
+        codec, payload = CODEC_STORED, bytes(data)
+        if compress:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                codec, payload = CODEC_ZLIB, compressed
+
+        self._append_record(digest, codec, payload, len(data))
+        return len(payload)
+
+    def _append_record(self, digest, codec, payload, raw_size):
+        """Acrescenta um registro ao pacote atual e atualiza o índice"""
+        if self._pack_file is None or self._pack_size + len(payload) > PACK_MAX_SIZE:
+            self._next_pack()
+
+        self._pack_file.write(RECORD_HEADER.pack(bytes.fromhex(digest), codec, len(payload)))
+        offset = self._pack_file.tell()
+        self._pack_file.write(payload)
+        self._pack_size = offset + len(payload)
+
+        self.index[digest] = [self._pack_name, offset, len(payload), raw_size, codec]
+
+    def read_chunk(self, digest):
+        """Lê e descompacta um bloco"""
+        pack_name, offset, stored_size, raw_size, codec = self.index[digest]
+        with open(os.path.join(self.packs_dir, pack_name), 'rb') as f:
+            f.seek(offset)
+            payload = f.read(stored_size)
+        data = zlib.decompress(payload) if codec == CODEC_ZLIB else payload
+        if len(data) != raw_size:
+            raise IOError(f"Bloco corrompido: {digest}")
+        return data
+
+    def list_snapshots(self):
+        """Lista os snapshots existentes, do mais antigo ao mais novo"""
+        return sorted(
+            name[:-5] for name in os.listdir(self.snapshots_dir)
+            if name.endswith('.json')
+        )
+
+    def load_snapshot(self, name):
+        with open(os.path.join(self.snapshots_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def delete_snapshot(self, name):
+        """Remove um snapshot; os blocos só são liberados por prune()"""
+        os.remove(os.path.join(self.snapshots_dir, f"{name}.json"))
+
+    def referenced_chunks(self):
+        """Retorna os blocos usados por algum snapshot existente"""
+        referenced = set()
+        for name in self.list_snapshots():
+            for entry in self.load_snapshot(name)['files'].values():
+                referenced.update(entry['chunks'])
+        return referenced
+
+    def prune(self, repack_threshold=0.5):
+        """Libera os blocos que nenhum snapshot referencia
+
+        Pacotes sem blocos vivos são apagados; pacotes em que a fração de
+        dados mortos passa de repack_threshold são reescritos.
+        """
+        referenced = self.referenced_chunks()
+
+        live_by_pack = {}
+        for digest, entry in self.index.items():
+            live_by_pack.setdefault(entry[0], [])
+            if digest in referenced:
+                live_by_pack[entry[0]].append(digest)
+
+        obsolete_packs = []
+        existing_packs = set(os.listdir(self.packs_dir))
+        for pack_name in sorted(existing_packs):
+            if not pack_name.endswith('.pack'):
+                continue
+            pack_path = os.path.join(self.packs_dir, pack_name)
+            live = live_by_pack.get(pack_name, [])
+            pack_size = os.path.getsize(pack_path)
+            live_size = sum(RECORD_HEADER.size + self.index[d][2] for d in live)
+
+            if not live:
+                obsolete_packs.append(pack_path)
+            elif pack_size and 1 - live_size / pack_size >= repack_threshold:
+                # Copia os blocos vivos para um pacote novo
+                with open(pack_path, 'rb') as f:
+                    for digest in live:
+                        _, offset, stored_size, raw_size, codec = self.index[digest]
+                        f.seek(offset)
+                        self._append_record(digest, codec, f.read(stored_size), raw_size)
+                obsolete_packs.append(pack_path)
+
+        # Índice novo é gravado antes de apagar os pacotes antigos
+        self.index = {d: entry for d, entry in self.index.items() if d in referenced}
+        self._close_pack()
+        self.save_index()
+
+        # Espaço ocupado pelos pacotes criados na reescrita
+        freed = -sum(
+            os.path.getsize(os.path.join(self.packs_dir, name))
+            for name in set(os.listdir(self.packs_dir)) - existing_packs
+        )
+        for pack_path in obsolete_packs:
+            freed += os.path.getsize(pack_path)
+            os.remove(pack_path)
+
+        logger.info(f"Repositório {self.path}: {len(obsolete_packs)} pacotes liberados")
+        return max(freed, 0)
+
+    def create_snapshot(self, name, source_paths, progress_callback=None, max_workers=None,
+                        policy=None, governor=None):
+        """Executa um backup deduplicado das pastas de origem"""
+        # Snapshot anterior usado para pular arquivos não modificados
+        previous = {}
+        snapshots = self.list_snapshots()
+        if snapshots:
+            try:
+                previous = self.load_snapshot(snapshots[-1]).get('files', {})
+            except Exception as e:
+                logger.warning(f"Erro ao ler snapshot anterior: {e}")
+
+        files = {}
+        pending = []
+        total_bytes = 0
+
+        for source in source_paths:
+            for root, _, filenames in os.walk(source):
+                for filename in filenames:
+                    file_path = os.path.join(root, filename)
+                    arcname = os.path.relpath(file_path, os.path.dirname(source))
+                    try:
+                        st = os.stat(file_path)
+                    except OSError as e:
+                        logger.warning(f"Erro ao acessar {file_path}: {e}")
+                        continue
+
+                    total_bytes += st.st_size
+                    entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+                    old = previous.get(arcname)
+                    if (old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns
+                            and all(d in self.index for d in old['chunks'])):
+                        entry['chunks'] = old['chunks']
+                        files[arcname] = entry
+                    else:
+                        pending.append((file_path, arcname, entry))
+
+        stats = {
+            'files': len(files) + len(pending),
+            'unchanged_files': len(files),
+            'total_bytes': total_bytes,
+            'new_chunks': 0,
+            'new_bytes': 0,
+            'stored_bytes': 0
+        }
+        done_bytes = sum(entry['size'] for entry in files.values())
+
+        def report():
+            if progress_callback and total_bytes:
+                progress_callback(int(done_bytes * 100 / total_bytes))
+
+        report()
+
+        if pending:
+            executor = _create_executor(max_workers or os.cpu_count())
+            # Workers em threads consultam o índice e não copiam blocos já gravados
+            known = self.index if isinstance(executor, ThreadPoolExecutor) else None
+            tasks = (
+                (index, segment, start, end)
+                for index, (file_path, _, entry) in enumerate(pending)
+                for segment, (start, end) in enumerate(_segments(entry['size']))
+            )
+            results = {}
+            running = {}
+            # Trechos em andamento limitados para não acumular dados na memória
+            max_running = (max_workers or os.cpu_count() or 1) + 2
+            try:
+                while True:
+                    for index, segment, start, end in tasks:
+                        future = executor.submit(chunk_range, pending[index][0], start, end, known)
+                        running[future] = (index, segment, start, end)
+                        if len(running) >= max_running:
+                            break
+                    if not running:
+                        break
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index, segment, start, end = running.pop(future)
+                        file_path, arcname, entry = pending[index]
+                        segments = results.setdefault(index, [None] * len(_segments(entry['size'])))
+                        try:
+                            segments[segment] = (start, end, future.result())
+                        except Exception as e:
+                            logger.warning(f"Erro ao processar {file_path}: {e}")
+                            segments[segment] = e
+                        if any(item is None for item in segments):
+                            continue
+
+                        del results[index]
+                        if any(isinstance(item, Exception) for item in segments):
+                            continue
+                        try:
+                            chunks = _merge_segments(file_path, segments, known)
+                            compress = policy.should_compress(file_path, entry['size']) if policy else True
+                            stored_before = stats['stored_bytes']
+                            self._store_file_chunks(file_path, entry, chunks, stats, compress)
+                            if governor:
+                                governor.transfer(read=entry['size'],
+                                                  written=stats['stored_bytes'] - stored_before)
+                        except Exception as e:
+                            logger.warning(f"Erro ao processar {file_path}: {e}")
+                            continue
+
+                        entry['chunks'] = [digest for _, _, digest, _ in chunks]
+                        files[arcname] = entry
+                        done_bytes += entry['size']
+                        report()
+            finally:
+                executor.shutdown(wait=True)
+
+        self._close_pack()
+        self.save_index()
+
+        snapshot = {
+            'name': name,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'sources': list(source_paths),
+            'files': files,
+            'stats': stats
+        }
+        self._write_json(os.path.join(self.snapshots_dir, f"{name}.json"), snapshot)
+
+        logger.info(
+            f"Snapshot {name}: {stats['files']} arquivos, {stats['new_chunks']} blocos novos, "
+            f"{stats['stored_bytes']} de {stats['total_bytes']} bytes gravados"
+        )
+        return snapshot
+
+    def _store_file_chunks(self, file_path, entry, chunks, stats, compress=True):
+        """Grava os blocos de um arquivo ainda não armazenados
+
+        Os dados vêm do mesmo trecho lido para o chunking, sem reler o arquivo.
+        """
+        # O arquivo pode ter mudado de tamanho depois do os.stat da varredura
+        if sum(length for _, length, _, _ in chunks) != entry['size']:
+            raise IOError(f"Arquivo alterado durante o backup: {file_path}")
+
+        for _, length, digest, data in chunks:
+            if digest not in self.index:
+                if data is None:
+                    raise IOError(f"Dados do bloco indisponíveis: {digest}")
+                stats['stored_bytes'] += self.add_chunk(digest, data, compress)
+                stats['new_chunks'] += 1
+                stats['new_bytes'] += length
+
+    def restore_snapshot(self, name, target, files=None, skip_unchanged=False,
+                         progress_callback=None):
+        """Restaura um snapshot (ou apenas os arquivos informados) em target
+
+        files usa nomes com '/' como separador. Com skip_unchanged, arquivos
+        com o mesmo tamanho, data de modificação e blocos não são regravados.
+        progress_callback recebe a quantidade de bytes processados. O hash de
+        cada bloco é conferido; um arquivo com bloco ausente ou corrompido é
+        contado em errors e listado em failed, e os demais são restaurados.
+        """
+        snapshot = self.load_snapshot(name)
+        result = {'restored': 0, 'skipped': 0, 'errors': 0, 'failed': []}
+        target = os.path.abspath(target)
+
+        for arcname, entry in snapshot['files'].items():
+            if files is not None and arcname.replace(os.sep, '/') not in files:
+                continue
+
+            # Impede que um snapshot adulterado grave fora do destino
+            parts = [part for part in arcname.replace(os.sep, '/').split('/')
+                     if part not in ('', '.', '..')]
+            dest_path = os.path.abspath(os.path.join(target, *parts))
+            try:
+                inside = bool(parts) and os.path.commonpath([dest_path, target]) == target
+            except ValueError:
+                inside = False
+            if not inside:
+                logger.warning(f"Caminho inválido no snapshot: {arcname}")
+                result['errors'] += 1
+                result['failed'].append(arcname)
+                continue
+
+            if skip_unchanged:
+                try:
+                    st = os.stat(dest_path)
+                    # Tamanho e data iguais não bastam: os blocos também são conferidos
+                    if (st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']
+                            and [digest for _, digest in chunk_file(dest_path)] == entry['chunks']):
+                        result['skipped'] += 1
+                        if progress_callback:
+                            progress_callback(entry['size'])
+                        continue
+                except OSError:
+                    pass
+
+            # Gravado ao lado e renomeado: uma falha não deixa o destino pela metade
+            tmp_path = f"{dest_path}.adf_restore"
+            try:
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                with open(tmp_path, 'wb') as f:
+                    for digest in entry['chunks']:
+                        if digest not in self.index:
+                            raise IOError(f"Bloco ausente do índice: {digest}")
+                        data = self.read_chunk(digest)
+                        if hashlib.sha256(data).hexdigest() != digest:
+                            raise IOError(f"Bloco corrompido: {digest}")
+                        f.write(data)
+                        if progress_callback:
+                            progress_callback(len(data))
+                os.utime(tmp_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+                os.replace(tmp_path, dest_path)
+                result['restored'] += 1
+            except (OSError, zlib.error) as e:
+                logger.warning(f"Erro ao restaurar {arcname}: {e}")
+                result['errors'] += 1
+                result['failed'].append(arcname)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        return result
@@ -0,0 +1,383 @@
+"""
+Motor de limpeza de arquivos temporários do ADF System Manager.
+
+Percorre cada diretório uma única vez com os.scandir, de baixo para cima,
+apagando os arquivos aceitos pela regra do alvo à medida que são encontrados.
+O tamanho vem do stat em cache do DirEntry, então não há chamadas extras por
+arquivo.
+
+A análise (simulação) usa um índice persistente do conteúdo de cada
+diretório; só diretórios com mtime alterado são listados novamente.
+"""
+
+import json
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .logger import get_logger
+from .config import get_cache_dir
+from .governor import lower_thread_priority
+from .cleanup_rules import ExclusionTrie, load_cleanup_rules
+from .quarantine import QUARANTINE_DIR
+
+logger = get_logger(__name__)
+
+# Intervalo mínimo entre relatórios de progresso, em segundos
+PROGRESS_INTERVAL = 0.2
+
+DIR_INDEX_VERSION = 2
+
+
+def get_cleanup_targets(categories=None, rules=None):
+    """Retorna os diretórios de limpeza existentes como (categoria, caminho)
+
+    categories limita o resultado às categorias (regras) informadas.
+    """
+    rules = rules or load_cleanup_rules()
+    return rules.targets_for(categories)
+
+
+def is_link(entry):
+    """Indica se a entrada é um link simbólico ou junção (não deve ser seguida)"""
+    if entry.is_symlink():
+        return True
+    if os.name != 'nt':
+        return False
+    # Junções do Windows não aparecem como symlink
+    attributes = getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0)
+    return bool(attributes & getattr(stat, 'FILE_ATTRIBUTE_REPARSE_POINT', 0))
+
+
+def _remove_link(path):
+    try:
+        os.unlink(path)
+    except (IsADirectoryError, PermissionError):
+        # No Windows links para diretórios são removidos com rmdir
+        os.rmdir(path)
+
+
+class CleanupEngine:
+    """Apaga o conteúdo de diretórios em uma passada, com subárvores em paralelo
+
+    targets são pares (regra, caminho) de get_cleanup_targets. Com uma
+    QuarantineSession os arquivos são movidos para a quarentena do volume
+    em vez de apagados.
+    progress_callback recebe (arquivos removidos, bytes liberados, diretório atual).
+    """
+
+    def __init__(self, targets, rules=None, max_workers=None, progress_callback=None, governor=None,
+                 quarantine=None):
+        self.targets = targets
+        self.rules = rules or load_cleanup_rules()
+        self.quarantine = quarantine
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.progress_callback = progress_callback
+        self.governor = governor
+        self.stats = {'files_removed': 0, 'dirs_removed': 0, 'space_saved': 0, 'errors': 0}
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    def _removed(self, size, path):
+        with self._lock:
+            self.stats['files_removed'] += 1
+            self.stats['space_saved'] += size
+            now = time.monotonic()
+            report = now - self._last_report >= PROGRESS_INTERVAL
+            if report:
+                self._last_report = now
+                files, saved = self.stats['files_removed'], self.stats['space_saved']
+        if report and self.progress_callback:
+            self.progress_callback(files, saved, os.path.dirname(path))
+        if self.governor:
+            self.governor.transfer()
+
+    def _error(self, path, error):
+        with self._lock:
+            self.stats['errors'] += 1
+        logger.debug(f"Erro ao remover {path}: {error}")
+
+    def _remove_file(self, entry, matcher, now, store):
+        """Remove (ou põe em quarentena) um arquivo aceito pela regra; retorna False se ele ficar"""
+        try:
+            # No Windows o stat já vem da listagem, sem nova chamada ao sistema
+            st = entry.stat(follow_symlinks=False)
+            if not matcher.matches(entry.name, st, now):
+                return False
+            if is_link(entry):
+                _remove_link(entry.path)
+                self._removed(0, entry.path)
+            elif store is not None:
+                store.move(entry.path, st.st_size)
+                self._removed(st.st_size, entry.path)
+            else:
+                os.unlink(entry.path)
+                self._removed(st.st_size, entry.path)
+            return True
+        except OSError as e:
+            self._error(entry.path, e)
+            return False
+
+    def clean_tree(self, path, matcher, excluded, now, store=None, remove_self=True):
+        """Apaga a subárvore de baixo para cima; retorna True se ficou vazia
+
+        excluded é o nó da árvore de exclusões correspondente a path e store
+        a pasta de quarentena do volume, se houver.
+        """
+        empty = True
+        try:
+            iterator = os.scandir(path)
+        except OSError as e:
+            self._error(path, e)
+            return False
+
+        with iterator:
+            for entry in iterator:
+                if self.cancelled.is_set():
+                    return False
+                child = ExclusionTrie.child(excluded, entry.name)
+                if (child is not None and child.terminal) or entry.name == QUARANTINE_DIR:
+                    empty = False
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False) and not is_link(entry)
+                except OSError as e:
+                    self._error(entry.path, e)
+                    empty = False
+                    continue
+                if is_dir:
+                    empty = self.clean_tree(entry.path, matcher, child, now, store) and empty
+                else:
+                    empty = self._remove_file(entry, matcher, now, store) and empty
+
+        if remove_self and empty:
+            try:
+                os.rmdir(path)
+                with self._lock:
+                    self.stats['dirs_removed'] += 1
+            except OSError as e:
+                self._error(path, e)
+                return False
+        return empty
+
+    def _clean_subtree(self, path, matcher, excluded, now, store):
+        if not self.cancelled.is_set():
+            self.clean_tree(path, matcher, excluded, now, store)
+
+    def run(self):
+        """Limpa todos os alvos e retorna as estatísticas"""
+        now = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='adf-cleanup',
+                                initializer=lower_thread_priority) as executor:
+            futures = []
+            for category, directory in self.targets:
+                matcher = self.rules.matchers[category]
+                # A quarentena nunca é limpa: dentro da árvore ela é pulada pelo
+                # nome, aqui é o caso do próprio alvo estar dentro dela
+                if QUARANTINE_DIR in os.path.normcase(os.path.abspath(directory)).split(os.sep):
+                    logger.debug(f"Alvo dentro da quarentena ignorado: {directory}")
+                    continue
+                excluded = self.rules.exclusions.node_for(directory)
+                store = None
+                if self.quarantine is not None:
+                    try:
+                        store = self.quarantine.store_for(directory)
+                    except OSError as e:
+                        # Sem quarentena o alvo não é limpo, para não perder o desfazer
+                        logger.error(f"Quarentena indisponível para {directory}: {e}")
+                        self._error(directory, e)
+                        continue
+                # Arquivos da raiz são apagados aqui e as subpastas em paralelo
+                try:
+                    with os.scandir(directory) as iterator:
+                        for entry in iterator:
+                            if self.cancelled.is_set():
+                                break
+                            child = ExclusionTrie.child(excluded, entry.name)
+                            if (child is not None and child.terminal) or entry.name == QUARANTINE_DIR:
+                                continue
+                            try:
+                                is_dir = entry.is_dir(follow_symlinks=False) and not is_link(entry)
+                            except OSError as e:
+                                self._error(entry.path, e)
+                                continue
+                            if is_dir:
+                                futures.append(executor.submit(
+                                    self._clean_subtree, entry.path, matcher, child, now, store
+                                ))
+                            else:
+                                self._remove_file(entry, matcher, now, store)
+                except OSError as e:
+                    self._error(directory, e)
+
+            for future in futures:
+                future.result()
+
+        if self.progress_callback:
+            self.progress_callback(self.stats['files_removed'], self.stats['space_saved'], '')
+        return self.stats
+
+
+class DirSizeIndex:
+    """Índice persistente com arquivos, bytes e subpastas diretos de cada diretório
+
+    As entradas são separadas por regra e só contam os arquivos aceitos por
+    ela; o índice inteiro é descartado quando as regras mudam.
+    """
+
+    def __init__(self, path=None, fingerprint=None):
+        self.path = path or os.path.join(get_cache_dir('cleanup'), 'dir_index.json')
+        self.fingerprint = fingerprint
+        self.entries = self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == DIR_INDEX_VERSION and data.get('rules') == self.fingerprint:
+                    return data['entries']
+        except Exception as e:
+            logger.warning(f"Índice de diretórios inválido, recriando: {e}")
+        return {}
+
+    def save(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': DIR_INDEX_VERSION, 'rules': self.fingerprint,
+                           'entries': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Erro ao gravar índice de diretórios: {e}")
+
+    def scan_directory(self, path, matcher, excluded, now):
+        """Lista o conteúdo direto de um diretório
+
+        Retorna (arquivos, bytes, subpastas, validade); a validade é o momento
+        em que um arquivo ainda novo demais passa a ser aceito, ou 0.
+        """
+        files = 0
+        size = 0
+        subdirs = []
+        expires = 0
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                child = ExclusionTrie.child(excluded, entry.name)
+                if child is not None and child.terminal:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False) and not is_link(entry):
+                        subdirs.append(entry.name)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if matcher.matches(entry.name, st, now):
+                    files += 1
+                    size += st.st_size
+                else:
+                    eligible = matcher.becomes_eligible(entry.name, st, now)
+                    if eligible and (not expires or eligible < expires):
+                        expires = eligible
+        return files, size, subdirs, expires
+
+    def measure_tree(self, root, category, matcher, excluded, now):
+        """Soma arquivos e bytes da árvore reaproveitando diretórios sem mudança
+
+        Retorna (arquivos, bytes, entradas visitadas, diretórios listados).
+        """
+        cached_entries = self.entries.get(category, {})
+        total_files = 0
+        total_size = 0
+        scanned = 0
+        visited = {}
+        pending = [(root, excluded)]
+
+        while pending:
+            path, excluded = pending.pop()
+            try:
+                # O mtime é lido antes da listagem: mudanças durante a análise invalidam o índice
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = cached_entries.get(path)
+            if cached and cached['mtime_ns'] == mtime_ns and not (cached['expires'] and cached['expires'] <= now):
+                files, size, subdirs, expires = (cached['files'], cached['bytes'],
+                                                 cached['subdirs'], cached['expires'])
+            else:
+                try:
+                    files, size, subdirs, expires = self.scan_directory(path, matcher, excluded, now)
+                except OSError as e:
+                    logger.debug(f"Erro ao analisar {path}: {e}")
+                    continue
+                scanned += 1
+
+            visited[path] = {'mtime_ns': mtime_ns, 'files': files, 'bytes': size,
+                             'subdirs': subdirs, 'expires': expires}
+            total_files += files
+            total_size += size
+            pending.extend((os.path.join(path, name), ExclusionTrie.child(excluded, name))
+                           for name in subdirs)
+
+        return total_files, total_size, visited, scanned
+
+
+class CleanupAnalyzer:
+    """Simula a limpeza e calcula arquivos e bytes por categoria (regra)
+
+    Usa as mesmas regras compiladas do CleanupEngine.
+    progress_callback recebe (porcentagem, categoria concluída).
+    """
+
+    def __init__(self, targets=None, rules=None, max_workers=None, progress_callback=None, index=None):
+        self.rules = rules or load_cleanup_rules()
+        self.targets = targets if targets is not None else self.rules.targets_for()
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.progress_callback = progress_callback
+        self.index = index or DirSizeIndex(fingerprint=self.rules.fingerprint)
+
+    def run(self):
+        """Analisa os alvos em paralelo e retorna {categoria: resultado}"""
+        start = time.perf_counter()
+        now = time.time()
+        results = {}
+        visited = {}
+        scanned = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='adf-analyze',
+                                initializer=lower_thread_priority) as executor:
+            futures = {
+                executor.submit(self.index.measure_tree, path, category, self.rules.matchers[category],
+                                self.rules.exclusions.node_for(path), now): (category, path)
+                for category, path in self.targets
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                category, path = futures[future]
+                files, size, tree, tree_scanned = future.result()
+                visited.setdefault(category, {}).update(tree)
+                scanned += tree_scanned
+                # Uma regra com curinga pode ter vários alvos (perfis de navegador)
+                result = results.setdefault(category, {'paths': [], 'files': 0, 'bytes': 0})
+                result['paths'].append(path)
+                result['files'] += files
+                result['bytes'] += size
+                if self.progress_callback:
+                    self.progress_callback(int(done * 100 / len(futures)), category)
+
+        for result in results.values():
+            result['path'] = '\n'.join(sorted(result.pop('paths')))
+
+        # As categorias analisadas são substituídas, as demais ficam como estavam
+        self.index.entries.update(visited)
+        self.index.save()
+
+        directories = sum(len(tree) for tree in visited.values())
+        logger.info(
+            f"Análise de limpeza: {directories} diretórios, {scanned} listados, "
+            f"{directories - scanned} do índice em {time.perf_counter() - start:.1f}s"
+        )
+        return results
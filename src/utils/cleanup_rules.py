@@ -0,0 +1,192 @@
+"""
+Regras de limpeza do ADF System Manager.
+
+Cada regra define um caminho (com variáveis de ambiente e curingas), padrões
+de nome, idade mínima e limites de tamanho. As regras são compiladas uma
+vez: os padrões de cada regra viram uma única expressão regular e as
+exclusões uma árvore de prefixos, percorrida junto com os diretórios, de
+modo que cada entrada custa uma busca em dicionário e um match.
+"""
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+from .logger import get_logger
+from .config import get_config_value
+from .i18n import _
+from .constants import DEFAULT_CLEANUP_RULES
+
+logger = get_logger(__name__)
+
+_ENV_PATTERN = re.compile(r'%(\w+)%')
+
+
+def expand_path(path):
+    """Expande %VARIAVEL% no caminho; retorna None se alguma não existir"""
+    missing = []
+
+    def replace(match):
+        name = match.group(1)
+        if name == 'SYSTEM_TEMP':
+            # Fora do Windows seria o /tmp compartilhado, que o sistema já limpa
+            value = tempfile.gettempdir() if os.name == 'nt' else None
+        else:
+            value = os.getenv(name)
+        if value is None:
+            missing.append(name)
+            return ''
+        # Valores de variáveis não devem ser interpretados como curingas
+        return glob.escape(value)
+
+    expanded = _ENV_PATTERN.sub(replace, path)
+    return None if missing else expanded
+
+
+class RuleMatcher:
+    """Condições de uma regra para os arquivos dentro do seu caminho"""
+
+    def __init__(self, patterns, min_age_days=0, min_size=0, max_size=0):
+        patterns = patterns or ['*']
+        # Todos os padrões em uma expressão só
+        self.regex = re.compile('|'.join(
+            f'(?:{fnmatch.translate(os.path.normcase(pattern))})' for pattern in patterns
+        ))
+        self.match_all = '*' in patterns
+        self.min_age = min_age_days * 86400
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def matches(self, name, st, now):
+        """Indica se o arquivo deve ser apagado"""
+        if not self.match_all and not self.regex.match(os.path.normcase(name)):
+            return False
+        if st.st_size < self.min_size or (self.max_size and st.st_size > self.max_size):
+            return False
+        return not self.min_age or now - st.st_mtime >= self.min_age
+
+    def becomes_eligible(self, name, st, now):
+        """Momento em que um arquivo recusado só pela idade passa a valer, ou None"""
+        if not self.min_age or self.matches(name, st, now):
+            return None
+        if not self.match_all and not self.regex.match(os.path.normcase(name)):
+            return None
+        if st.st_size < self.min_size or (self.max_size and st.st_size > self.max_size):
+            return None
+        return st.st_mtime + self.min_age
+
+
+class _TrieNode:
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self):
+        self.children = {}
+        self.terminal = False
+
+
+class ExclusionTrie:
+    """Árvore de prefixos dos caminhos excluídos, por componente"""
+
+    def __init__(self, paths=()):
+        self.root = _TrieNode()
+        for path in paths:
+            self.add(path)
+
+    @staticmethod
+    def _parts(path):
+        path = os.path.normcase(os.path.abspath(path))
+        drive, rest = os.path.splitdrive(path)
+        return [drive] + [part for part in rest.split(os.sep) if part]
+
+    def add(self, path):
+        node = self.root
+        for part in self._parts(path):
+            node = node.children.setdefault(part, _TrieNode())
+        node.terminal = True
+
+    def node_for(self, path):
+        """Retorna o nó de um diretório, ou None se nenhuma exclusão fica abaixo dele"""
+        node = self.root
+        for part in self._parts(path):
+            node = node.children.get(part)
+            if node is None or node.terminal:
+                return node
+        return node
+
+    @staticmethod
+    def child(node, name):
+        """Desce um nível; None indica que não há exclusões abaixo"""
+        if node is None:
+            return None
+        return node.children.get(os.path.normcase(name))
+
+    def is_excluded(self, path):
+        node = self.node_for(path)
+        return node is not None and node.terminal
+
+
+class CleanupRules:
+    """Conjunto compilado de regras e exclusões"""
+
+    def __init__(self, rules=None, exclusions=None):
+        self.rules = [rule for rule in (rules if rules is not None else DEFAULT_CLEANUP_RULES)
+                      if rule.get('enabled', True)]
+        self.exclusion_paths = exclusions or []
+        self.fingerprint = hashlib.sha1(
+            json.dumps([self.rules, self.exclusion_paths], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        self.matchers = {}
+        self.targets = []
+        self.exclusions = ExclusionTrie()
+        self.compile()
+
+    def compile(self):
+        """Resolve os caminhos e compila padrões e exclusões"""
+        for path in self.exclusion_paths:
+            expanded = expand_path(path)
+            if expanded:
+                self.exclusions.add(expanded)
+
+        seen = set()
+        for rule in self.rules:
+            name = rule['name']
+            try:
+                self.matchers[name] = RuleMatcher(
+                    rule.get('patterns'), rule.get('min_age_days', 0),
+                    rule.get('min_size', 0), rule.get('max_size', 0)
+                )
+            except re.error as e:
+                logger.warning(f"Regra de limpeza {name} inválida: {e}")
+                continue
+
+            expanded = expand_path(rule['path'])
+            if not expanded:
+                continue
+            for path in sorted(glob.glob(expanded)) if glob.has_magic(expanded) else [expanded]:
+                # O Temp do usuário costuma ser o mesmo diretório do Temp do sistema
+                key = os.path.normcase(os.path.abspath(path))
+                if key in seen or not os.path.isdir(path) or self.exclusions.is_excluded(path):
+                    continue
+                seen.add(key)
+                self.targets.append((name, path))
+
+    def targets_for(self, categories=None):
+        """Retorna (regra, caminho) dos alvos, opcionalmente só das regras informadas"""
+        return [(name, path) for name, path in self.targets
+                if categories is None or name in categories]
+
+
+def load_cleanup_rules():
+    """Compila as regras e exclusões salvas na configuração"""
+    return CleanupRules(
+        get_config_value('cleanup.rules', DEFAULT_CLEANUP_RULES),
+        get_config_value('cleanup.exclusions', [])
+    )
+
+
+def category_label(name):
+    """Nome exibido de uma regra; regras do usuário usam o próprio nome"""
+    return _(f"tools.category_{name}", name)
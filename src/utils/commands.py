@@ -0,0 +1,223 @@
+"""
+Execução de comandos externos do ADF System Manager.
+
+Os comandos rodam como subprocessos asyncio em um loop próprio, em uma
+thread em segundo plano. Cada comando pode ter tempo limite e ser
+cancelado (a árvore de processos inteira é encerrada), e as linhas de
+stdout/stderr são entregues à medida que chegam. Vários comandos
+independentes podem rodar ao mesmo tempo, cada um com o seu submit().
+"""
+
+import asyncio
+import locale
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+import psutil
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Quantidade de resultados guardados no histórico
+HISTORY_SIZE = 100
+
+# Buffer dos pipes e tamanho máximo de uma linha; uma linha maior é
+# entregue em partes, para que a leitura nunca pare e trave o processo
+STREAM_LIMIT = 1024 * 1024
+
+
+def _console_encoding():
+    """Codificação usada pelos programas de console"""
+    if os.name == 'nt':
+        try:
+            import ctypes
+            return f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+        except Exception:
+            pass
+    return locale.getpreferredencoding(False)
+
+
+def kill_process_tree(pid):
+    """Encerra um processo e todos os seus descendentes"""
+    try:
+        parent = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return
+    processes = parent.children(recursive=True) + [parent]
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(processes, timeout=5)
+
+
+class CommandHandle:
+    """Comando em execução; permite cancelar e aguardar o resultado"""
+
+    def __init__(self, runner, command, name):
+        self.runner = runner
+        self.command = command
+        self.name = name
+        self.future = None
+        self.pid = None
+        self.cancel_requested = False
+        self._cancel_event = None
+
+    def cancel(self):
+        """Encerra o comando e seus subprocessos"""
+        self.cancel_requested = True
+        self.runner.loop.call_soon_threadsafe(self._set_cancel)
+
+    def _set_cancel(self):
+        # Executado na thread do loop; o evento só existe depois que o comando começa
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """Aguarda e retorna o dicionário de resultado"""
+        return self.future.result(timeout)
+
+
+class CommandRunner:
+    """Executor compartilhado de comandos externos"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.encoding = _console_encoding()
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name='adf-commands', daemon=True)
+        self._thread.start()
+
+    def submit(self, command, timeout=None, line_callback=None, shell=False, cwd=None, name=None):
+        """Inicia um comando e retorna um CommandHandle
+
+        command é uma lista de argumentos ou, com shell=True, uma string.
+        line_callback recebe (fluxo, linha) para cada linha de 'stdout' e
+        'stderr', na thread do executor. name identifica o comando no log;
+        a linha de comando nunca é registrada, pois pode conter senhas.
+        """
+        if name is None:
+            name = command.split()[0] if shell else os.path.basename(command[0])
+        handle = CommandHandle(self, command, name)
+        handle.future = asyncio.run_coroutine_threadsafe(
+            self._run(handle, timeout, line_callback, shell, cwd), self.loop
+        )
+        return handle
+
+    def run(self, command, timeout=None, line_callback=None, shell=False, cwd=None, name=None):
+        """Executa um comando e aguarda o resultado"""
+        return self.submit(command, timeout, line_callback, shell, cwd, name).result()
+
+    def _emit_line(self, raw, kind, lines, line_callback):
+        line = raw.decode(self.encoding, errors='replace').rstrip('\r\n')
+        lines.append(line)
+        if line_callback:
+            try:
+                line_callback(kind, line)
+            except Exception as e:
+                logger.debug(f"Erro no callback de saída: {e}")
+
+    async def _read_lines(self, stream, kind, lines, line_callback):
+        # Leitura em blocos em vez de readline(), que descarta a linha e
+        # interrompe a leitura quando ela passa do limite do buffer
+        partial = b''
+        while True:
+            data = await stream.read(STREAM_LIMIT)
+            if not data:
+                break
+            *complete, partial = (partial + data).split(b'\n')
+            for raw in complete:
+                self._emit_line(raw, kind, lines, line_callback)
+            if len(partial) >= STREAM_LIMIT:
+                self._emit_line(partial, kind, lines, line_callback)
+                partial = b''
+        if partial:
+            self._emit_line(partial, kind, lines, line_callback)
+
+    async def _run(self, handle, timeout, line_callback, shell, cwd):
+        handle._cancel_event = asyncio.Event()
+        result = {
+            'name': handle.name, 'returncode': None, 'stdout': '', 'stderr': '',
+            'duration': 0.0, 'timed_out': False, 'cancelled': False, 'error': None
+        }
+        if handle.cancel_requested:
+            result['cancelled'] = True
+            return result
+        start = time.monotonic()
+        kwargs = {
+            'stdin': asyncio.subprocess.DEVNULL,
+            'stdout': asyncio.subprocess.PIPE,
+            'stderr': asyncio.subprocess.PIPE,
+            'cwd': cwd,
+            'limit': STREAM_LIMIT
+        }
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+
+        try:
+            if shell:
+                process = await asyncio.create_subprocess_shell(handle.command, **kwargs)
+            else:
+                process = await asyncio.create_subprocess_exec(*handle.command, **kwargs)
+        except OSError as e:
+            result['error'] = str(e)
+            result['duration'] = time.monotonic() - start
+            logger.warning(f"Não foi possível executar {handle.name}: {e}")
+            self.history.append(result)
+            return result
+
+        handle.pid = process.pid
+        stdout = []
+        stderr = []
+        readers = [
+            asyncio.ensure_future(self._read_lines(process.stdout, 'stdout', stdout, line_callback)),
+            asyncio.ensure_future(self._read_lines(process.stderr, 'stderr', stderr, line_callback))
+        ]
+        waiter = asyncio.ensure_future(process.wait())
+        cancel = asyncio.ensure_future(handle._cancel_event.wait())
+
+        done, pending = await asyncio.wait({waiter, cancel}, timeout=timeout,
+                                           return_when=asyncio.FIRST_COMPLETED)
+        if waiter not in done:
+            result['cancelled'] = cancel in done
+            result['timed_out'] = not result['cancelled']
+            await self.loop.run_in_executor(None, kill_process_tree, process.pid)
+            await waiter
+        cancel.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+        result.update({
+            'returncode': process.returncode,
+            'stdout': '\n'.join(stdout),
+            'stderr': '\n'.join(stderr),
+            'duration': time.monotonic() - start
+        })
+        self.history.append(result)
+
+        if result['timed_out']:
+            logger.warning(f"Comando {handle.name} excedeu o tempo limite após {result['duration']:.1f}s")
+        elif result['cancelled']:
+            logger.info(f"Comando {handle.name} cancelado após {result['duration']:.1f}s")
+        else:
+            logger.info(f"Comando {handle.name}: código {process.returncode} em {result['duration']:.1f}s")
+        return result
+
+
+_command_runner = None
+_command_runner_lock = threading.Lock()
+
+
+def get_command_runner():
+    """Retorna a instância global de CommandRunner"""
+    global _command_runner
+    with _command_runner_lock:
+        if _command_runner is None:
+            _command_runner = CommandRunner()
+        return _command_runner
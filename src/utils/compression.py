@@ -0,0 +1,177 @@
+"""
+Política de compressão por arquivo para os backups do ADF System Manager.
+"""
+
+import hashlib
+import os
+import time
+import zipfile
+import zlib
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Algoritmos disponíveis para o backup compactado
+COMPRESSION_METHODS = {
+    'deflate': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2,
+    'lzma': zipfile.ZIP_LZMA,
+    'store': zipfile.ZIP_STORED
+}
+
+# Formatos que já são compactados e não diminuem com uma nova compressão
+INCOMPRESSIBLE_EXTENSIONS = {
+    # Imagens
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif', '.avif',
+    # Áudio e vídeo
+    '.mp3', '.mp4', '.m4a', '.m4v', '.aac', '.ogg', '.opus', '.flac',
+    '.avi', '.mkv', '.mov', '.wmv', '.webm',
+    # Arquivos compactados e instaladores
+    '.zip', '.rar', '.7z', '.gz', '.bz2', '.xz', '.zst', '.cab', '.msi',
+    '.jar', '.apk',
+    # Documentos com compressão interna
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub'
+}
+
+# Tamanho da amostra usada para estimar a compressibilidade
+SAMPLE_SIZE = 64 * 1024
+
+# Abaixo deste tamanho não vale a pena amostrar
+MIN_SAMPLE_FILE_SIZE = 4 * 1024
+
+# Razão (compactado / original) acima da qual o arquivo é gravado sem compressão
+MAX_USEFUL_RATIO = 0.9
+
+# Amostras por extensão antes de reutilizar a decisão
+SAMPLES_PER_EXTENSION = 3
+
+# Tamanho dos blocos lidos ao gravar no zip
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class CompressionPolicy:
+    """Decide o método de compressão de cada arquivo e coleta estatísticas"""
+
+    def __init__(self, algorithm='deflate', level=6):
+        if algorithm not in COMPRESSION_METHODS:
+            logger.warning(f"Algoritmo de compressão desconhecido: {algorithm}")
+            algorithm = 'deflate'
+        self.algorithm = algorithm
+        self.method = COMPRESSION_METHODS[algorithm]
+        self.level = level
+        # Resultado das amostras por extensão: [compressíveis, incompressíveis]
+        self._samples = {}
+        self.stats = {}
+
+    def _extension(self, path):
+        return os.path.splitext(path)[1].lower()
+
+    def should_compress(self, path, size=None, block=None):
+        """Indica se vale a pena compactar o arquivo
+
+        block pode trazer o início do arquivo já lido, evitando uma nova leitura.
+        """
+        if self.method == zipfile.ZIP_STORED:
+            return False
+
+        ext = self._extension(path)
+        if ext in INCOMPRESSIBLE_EXTENSIONS:
+            return False
+
+        if size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return True
+
+        if size < MIN_SAMPLE_FILE_SIZE:
+            return True
+
+        # Reaproveita a decisão de extensões já amostradas
+        samples = self._samples.get(ext)
+        if ext and samples and sum(samples) >= SAMPLES_PER_EXTENSION:
+            return samples[0] >= samples[1]
+
+        compressible = self._sample(path) if block is None else self._is_compressible(block)
+        samples = self._samples.setdefault(ext, [0, 0])
+        samples[0 if compressible else 1] += 1
+        return compressible
+
+    def _sample(self, path):
+        """Compacta o primeiro bloco do arquivo para estimar o ganho"""
+        try:
+            with open(path, 'rb') as f:
+                block = f.read(SAMPLE_SIZE)
+        except OSError:
+            return True
+        return self._is_compressible(block)
+
+    def _is_compressible(self, block):
+        block = block[:SAMPLE_SIZE]
+        if not block:
+            return True
+        return len(zlib.compress(block, 1)) / len(block) <= MAX_USEFUL_RATIO
+
+    def record(self, path, original_size, stored_size, compress_type, elapsed):
+        """Registra o resultado da gravação de um arquivo"""
+        ext = self._extension(path) or '(sem extensão)'
+        stats = self.stats.setdefault(ext, {
+            'files': 0,
+            'stored_files': 0,
+            'original_size': 0,
+            'stored_size': 0,
+            'seconds': 0.0
+        })
+        stats['files'] += 1
+        if compress_type == zipfile.ZIP_STORED:
+            stats['stored_files'] += 1
+        stats['original_size'] += original_size
+        stats['stored_size'] += stored_size
+        stats['seconds'] += elapsed
+
+    def write(self, zipf, file_path, arcname, governor=None):
+        """Grava um arquivo no zip usando a política e registra as estatísticas
+
+        Retorna (ZipInfo, sha256) do conteúdo gravado. Se informado, o
+        JobGovernor limita a taxa de leitura e gravação.
+        """
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+
+        with open(file_path, 'rb') as src:
+            block = src.read(WRITE_BUFFER_SIZE)
+            if self.should_compress(file_path, zinfo.file_size, block):
+                zinfo.compress_type = self.method
+                # Mesmo atributo usado por ZipFile.write para o nível
+                zinfo._compresslevel = None if self.method == zipfile.ZIP_LZMA else self.level
+            else:
+                zinfo.compress_type = zipfile.ZIP_STORED
+
+            with zipf.open(zinfo, 'w', force_zip64=zinfo.file_size > zipfile.ZIP64_LIMIT) as dest:
+                while block:
+                    digest.update(block)
+                    dest.write(block)
+                    if governor:
+                        governor.transfer(read=len(block))
+                    block = src.read(WRITE_BUFFER_SIZE)
+
+        if governor:
+            governor.transfer(written=zinfo.compress_size)
+
+        elapsed = time.perf_counter() - start
+        self.record(file_path, zinfo.file_size, zinfo.compress_size, zinfo.compress_type, elapsed)
+        return zinfo, digest.hexdigest()
+
+    def summary(self):
+        """Retorna as estatísticas por tipo, das maiores para as menores"""
+        lines = []
+        ordered = sorted(self.stats.items(), key=lambda item: item[1]['original_size'], reverse=True)
+        for ext, stats in ordered:
+            ratio = stats['stored_size'] / stats['original_size'] if stats['original_size'] else 1.0
+            lines.append(
+                f"{ext}: {stats['files']} arquivos ({stats['stored_files']} sem compressão), "
+                f"{stats['original_size']} -> {stats['stored_size']} bytes "
+                f"({ratio:.0%}), {stats['seconds']:.2f}s"
+            )
+        return lines
@@ -2,8 +2,12 @@
 Módulo de gerenciamento de configurações do ADF System Manager.
 """
 
+import atexit
+import copy
 import json
 import os
+import threading
+import time
 from pathlib import Path
 import logging
 from .constants import DEFAULT_CONFIG
@@ -11,75 +15,264 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
-class Config:
-    def __init__(self):
-        self.config_dir = os.path.join(os.path.expanduser('~'), '.adf')
-        self.config_file = os.path.join(self.config_dir, 'config.json')
-        self.config = self.load_config()
-    
-    def load_config(self):
-        """Carrega as configurações do arquivo"""
+# Espera após a última alteração antes de gravar o arquivo, em segundos
+FLUSH_DELAY = 0.5
+
+# Atraso máximo de gravação com alterações contínuas (ex.: spin box)
+MAX_FLUSH_DELAY = 5.0
+
+# Intervalo mínimo entre verificações de edição externa do arquivo
+RELOAD_CHECK_INTERVAL = 1.0
+
+_MISSING = object()
+
+
+def _merge_defaults(config):
+    """Completa a configuração com os valores padrão; retorna se algo mudou"""
+    updated = config.get('version') != DEFAULT_CONFIG['version']
+    # Garante que a versão está sempre atualizada
+    config['version'] = DEFAULT_CONFIG['version']
+    for key, value in DEFAULT_CONFIG.items():
+        if key not in config:
+            config[key] = copy.deepcopy(value)
+            updated = True
+        elif isinstance(value, dict) and isinstance(config[key], dict):
+            for subkey, subvalue in value.items():
+                if subkey not in config[key]:
+                    config[key][subkey] = copy.deepcopy(subvalue)
+                    updated = True
+    return updated
+
+
+def _split_key(key):
+    return key.split('.', 1) if '.' in key else (key, None)
+
+
+class ConfigStore:
+    """Configurações em memória, lidas do disco uma vez
+
+    As leituras não acessam o disco; as alterações são agrupadas e
+    gravadas por uma thread em segundo plano (arquivo temporário e
+    os.replace). Edições externas do arquivo são detectadas pela data de
+    modificação e recarregadas, mantendo as alterações ainda não gravadas.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        # Alterações ainda não gravadas, reaplicadas se o arquivo for recarregado
+        self.pending = {}
+        self.signature = None
+        self.last_check = 0.0
+        self._lock = threading.RLock()
+        self._condition = threading.Condition(self._lock)
+        self._deadline = None
+        self._dirty_since = None
+        self._thread = None
+        self.load()
+
+    def _file_signature(self):
         try:
-            if not os.path.exists(self.config_dir):
-                os.makedirs(self.config_dir)
-            
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # Garante que a versão está atualizada
-                    config['version'] = DEFAULT_CONFIG['version']
-                    # Atualiza com novas configurações padrão se necessário
-                    config = {**DEFAULT_CONFIG, **config}
-                    # Salva as alterações
-                    self.save_config(config)
-                    return config
-            
-            # Se não existe, cria com valores padrão
-            self.save_config(DEFAULT_CONFIG)
-            return DEFAULT_CONFIG.copy()
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar configurações: {e}")
-            return DEFAULT_CONFIG.copy()
-    
-    def save_config(self, config=None):
-        """Salva as configurações no arquivo"""
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def load(self):
+        """Lê o arquivo e completa com os valores padrão"""
+        with self._lock:
+            self.signature = self._file_signature()
+            self.last_check = time.monotonic()
+            config = None
+            if self.signature is not None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
+                    if not isinstance(config, dict):
+                        raise ValueError("o arquivo não contém um objeto JSON")
+                except (OSError, ValueError) as e:
+                    logger.error(f"Erro ao carregar configurações: {e}")
+                    config = None
+            if config is None:
+                config = copy.deepcopy(DEFAULT_CONFIG)
+                updated = self.signature is None
+            else:
+                updated = _merge_defaults(config)
+            for key, value in self.pending.items():
+                self._assign(config, key, value)
+            self.data = config
+            if updated or self.pending:
+                self._schedule_flush()
+
+    def check_reload(self):
+        """Recarrega o arquivo se ele foi alterado fora da aplicação"""
+        now = time.monotonic()
+        if now - self.last_check < RELOAD_CHECK_INTERVAL:
+            return
+        with self._lock:
+            self.last_check = now
+            signature = self._file_signature()
+            if signature != self.signature and signature is not None:
+                logger.info("Arquivo de configurações alterado externamente; recarregando")
+                self.load()
+
+    def get(self, key, default=None):
+        """Obtém um valor; chaves aninhadas usam ponto (ex.: 'backup.max_backups')"""
+        self.check_reload()
+        main_key, sub_key = _split_key(key)
+        value = self.data.get(main_key, _MISSING)
+        if sub_key is not None:
+            value = value.get(sub_key, _MISSING) if isinstance(value, dict) else _MISSING
+        if value is _MISSING:
+            return default
+        # Listas e dicionários são copiados para não alterar a configuração por engano
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def _assign(self, config, key, value):
+        main_key, sub_key = _split_key(key)
+        if sub_key is None:
+            config[main_key] = value
+        elif isinstance(config.get(main_key), dict):
+            config[main_key][sub_key] = value
+        else:
+            return False
+        return True
+
+    def set(self, key, value):
+        """Altera um valor; a gravação no disco é agrupada com as próximas"""
+        with self._lock:
+            value = copy.deepcopy(value)
+            if not self._assign(self.data, key, value):
+                return False
+            self.pending[key] = value
+            self._schedule_flush()
+            return True
+
+    def replace(self, config):
+        """Substitui todas as configurações"""
+        with self._lock:
+            self.data = copy.deepcopy(config)
+            _merge_defaults(self.data)
+            # O conteúdo inteiro passa a ser a alteração pendente
+            self.pending = {key: value for key, value in self.data.items()}
+            self._schedule_flush()
+
+    def snapshot(self):
+        """Cópia de todas as configurações"""
+        self.check_reload()
+        with self._lock:
+            return copy.deepcopy(self.data)
+
+    def _schedule_flush(self):
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        self._deadline = min(now + FLUSH_DELAY, self._dirty_since + MAX_FLUSH_DELAY)
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='adf-config-writer', daemon=True)
+            self._thread.start()
+        self._condition.notify()
+
+    def _run(self):
+        with self._condition:
+            while True:
+                while self._deadline is None:
+                    self._condition.wait()
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self._write()
+
+    def _write(self):
+        """Grava o arquivo; chamado com o lock"""
+        signature = self._file_signature()
+        if signature is not None and signature != self.signature:
+            # Editado fora da aplicação desde a leitura: recarrega e reaplica as alterações pendentes
+            self.load()
+        self._deadline = None
+        self._dirty_since = None
+        tmp_path = f"{self.path}.tmp"
         try:
-            if config is not None:
-                self.config = config
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4)
-                
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=4)
+            os.replace(tmp_path, self.path)
+            self.pending = {}
+            self.signature = self._file_signature()
             logger.info("Configurações salvas com sucesso")
             return True
-            
         except Exception as e:
             logger.error(f"Erro ao salvar configurações: {e}")
+            # Tenta de novo mais tarde (ex.: arquivo bloqueado por outro programa)
+            self._deadline = time.monotonic() + MAX_FLUSH_DELAY
             return False
-    
+
+    def flush(self):
+        """Grava imediatamente as alterações pendentes"""
+        with self._lock:
+            if self._deadline is None:
+                return True
+            return self._write()
+
+
+_config_store = None
+_config_store_lock = threading.Lock()
+
+
+def get_config_store():
+    """Retorna o armazenamento global de configurações"""
+    global _config_store
+    if _config_store is None:
+        with _config_store_lock:
+            if _config_store is None:
+                _config_store = ConfigStore(get_config_path())
+                atexit.register(_config_store.flush)
+    return _config_store
+
+
+class Config:
+    """Acesso às configurações no estilo dicionário, sobre o armazenamento global"""
+
+    def __init__(self):
+        self.store = get_config_store()
+        self.config_file = self.store.path
+        self.config_dir = os.path.dirname(self.config_file)
+
+    @property
+    def config(self):
+        return self.store.snapshot()
+
+    def load_config(self):
+        """Retorna as configurações"""
+        return self.store.snapshot()
+
+    def save_config(self, config=None):
+        """Grava as configurações (ou as substitui por config) no arquivo"""
+        if config is not None:
+            self.store.replace(config)
+        return self.store.flush()
+
     def get(self, key, default=None):
         """Obtém um valor da configuração"""
-        return self.config.get(key, default)
-    
+        return self.store.get(key, default)
+
     def set(self, key, value):
         """Define um valor na configuração"""
-        self.config[key] = value
-        self.save_config()
-    
+        self.store.set(key, value)
+
     def __getitem__(self, key):
-        return self.config[key]
-    
-    def __setitem__(self, key, value):
-        self.config[key] = value
-        self.save_config()
+        value = self.store.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
 
-# Instância global
-_config = Config()
+    def __setitem__(self, key, value):
+        self.store.set(key, value)
 
 def get_config():
-    """Retorna a instância global de Config"""
-    return _config
+    """Retorna uma instância de Config sobre o armazenamento global"""
+    return Config()
 
 def get_config_path():
     """Retorna o caminho do arquivo de configuração"""
@@ -93,77 +286,35 @@ def get_config_path():
     
     return os.path.join(config_dir, 'config.json')
 
+def get_cache_dir(name=None):
+    """Retorna o diretório de cache da aplicação (ou um subdiretório dele)"""
+    cache_dir = os.path.join(os.path.dirname(get_config_path()), 'cache')
+    if name:
+        cache_dir = os.path.join(cache_dir, name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
 def load_config():
-    """Carrega as configurações do arquivo"""
-    config_path = get_config_path()
-    
-    try:
-        # Se o arquivo existe, carrega as configurações
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                
-            # Garante que a versão está sempre atualizada
-            config['version'] = DEFAULT_CONFIG['version']
-                
-            # Atualiza com configurações padrão faltantes
-            updated = False
-            for key, value in DEFAULT_CONFIG.items():
-                if key not in config:
-                    config[key] = value
-                    updated = True
-                elif isinstance(value, dict):
-                    for subkey, subvalue in value.items():
-                        if subkey not in config[key]:
-                            config[key][subkey] = subvalue
-                            updated = True
-            
-            # Se houve atualização, salva o arquivo
-            if updated:
-                save_config(config)
-                
-            return config
-        
-        # Se não existe, cria com configurações padrão
-        else:
-            save_config(DEFAULT_CONFIG)
-            return DEFAULT_CONFIG.copy()
-            
-    except Exception as e:
-        logger.error(f"Erro ao carregar configurações: {e}")
-        return DEFAULT_CONFIG.copy()
+    """Retorna uma cópia das configurações (lidas do disco só na primeira vez)"""
+    return get_config_store().snapshot()
 
 def save_config(config):
-    """Salva as configurações no arquivo"""
+    """Substitui as configurações; a gravação no disco é feita em segundo plano"""
     try:
-        config_path = get_config_path()
-        
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4)
-            
+        get_config_store().replace(config)
         return True
-        
     except Exception as e:
         logger.error(f"Erro ao salvar configurações: {e}")
         return False
 
 def update_config(key, value):
-    """Atualiza uma configuração específica"""
+    """Atualiza uma configuração específica
+
+    O valor vale imediatamente para as leituras; alterações seguidas
+    (ex.: cada passo de um spin box) são gravadas juntas no disco.
+    """
     try:
-        config = load_config()
-        
-        # Atualiza o valor
-        if '.' in key:
-            # Para chaves aninhadas (ex: "monitoring.cpu_threshold")
-            main_key, sub_key = key.split('.')
-            if main_key in config and isinstance(config[main_key], dict):
-                config[main_key][sub_key] = value
-        else:
-            config[key] = value
-        
-        # Salva as alterações
-        return save_config(config)
-        
+        return get_config_store().set(key, value)
     except Exception as e:
         logger.error(f"Erro ao atualizar configuração: {e}")
         return False
@@ -171,18 +322,15 @@ def update_config(key, value):
 def get_config_value(key, default=None):
     """Obtém o valor de uma configuração específica"""
     try:
-        config = load_config()
-        
-        if '.' in key:
-            main_key, sub_key = key.split('.')
-            return config.get(main_key, {}).get(sub_key, default)
-        
-        return config.get(key, default)
-        
+        return get_config_store().get(key, default)
     except Exception as e:
         logger.error(f"Erro ao obter configuração: {e}")
         return default
 
+def flush_config():
+    """Grava imediatamente as alterações pendentes"""
+    return get_config_store().flush()
+
 def reset_config():
     """Reseta as configurações para o padrão"""
     return save_config(DEFAULT_CONFIG)
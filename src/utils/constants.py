@@ -1,5 +1,40 @@
 """Constantes e configurações padrão do aplicativo"""
 
+# Regras de limpeza padrão; %SYSTEM_TEMP% é o diretório temporário do Python
+# (só no Windows) e curingas no caminho (perfis de navegador) geram um alvo
+# por pasta encontrada. Arquivos com menos de um dia podem estar em uso.
+DEFAULT_CLEANUP_RULES = [
+    {"name": "system_temp", "path": "%SYSTEM_TEMP%", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "user_temp", "path": "%LOCALAPPDATA%\\Temp", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "inet_cache", "path": "%LOCALAPPDATA%\\Microsoft\\Windows\\INetCache", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "explorer_cache", "path": "%LOCALAPPDATA%\\Microsoft\\Windows\\Explorer", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "windows_temp", "path": "%WINDIR%\\Temp", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "chrome_cache", "path": "%LOCALAPPDATA%\\Google\\Chrome\\User Data\\*\\Cache", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "edge_cache", "path": "%LOCALAPPDATA%\\Microsoft\\Edge\\User Data\\*\\Cache", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True},
+    {"name": "firefox_cache", "path": "%LOCALAPPDATA%\\Mozilla\\Firefox\\Profiles\\*\\cache2", "patterns": ["*"],
+     "min_age_days": 1, "min_size": 0, "max_size": 0, "enabled": True}
+]
+
+# Regras do governador de processos
+# process e user aceitam curingas; min_cpu é o uso mínimo em % da máquina
+# priority: idle, below_normal, normal, above_normal, high
+# io_priority: very_low, low, normal; affinity: lista de CPUs
+DEFAULT_PROCESS_RULES = [
+    {"name": "chrome", "process": "chrome.exe", "user": "", "min_cpu": 0,
+     "priority": "below_normal", "io_priority": "", "affinity": []},
+    {"name": "firefox", "process": "firefox.exe", "user": "", "min_cpu": 0,
+     "priority": "below_normal", "io_priority": "", "affinity": []},
+    {"name": "explorer", "process": "explorer.exe", "user": "", "min_cpu": 0,
+     "priority": "below_normal", "io_priority": "", "affinity": []}
+]
+
 DEFAULT_CONFIG = {
     "version": "1.0.3",
     "theme": "light",
@@ -9,23 +44,73 @@ DEFAULT_CONFIG = {
         "cpu_threshold": 80,
         "memory_threshold": 80,
         "disk_threshold": 90,
-        "network_threshold": 80
+        "network_threshold": 80,
+        "disk_io_threshold": 100,  # MB/s lidos e gravados
+        "spike_cooldown": 60,  # segundos entre capturas do mesmo recurso
+        "spike_history": 50  # picos guardados
     },
     "backup": {
         "auto_backup": True,
         "backup_interval": 24,  # horas
         "backup_path": "",
-        "max_backups": 5
+        "sources": [],
+        "compress_backup": True,
+        "max_backups": 5,
+        "deduplicate": False,
+        "compression_algorithm": "deflate",
+        "compression_level": 6,
+        "retention_mode": "count",  # count ou gfs
+        "keep_daily": 7,
+        "keep_weekly": 4,
+        "keep_monthly": 12,
+        "verify_after_backup": False
     },
     "cleanup": {
         "auto_cleanup": False,
         "cleanup_interval": 168,  # 7 dias em horas
-        "min_free_space": 10  # GB
+        "min_free_space": 10,  # GB
+        "duplicates_path": "",
+        "duplicates_min_size": 1,  # MB
+        "report_count": 50,
+        "report_days": 180,
+        "rules": DEFAULT_CLEANUP_RULES,
+        "exclusions": [],
+        "quarantine": False,
+        "quarantine_days": 7,
+        "quarantine_interval": 24  # horas entre verificações de expiração
+    },
+    "process_governor": {
+        "enabled": False,
+        "interval": 5,  # segundos entre verificações de processos novos
+        "rules": DEFAULT_PROCESS_RULES
+    },
+    "optimize": {
+        # Etapas selecionadas na otimização do sistema
+        "steps": ["free_memory", "optimize_processes", "check_disk", "defrag", "clear_dns_cache"]
+    },
+    "scheduler": {
+        "check_interval": 60,  # segundos
+        "idle_cpu_threshold": 20,  # %
+        "idle_seconds": 300,  # sem entrada do usuário
+        "max_delay": 4  # horas de atraso antes de ignorar a ociosidade
+    },
+    "governor": {
+        "enabled": True,
+        "cpu_backoff_threshold": 60,  # % de CPU usada por outros processos
+        "disk_queue_backoff": 2.0,  # fila média de disco
+        "backoff_max_share": 0.5,  # parcela máxima do tempo em recuo
+        # Limites em MB/s por tipo de tarefa, 0 = sem limite
+        "backup": {"read_limit": 0, "write_limit": 0},
+        "restore": {"read_limit": 0, "write_limit": 0},
+        "verify": {"read_limit": 0, "write_limit": 0},
+        "cleanup": {"read_limit": 0, "write_limit": 0}
     },
     "logging": {
         "level": "INFO",
         "max_size": 10,  # MB
-        "backup_count": 3
+        "backup_count": 30,
+        "compression": "gzip",  # gzip, zstd ou none
+        "structured": False
     },
     "security": {
         "encrypt_backups": False,
@@ -0,0 +1,309 @@
+"""
+Índice de uso de disco do ADF System Manager.
+
+A árvore de diretórios fica em arrays compactos (pai, mtime, arquivos e bytes
+próprios); arquivos individuais não são guardados, então a memória cresce
+com o número de diretórios e não com o de arquivos. A árvore é gravada em
+disco e, na atualização, só os diretórios com mtime alterado são listados.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from .logger import get_logger
+from .config import get_cache_dir
+from .cleanup_engine import is_link
+from .governor import lower_thread_priority
+
+logger = get_logger(__name__)
+
+INDEX_MAGIC = b'ADFDISK1\n'
+
+# Níveis listados na thread principal antes de dividir a varredura em tarefas
+SPLIT_DEPTH = 2
+
+PROGRESS_INTERVAL = 0.2
+
+
+class DiskTree:
+    """Árvore de diretórios em arrays; o nó 0 é a raiz e pais vêm antes dos filhos"""
+
+    def __init__(self, root):
+        self.root = root
+        self.names = []
+        self.parent = array('i')
+        self.mtime = array('q')
+        self.own_files = array('q')
+        self.own_bytes = array('q')
+        self.total_files = array('q')
+        self.total_bytes = array('q')
+        self.scanned_at = 0.0
+        self._child_offsets = None
+        self._child_ids = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, parent, mtime, files, size):
+        """Acrescenta um diretório e retorna o seu índice"""
+        self.names.append(name)
+        self.parent.append(parent)
+        self.mtime.append(mtime)
+        self.own_files.append(files)
+        self.own_bytes.append(size)
+        return len(self.names) - 1
+
+    def finalize(self):
+        """Calcula os totais acumulados de cada diretório"""
+        self.total_files = array('q', self.own_files)
+        self.total_bytes = array('q', self.own_bytes)
+        # Filhos sempre têm índice maior que o pai
+        for node in range(len(self.names) - 1, 0, -1):
+            parent = self.parent[node]
+            self.total_files[parent] += self.total_files[node]
+            self.total_bytes[parent] += self.total_bytes[node]
+        self._child_offsets = None
+        self._child_ids = None
+
+    def _build_children(self):
+        """Monta a lista de filhos em formato CSR (offsets e índices)"""
+        count = len(self.names)
+        offsets = array('i', [0]) * (count + 1)
+        for node in range(1, count):
+            offsets[self.parent[node] + 1] += 1
+        for node in range(count):
+            offsets[node + 1] += offsets[node]
+
+        ids = array('i', [0]) * max(count - 1, 0)
+        position = array('i', offsets)
+        for node in range(1, count):
+            parent = self.parent[node]
+            ids[position[parent]] = node
+            position[parent] += 1
+
+        self._child_offsets = offsets
+        self._child_ids = ids
+
+    def children(self, node):
+        """Retorna os índices dos subdiretórios de um nó"""
+        if node < 0 or node >= len(self.names):
+            return []
+        if self._child_offsets is None:
+            self._build_children()
+        return self._child_ids[self._child_offsets[node]:self._child_offsets[node + 1]].tolist()
+
+    def largest_children(self, node, count=None):
+        """Retorna os subdiretórios de um nó do maior para o menor"""
+        children = self.children(node)
+        key = self.total_bytes.__getitem__
+        if count is None:
+            return sorted(children, key=key, reverse=True)
+        return heapq.nlargest(count, children, key=key)
+
+    def path(self, node):
+        """Retorna o caminho completo de um nó"""
+        parts = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = self.parent[node]
+        return os.path.join(self.root, *reversed(parts))
+
+    def save(self, path):
+        """Grava a árvore em formato binário compacto"""
+        names = '\0'.join(self.names).encode('utf-8', 'surrogatepass')
+        header = json.dumps({
+            'root': self.root,
+            'count': len(self.names),
+            'names_size': len(names),
+            'scanned_at': self.scanned_at
+        }).encode('utf-8')
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            f.write(header + b'\n')
+            for values in (self.parent, self.mtime, self.own_files, self.own_bytes):
+                values.tofile(f)
+            f.write(names)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Lê uma árvore gravada por save()"""
+        with open(path, 'rb') as f:
+            if f.readline() != INDEX_MAGIC:
+                raise ValueError("Formato de índice de disco desconhecido")
+            header = json.loads(f.readline().decode('utf-8'))
+            tree = cls(header['root'])
+            tree.scanned_at = header['scanned_at']
+            count = header['count']
+            for values in (tree.parent, tree.mtime, tree.own_files, tree.own_bytes):
+                values.fromfile(f, count)
+            names = f.read(header['names_size']).decode('utf-8', 'surrogatepass')
+            tree.names = names.split('\0') if count else []
+        tree.finalize()
+        return tree
+
+
+def get_index_path(root):
+    """Retorna o arquivo do índice de disco de uma raiz"""
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode('utf-8')).hexdigest()
+    return os.path.join(get_cache_dir('disk_index'), f"{key}.bin")
+
+
+def load_disk_tree(root):
+    """Carrega o índice salvo de uma raiz, ou None"""
+    path = get_index_path(root)
+    if not os.path.exists(path):
+        return None
+    try:
+        tree = DiskTree.load(path)
+        return tree if tree.root == root else None
+    except Exception as e:
+        logger.warning(f"Índice de disco inválido para {root}: {e}")
+        return None
+
+
+class DiskScanner:
+    """Varre um volume em paralelo reaproveitando o índice anterior
+
+    Diretórios com o mesmo mtime do índice não são listados de novo. Como o
+    mtime de uma pasta não muda quando um arquivo apenas cresce, full=True
+    força a listagem de todos os diretórios.
+    """
+
+    def __init__(self, root, previous=None, full=False, max_workers=None, progress_callback=None):
+        self.root = root
+        self.previous = None if full or previous is None or previous.root != root else previous
+        if self.previous is not None:
+            # Monta a lista de filhos antes de compartilhar a árvore entre threads
+            self.previous.children(0)
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) * 4)
+        self.progress_callback = progress_callback
+        self.cancelled = threading.Event()
+        self.stats = {'directories': 0, 'listed': 0, 'reused': 0, 'errors': 0}
+        self.device = None
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    def _count(self, path, listed):
+        with self._lock:
+            self.stats['directories'] += 1
+            self.stats['listed' if listed else 'reused'] += 1
+            now = time.monotonic()
+            report = now - self._last_report >= PROGRESS_INTERVAL
+            if report:
+                self._last_report = now
+                directories = self.stats['directories']
+        if report and self.progress_callback:
+            self.progress_callback(directories, path)
+
+    def scan_directory(self, path, old_node):
+        """Retorna (mtime, arquivos, bytes, [(subpasta, nó antigo)]) ou None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self.stats['errors'] += 1
+            return None
+        # Não atravessa outros volumes montados dentro da raiz
+        if st.st_dev != self.device:
+            return None
+
+        previous = self.previous
+        if previous is not None and old_node >= 0 and previous.mtime[old_node] == st.st_mtime_ns:
+            subdirs = [(previous.names[child], child) for child in previous.children(old_node)]
+            self._count(path, False)
+            return st.st_mtime_ns, previous.own_files[old_node], previous.own_bytes[old_node], subdirs
+
+        old_children = {}
+        if previous is not None and old_node >= 0:
+            old_children = {previous.names[child]: child for child in previous.children(old_node)}
+
+        files = 0
+        size = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False) and not is_link(entry):
+                            subdirs.append((entry.name, old_children.get(entry.name, -1)))
+                        else:
+                            files += 1
+                            size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            with self._lock:
+                self.stats['errors'] += 1
+            return None
+
+        self._count(path, True)
+        return st.st_mtime_ns, files, size, subdirs
+
+    def scan_subtree(self, path, name, old_node):
+        """Varre uma subárvore e retorna os registros em pré-ordem
+
+        Cada registro é (nome, pai local, mtime, arquivos, bytes); pai -1 é
+        o diretório que originou a tarefa.
+        """
+        records = []
+        pending = [(path, name, -1, old_node)]
+        while pending and not self.cancelled.is_set():
+            path, name, parent, old_node = pending.pop()
+            result = self.scan_directory(path, old_node)
+            if result is None:
+                continue
+            mtime, files, size, subdirs = result
+            local = len(records)
+            records.append((name, parent, mtime, files, size))
+            pending.extend((os.path.join(path, sub_name), sub_name, local, sub_old)
+                           for sub_name, sub_old in subdirs)
+        return records
+
+    def run(self):
+        """Executa a varredura e retorna a nova DiskTree"""
+        start = time.perf_counter()
+        tree = DiskTree(self.root)
+        self.device = os.stat(self.root).st_dev
+
+        # Primeiros níveis na thread atual para gerar tarefas independentes
+        frontier = [(self.root, self.root, -1, 0 if self.previous else -1)]
+        for _ in range(SPLIT_DEPTH):
+            next_frontier = []
+            for path, name, parent, old_node in frontier:
+                result = self.scan_directory(path, old_node)
+                if result is None:
+                    continue
+                mtime, files, size, subdirs = result
+                node = tree.add(name, parent, mtime, files, size)
+                next_frontier.extend((os.path.join(path, sub_name), sub_name, node, sub_old)
+                                     for sub_name, sub_old in subdirs)
+            frontier = next_frontier
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='adf-disk',
+                                initializer=lower_thread_priority) as executor:
+            futures = [
+                (parent, executor.submit(self.scan_subtree, path, name, old_node))
+                for path, name, parent, old_node in frontier
+            ]
+            for parent, future in futures:
+                base = len(tree)
+                for name, local_parent, mtime, files, size in future.result():
+                    tree.add(name, parent if local_parent < 0 else base + local_parent,
+                             mtime, files, size)
+
+        tree.finalize()
+        tree.scanned_at = time.time()
+        logger.info(
+            f"Varredura de {self.root}: {self.stats['directories']} diretórios "
+            f"({self.stats['listed']} listados, {self.stats['reused']} do índice), "
+            f"{tree.total_files[0] if len(tree) else 0} arquivos em {time.perf_counter() - start:.1f}s"
+        )
+        return tree
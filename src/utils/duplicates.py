@@ -0,0 +1,248 @@
+"""
+Localizador de arquivos duplicados do ADF System Manager.
+
+O processo tem três etapas, cada uma descartando o que já é único:
+tamanho, hash do início e do fim do arquivo e hash completo. Os registros
+da varredura são gravados em partições temporárias por tamanho, então a
+memória não depende da quantidade de arquivos.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from .logger import get_logger
+from .hashing import get_hash_service, hash_file
+from .cleanup_engine import is_link
+
+logger = get_logger(__name__)
+
+# Bytes lidos do início e do fim de cada arquivo na etapa parcial
+PARTIAL_SIZE = 64 * 1024
+
+# Quantidade de partições temporárias por tamanho
+PARTITIONS = 64
+
+
+def partial_hash(path, size):
+    """Hash do início e do fim do arquivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read(PARTIAL_SIZE))
+        if size > PARTIAL_SIZE:
+            f.seek(max(PARTIAL_SIZE, size - PARTIAL_SIZE))
+            digest.update(f.read(PARTIAL_SIZE))
+    return digest.hexdigest()
+
+
+class DuplicateFinder:
+    """Procura arquivos com conteúdo idêntico nas pastas informadas
+
+    progress_callback recebe (etapa, concluídos, total); total 0 indica
+    que ainda é desconhecido.
+    """
+
+    def __init__(self, roots, min_size=1, progress_callback=None, group_callback=None):
+        self.roots = roots
+        self.min_size = max(min_size, 1)
+        self.progress_callback = progress_callback
+        self.group_callback = group_callback
+        self.cancelled = threading.Event()
+        self.stats = {'files': 0, 'candidates': 0, 'partial_hashed': 0, 'full_hashed': 0,
+                      'groups': 0, 'wasted_bytes': 0, 'errors': 0}
+
+    def _report(self, stage, done, total=0):
+        if self.progress_callback:
+            self.progress_callback(stage, done, total)
+
+    def _scan(self, spill_dir):
+        """Percorre as pastas gravando (tamanho, mtime, caminho) nas partições"""
+        partitions = [
+            open(os.path.join(spill_dir, f"{i:02d}.txt"), 'w', encoding='utf-8', errors='surrogatepass')
+            for i in range(PARTITIONS)
+        ]
+        try:
+            pending = list(self.roots)
+            while pending and not self.cancelled.is_set():
+                path = pending.pop()
+                try:
+                    with os.scandir(path) as iterator:
+                        for entry in iterator:
+                            try:
+                                if is_link(entry):
+                                    continue
+                                if entry.is_dir(follow_symlinks=False):
+                                    pending.append(entry.path)
+                                    continue
+                                st = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                self.stats['errors'] += 1
+                                continue
+                            if st.st_size < self.min_size:
+                                continue
+                            partitions[st.st_size % PARTITIONS].write(
+                                f"{st.st_size}\t{st.st_mtime_ns}\t{entry.path}\n"
+                            )
+                            self.stats['files'] += 1
+                            if self.stats['files'] % 5000 == 0:
+                                self._report('scan', self.stats['files'])
+                except OSError:
+                    self.stats['errors'] += 1
+        finally:
+            for partition in partitions:
+                partition.close()
+        self._report('scan', self.stats['files'])
+
+    def _size_groups(self, partition_path):
+        """Lê uma partição e retorna os grupos de mesmo tamanho"""
+        by_size = {}
+        with open(partition_path, 'r', encoding='utf-8', errors='surrogatepass') as f:
+            for line in f:
+                size, mtime, path = line.rstrip('\n').split('\t', 2)
+                by_size.setdefault(int(size), []).append((path, int(mtime)))
+
+        groups = []
+        for size, files in by_size.items():
+            if len(files) < 2:
+                continue
+            # Hardlinks do mesmo arquivo não ocupam espaço extra
+            unique = {}
+            for path, mtime in files:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                unique.setdefault((st.st_dev, st.st_ino) if st.st_ino else path, (path, mtime))
+            if len(unique) > 1:
+                groups.append((size, list(unique.values())))
+        return groups
+
+    def _split_by_hash(self, files, stat_key, func, *args):
+        """Agrupa os arquivos pelo resultado de func(caminho, *args) no pool de hashing"""
+        service = get_hash_service()
+        futures = [(path, mtime, service.submit(func, path, *args)) for path, mtime in files]
+        by_hash = {}
+        for path, mtime, future in futures:
+            try:
+                by_hash.setdefault(future.result(), []).append((path, mtime))
+                self.stats[stat_key] += 1
+            except (OSError, ValueError) as e:
+                self.stats['errors'] += 1
+                logger.debug(f"Erro ao ler {path}: {e}")
+        return [group for group in by_hash.values() if len(group) > 1]
+
+    def _emit_group(self, size, files, groups):
+        group = {
+            'size': size,
+            'files': [{'path': path, 'mtime_ns': mtime} for path, mtime in sorted(files)],
+            'wasted': size * (len(files) - 1)
+        }
+        groups.append(group)
+        self.stats['groups'] += 1
+        self.stats['wasted_bytes'] += group['wasted']
+        if self.group_callback:
+            self.group_callback(group)
+
+    def run(self):
+        """Executa as três etapas e retorna os grupos, do maior desperdício ao menor"""
+        groups = []
+        spill_dir = tempfile.mkdtemp(prefix='adf_dup_')
+        try:
+            self._scan(spill_dir)
+
+            for index in range(PARTITIONS):
+                if self.cancelled.is_set():
+                    break
+                self._report('hash', index, PARTITIONS)
+                for size, files in self._size_groups(os.path.join(spill_dir, f"{index:02d}.txt")):
+                    if self.cancelled.is_set():
+                        break
+                    self.stats['candidates'] += len(files)
+
+                    for partial_group in self._split_by_hash(files, 'partial_hashed', partial_hash, size):
+                        # Arquivos pequenos já foram lidos por inteiro na etapa parcial
+                        if size <= 2 * PARTIAL_SIZE:
+                            self._emit_group(size, partial_group, groups)
+                            continue
+                        for full_group in self._split_by_hash(partial_group, 'full_hashed', hash_file):
+                            self._emit_group(size, full_group, groups)
+            self._report('hash', PARTITIONS, PARTITIONS)
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+        logger.info(
+            f"Duplicados: {self.stats['files']} arquivos, {self.stats['candidates']} candidatos, "
+            f"{self.stats['partial_hashed']} hashes parciais, {self.stats['full_hashed']} completos, "
+            f"{self.stats['groups']} grupos, {self.stats['wasted_bytes']} bytes duplicados"
+        )
+        groups.sort(key=lambda group: group['wasted'], reverse=True)
+        return groups
+
+
+def _unchanged(path, entry, size):
+    """Confere se o arquivo continua igual ao encontrado na busca"""
+    st = os.stat(path)
+    return st.st_size == size and st.st_mtime_ns == entry['mtime_ns']
+
+
+def _keep_changed(keep, size, duplicates, result):
+    """Se o arquivo mantido mudou desde a busca, o grupo inteiro é ignorado"""
+    try:
+        if _unchanged(keep['path'], keep, size):
+            return False
+        reason = "arquivo alterado desde a busca"
+    except OSError as e:
+        reason = e
+    logger.warning(f"Duplicados de {keep['path']} ignorados: {reason}")
+    result['errors'] += len(duplicates)
+    return True
+
+
+def replace_with_hardlinks(size, keep, duplicates):
+    """Substitui as cópias por hardlinks do arquivo mantido
+
+    Retorna {'replaced', 'freed', 'errors'}.
+    """
+    result = {'replaced': 0, 'freed': 0, 'errors': 0}
+    if _keep_changed(keep, size, duplicates, result):
+        return result
+    keep_stat = os.stat(keep['path'])
+    for entry in duplicates:
+        path = entry['path']
+        tmp_path = f"{path}.adf_link"
+        try:
+            if not _unchanged(path, entry, size):
+                raise ValueError("arquivo alterado desde a busca")
+            if os.stat(path).st_dev != keep_stat.st_dev:
+                raise ValueError("hardlink exige o mesmo volume")
+            os.link(keep['path'], tmp_path)
+            # Troca atômica: o caminho nunca fica sem arquivo
+            os.replace(tmp_path, path)
+            result['replaced'] += 1
+            result['freed'] += size
+        except (OSError, ValueError) as e:
+            logger.warning(f"Erro ao substituir {path} por hardlink: {e}")
+            result['errors'] += 1
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return result
+
+
+def delete_duplicates(size, keep, duplicates):
+    """Apaga as cópias informadas, mantendo keep; retorna {'deleted', 'freed', 'errors'}"""
+    result = {'deleted': 0, 'freed': 0, 'errors': 0}
+    # Sem o arquivo mantido intacto, apagar as cópias perderia o conteúdo
+    if _keep_changed(keep, size, duplicates, result):
+        return result
+    for entry in duplicates:
+        try:
+            if not _unchanged(entry['path'], entry, size):
+                raise ValueError("arquivo alterado desde a busca")
+            os.remove(entry['path'])
+            result['deleted'] += 1
+            result['freed'] += size
+        except (OSError, ValueError) as e:
+            logger.warning(f"Erro ao apagar {entry['path']}: {e}")
+            result['errors'] += 1
+    return result
@@ -0,0 +1,292 @@
+"""
+Cópia rápida de arquivos para os backups sem compressão do ADF System Manager.
+
+Cada arquivo é copiado pelo caminho mais barato disponível: clone (reflink)
+no mesmo sistema de arquivos, copy_file_range/sendfile no kernel ou, como
+último recurso, leitura em blocos grandes. Vários arquivos são copiados em
+paralelo e um diário permite retomar uma cópia interrompida.
+"""
+
+import errno
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .logger import get_logger
+from .governor import lower_thread_priority
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Diário de arquivos já copiados; sua presença indica um backup incompleto
+COPY_JOURNAL_NAME = '.adf_copy_journal'
+
+# Sufixo das cópias em andamento, renomeadas ao concluir
+PARTIAL_SUFFIX = '.adf_partial'
+
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+# ioctl FICLONE do Linux (btrfs, XFS com reflink, bcachefs...)
+FICLONE = 0x40049409
+
+# Erros que indicam que o método não é suportado entre os dois arquivos
+_UNSUPPORTED_ERRORS = {
+    errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP,
+    errno.ENOTTY, errno.EBADF, errno.EPERM
+}
+
+
+def _try_reflink(src_fd, dst_fd):
+    """Clona o arquivo sem copiar dados, se o sistema de arquivos permitir"""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRORS:
+            return False
+        raise
+
+
+def _copy_range(src_fd, dst_fd, size):
+    """Copia no kernel com copy_file_range"""
+    offset = 0
+    while offset < size:
+        copied = os.copy_file_range(src_fd, dst_fd, min(size - offset, 1 << 30))
+        if copied == 0:
+            break
+        offset += copied
+    return offset
+
+
+def _copy_sendfile(src_fd, dst_fd, size):
+    """Copia no kernel com sendfile"""
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, min(size - offset, 1 << 30))
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def _copy_buffered(src, dst, progress_callback=None):
+    """Copia em espaço de usuário reutilizando um buffer grande"""
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        read = src.readinto(buffer)
+        if not read:
+            break
+        dst.write(view[:read])
+        copied += read
+        if progress_callback:
+            progress_callback(read)
+    return copied
+
+
+def _rewind(src, dst):
+    """Descarta uma cópia parcial antes de tentar outro método"""
+    src.seek(0)
+    dst.seek(0)
+    dst.truncate()
+
+
+def copy_file(src_path, dst_path, progress_callback=None):
+    """Copia um arquivo com metadados e retorna o método usado"""
+    method = 'buffered'
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        copied = None
+
+        if size and _try_reflink(src_fd, dst_fd):
+            method, copied = 'reflink', size
+
+        if copied is None and size and hasattr(os, 'copy_file_range'):
+            try:
+                copied = _copy_range(src_fd, dst_fd, size)
+                method = 'copy_file_range'
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRORS:
+                    raise
+                copied = None
+                _rewind(src, dst)
+
+        if copied is None and size and hasattr(os, 'sendfile') and os.name != 'nt':
+            try:
+                copied = _copy_sendfile(src_fd, dst_fd, size)
+                method = 'sendfile'
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRORS:
+                    raise
+                copied = None
+                _rewind(src, dst)
+
+        if copied is None:
+            _copy_buffered(src, dst, progress_callback)
+        elif progress_callback:
+            progress_callback(copied)
+
+    shutil.copystat(src_path, dst_path)
+    return method
+
+
+class ParallelCopier:
+    """Copia árvores de diretórios com vários arquivos em paralelo"""
+
+    def __init__(self, sources, target, max_workers=None, progress_callback=None, governor=None):
+        self.sources = sources
+        self.target = target
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.progress_callback = progress_callback
+        self.governor = governor
+        self.journal_path = os.path.join(target, COPY_JOURNAL_NAME)
+        self.stats = {'files': 0, 'bytes': 0, 'skipped': 0, 'errors': 0, 'methods': {}}
+        self.total_bytes = 0
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._journal = None
+
+    def _load_journal(self):
+        """Retorna os arquivos concluídos em uma execução anterior"""
+        done = {}
+        if not os.path.exists(self.journal_path):
+            return done
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) == 3:
+                    done[parts[0]] = (int(parts[1]), int(parts[2]))
+        return done
+
+    def _remove_partials(self):
+        """Apaga as cópias incompletas deixadas por uma execução interrompida"""
+        for root, _, filenames in os.walk(self.target):
+            for filename in filenames:
+                if filename.endswith(PARTIAL_SUFFIX):
+                    try:
+                        os.remove(os.path.join(root, filename))
+                    except OSError as e:
+                        logger.warning(f"Erro ao apagar cópia incompleta {filename}: {e}")
+
+    def _plan(self):
+        """Cria as pastas de destino e lista os arquivos a copiar"""
+        files = []
+        directories = []
+        for source in self.sources:
+            base = os.path.dirname(os.path.abspath(source))
+            for root, dirs, filenames in os.walk(source):
+                rel_root = os.path.relpath(root, base)
+                os.makedirs(os.path.join(self.target, rel_root), exist_ok=True)
+                directories.append((root, os.path.join(self.target, rel_root)))
+                for filename in filenames:
+                    src_path = os.path.join(root, filename)
+                    try:
+                        st = os.stat(src_path)
+                    except OSError as e:
+                        logger.warning(f"Erro ao acessar {src_path}: {e}")
+                        self.stats['errors'] += 1
+                        continue
+                    rel_path = os.path.join(rel_root, filename)
+                    files.append((src_path, rel_path, st.st_size, st.st_mtime_ns))
+        return files, directories
+
+    def _advance(self, size, copied=True):
+        if copied and self.governor:
+            self.governor.transfer(read=size, written=size)
+        with self._lock:
+            self.stats['bytes'] += size
+            done = self.stats['bytes']
+        if self.progress_callback:
+            self.progress_callback(done, self.total_bytes)
+
+    def _copy_one(self, item):
+        src_path, rel_path, size, mtime_ns = item
+        if self.cancelled.is_set():
+            return
+        dst_path = os.path.join(self.target, rel_path)
+        tmp_path = dst_path + PARTIAL_SUFFIX
+        try:
+            method = copy_file(src_path, tmp_path, self._advance)
+            os.replace(tmp_path, dst_path)
+            with self._lock:
+                self.stats['files'] += 1
+                self.stats['methods'][method] = self.stats['methods'].get(method, 0) + 1
+                # Registro no diário só depois que o arquivo está completo
+                self._journal.write(f"{rel_path}\t{size}\t{mtime_ns}\n")
+                self._journal.flush()
+        except Exception as e:
+            logger.warning(f"Erro ao copiar {src_path}: {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def run(self):
+        """Executa a cópia e retorna as estatísticas
+
+        O diário só é removido quando todos os arquivos foram copiados.
+        """
+        os.makedirs(self.target, exist_ok=True)
+        done = self._load_journal()
+        if os.path.exists(self.journal_path):
+            self._remove_partials()
+        # Diário criado antes do planejamento: uma interrupção a partir daqui
+        # já deixa a cópia marcada como incompleta
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        try:
+            files, directories = self._plan()
+            self.total_bytes = sum(item[2] for item in files)
+
+            pending = []
+            for item in files:
+                src_path, rel_path, size, mtime_ns = item
+                if done.get(rel_path) == (size, mtime_ns) and os.path.exists(os.path.join(self.target, rel_path)):
+                    self.stats['skipped'] += 1
+                    self._advance(size, copied=False)
+                else:
+                    pending.append(item)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='adf-copy',
+                                    initializer=lower_thread_priority) as executor:
+                list(executor.map(self._copy_one, pending))
+        finally:
+            self._journal.close()
+
+        # Datas das pastas por último, pois a cópia dos arquivos as altera
+        for src_dir, dst_dir in reversed(directories):
+            try:
+                shutil.copystat(src_dir, dst_dir)
+            except OSError:
+                pass
+
+        if not self.stats['errors'] and not self.cancelled.is_set():
+            os.remove(self.journal_path)
+
+        logger.info(
+            f"Cópia para {self.target}: {self.stats['files']} copiados, {self.stats['skipped']} retomados, "
+            f"{self.stats['errors']} erros, métodos {self.stats['methods']}"
+        )
+        return self.stats
+
+
+def find_incomplete_copies(destination):
+    """Lista as pastas de backup com cópia interrompida no destino"""
+    incomplete = []
+    try:
+        for entry in os.scandir(destination):
+            if entry.is_dir() and entry.name.startswith('backup_') and \
+                    os.path.exists(os.path.join(entry.path, COPY_JOURNAL_NAME)):
+                incomplete.append(entry.path)
+    except OSError as e:
+        logger.warning(f"Erro ao procurar backups incompletos: {e}")
+    return sorted(incomplete)
@@ -0,0 +1,161 @@
+"""
+Relatório de maiores arquivos e arquivos sem uso do ADF System Manager.
+
+Cada diretório de primeiro nível é varrido em paralelo mantendo apenas os
+K maiores arquivos em um heap de tamanho fixo, então a memória não depende
+do tamanho do volume. Os líderes parciais são publicados durante a varredura.
+"""
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .logger import get_logger
+from .cleanup_engine import is_link
+from .governor import lower_thread_priority
+
+logger = get_logger(__name__)
+
+# Intervalo mínimo entre publicações dos líderes parciais
+PROGRESS_INTERVAL = 0.5
+
+
+def _push(heap, count, item):
+    """Mantém em heap (mínimo) apenas os count maiores itens"""
+    if len(heap) < count:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+class TopFilesScanner:
+    """Encontra os maiores arquivos e os maiores sem uso há N dias
+
+    Os itens são tuplas (bytes, último uso, caminho); o último uso é o maior
+    entre atime e mtime, pois o Windows pode não atualizar o atime.
+    leaders_callback recebe (maiores, sem uso) ordenados do maior ao menor.
+    """
+
+    def __init__(self, root, count=50, older_than_days=180, max_workers=None,
+                 progress_callback=None, leaders_callback=None):
+        self.root = root
+        self.count = max(count, 1)
+        self.cutoff = time.time() - older_than_days * 86400
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) * 4)
+        self.progress_callback = progress_callback
+        self.leaders_callback = leaders_callback
+        self.cancelled = threading.Event()
+        self.stats = {'files': 0, 'bytes': 0, 'errors': 0}
+        self.device = None
+        self.largest = []
+        self.old = []
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    def _merge(self, largest, old, files, size, errors, directory):
+        """Junta os heaps locais de uma tarefa aos globais e publica os líderes"""
+        with self._lock:
+            for item in largest:
+                _push(self.largest, self.count, item)
+            for item in old:
+                _push(self.old, self.count, item)
+            self.stats['files'] += files
+            self.stats['bytes'] += size
+            self.stats['errors'] += errors
+
+            now = time.monotonic()
+            report = now - self._last_report >= PROGRESS_INTERVAL
+            if report:
+                self._last_report = now
+                total_files = self.stats['files']
+                leaders = self.leaders()
+        if report:
+            if self.progress_callback:
+                self.progress_callback(total_files, directory)
+            if self.leaders_callback:
+                self.leaders_callback(*leaders)
+
+    def leaders(self):
+        """Retorna (maiores, sem uso) ordenados do maior ao menor"""
+        return sorted(self.largest, reverse=True), sorted(self.old, reverse=True)
+
+    def scan_tree(self, path, recursive=True):
+        """Varre uma árvore com heaps locais, publicando em intervalos"""
+        largest = []
+        old = []
+        files = size = errors = 0
+        last_merge = time.monotonic()
+        pending = [path]
+        while pending and not self.cancelled.is_set():
+            directory = pending.pop()
+            try:
+                # Não atravessa outros volumes montados dentro da raiz
+                if os.stat(directory).st_dev != self.device:
+                    continue
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        try:
+                            if is_link(entry):
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    pending.append(entry.path)
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            errors += 1
+                            continue
+                        files += 1
+                        size += st.st_size
+                        item = (st.st_size, max(st.st_atime, st.st_mtime), entry.path)
+                        _push(largest, self.count, item)
+                        if item[1] < self.cutoff:
+                            _push(old, self.count, item)
+            except OSError:
+                errors += 1
+                continue
+
+            now = time.monotonic()
+            if now - last_merge >= PROGRESS_INTERVAL:
+                last_merge = now
+                self._merge(largest, old, files, size, errors, directory)
+                largest = []
+                old = []
+                files = size = errors = 0
+
+        self._merge(largest, old, files, size, errors, path)
+
+    def _subdirectories(self):
+        """Lista os diretórios de primeiro nível da raiz"""
+        subdirs = []
+        with os.scandir(self.root) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir(follow_symlinks=False) and not is_link(entry):
+                        subdirs.append(entry.path)
+                except OSError:
+                    continue
+        return subdirs
+
+    def run(self):
+        """Executa a varredura e retorna {'largest', 'old', 'files', 'bytes', 'errors'}"""
+        start = time.perf_counter()
+        self.device = os.stat(self.root).st_dev
+
+        # Arquivos soltos da raiz na thread atual
+        self.scan_tree(self.root, recursive=False)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='adf-report',
+                                initializer=lower_thread_priority) as executor:
+            for future in [executor.submit(self.scan_tree, path) for path in self._subdirectories()]:
+                future.result()
+
+        largest, old = self.leaders()
+        if self.leaders_callback:
+            self.leaders_callback(largest, old)
+        logger.info(
+            f"Relatório de arquivos de {self.root}: {self.stats['files']} arquivos, "
+            f"{self.stats['bytes']} bytes em {time.perf_counter() - start:.1f}s"
+        )
+        return {'largest': largest, 'old': old, **self.stats}
@@ -0,0 +1,376 @@
+"""
+Controle de prioridade das tarefas em segundo plano do ADF System Manager.
+
+Além da prioridade de CPU e I/O, limita a taxa de leitura e gravação de
+cada tarefa e recua quando o primeiro plano está ocupado.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psutil
+from .logger import get_logger
+from .config import get_config_value
+
+logger = get_logger(__name__)
+
+# Constantes da API do Windows para SetThreadPriority
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+THREAD_MODE_BACKGROUND_END = 0x00020000
+
+# Valor de nice usado para as threads em segundo plano no Linux
+BACKGROUND_NICE = 19
+
+# Intervalo mínimo entre medições de carga
+LOAD_SAMPLE_INTERVAL = 1.0
+
+# Espera inicial e máxima de cada recuo, em segundos
+BACKOFF_STEP = 0.1
+BACKOFF_MAX_STEP = 2.0
+BACKOFF_MAX_WAIT = 10.0
+
+# Janela em que o recuo total fica limitado a uma parcela do tempo, em segundos
+BACKOFF_WINDOW = 60.0
+BACKOFF_MAX_SHARE = 0.5
+
+MB = 1024 * 1024
+
+
+def _lower_thread_windows():
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    # Modo background reduz a prioridade de CPU e de I/O da thread
+    return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN))
+
+
+def _restore_thread_windows():
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_END)
+
+
+def _lower_thread_posix():
+    """Reduz a prioridade da thread atual e retorna o estado anterior"""
+    tid = threading.get_native_id()
+    previous = {'nice': os.getpriority(os.PRIO_PROCESS, tid), 'ionice': None}
+    os.setpriority(os.PRIO_PROCESS, tid, BACKGROUND_NICE)
+
+    # No Linux cada thread é uma task com prioridade de I/O própria
+    if hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+        try:
+            task = psutil.Process(tid)
+            previous['ionice'] = task.ionice()
+            task.ionice(psutil.IOPRIO_CLASS_IDLE)
+        except Exception as e:
+            logger.debug(f"Não foi possível reduzir a prioridade de I/O: {e}")
+    return previous
+
+
+def _restore_thread_posix(previous):
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, previous['nice'])
+    except OSError:
+        # Sem privilégios para voltar ao nice anterior
+        pass
+    if previous.get('ionice') is not None:
+        try:
+            psutil.Process(tid).ionice(previous['ionice'].ioclass, previous['ionice'].value)
+        except Exception:
+            pass
+
+
+def lower_thread_priority():
+    """Reduz a prioridade de CPU e I/O da thread atual
+
+    Retorna o estado anterior para restore_thread_priority(), ou None se
+    não foi possível alterar a prioridade.
+    """
+    try:
+        if os.name == 'nt':
+            return {} if _lower_thread_windows() else None
+        return _lower_thread_posix()
+    except Exception as e:
+        logger.warning(f"Erro ao reduzir prioridade da thread: {e}")
+        return None
+
+
+def restore_thread_priority(previous):
+    """Restaura a prioridade salva por lower_thread_priority()"""
+    if previous is None:
+        return
+    try:
+        if os.name == 'nt':
+            _restore_thread_windows()
+        else:
+            _restore_thread_posix(previous)
+    except Exception as e:
+        logger.warning(f"Erro ao restaurar prioridade da thread: {e}")
+
+
+@contextmanager
+def background_priority():
+    """Executa o bloco com prioridade baixa de CPU e I/O na thread atual"""
+    previous = lower_thread_priority()
+    try:
+        yield
+    finally:
+        restore_thread_priority(previous)
+
+
+def get_user_idle_seconds():
+    """Retorna há quantos segundos não há entrada do usuário
+
+    Retorna None quando a plataforma não permite consultar.
+    """
+    if os.name != 'nt':
+        return None
+    try:
+        import ctypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # GetTickCount dá a volta a cada 49 dias, assim como dwTime
+        elapsed = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return elapsed / 1000.0
+    except Exception as e:
+        logger.debug(f"Não foi possível obter o tempo ocioso do usuário: {e}")
+        return None
+
+
+def is_system_idle(cpu_threshold=20, idle_seconds=300):
+    """Indica se a máquina está ociosa (CPU baixa e sem entrada do usuário)"""
+    # Sem intervalo: mede o uso desde a chamada anterior, sem bloquear
+    if psutil.cpu_percent(interval=None) > cpu_threshold:
+        return False
+    user_idle = get_user_idle_seconds()
+    return user_idle is None or user_idle >= idle_seconds
+
+
+def lower_process_priority(pid=None):
+    """Reduz a prioridade de CPU e I/O de um processo (o atual por padrão)"""
+    try:
+        process = psutil.Process(pid)
+        if os.name == 'nt':
+            process.nice(psutil.IDLE_PRIORITY_CLASS)
+            process.ionice(psutil.IOPRIO_VERYLOW)
+        else:
+            process.nice(BACKGROUND_NICE)
+            if hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+                process.ionice(psutil.IOPRIO_CLASS_IDLE)
+    except Exception as e:
+        logger.debug(f"Não foi possível reduzir a prioridade do processo {pid}: {e}")
+
+
+class TokenBucket:
+    """Limita uma taxa em bytes por segundo (0 = sem limite)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        # Rajada padrão de um segundo
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.timestamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        """Desconta amount bytes e espera o necessário; retorna a espera"""
+        if not self.rate or not amount:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+            # O saldo pode ficar negativo; cada chamada espera a sua parte da dívida
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class LoadMonitor:
+    """Mede a carga do primeiro plano: CPU e fila de disco de outros processos"""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.foreground_cpu = 0.0
+        self.disk_queue = 0.0
+        self._lock = threading.Lock()
+        self._last = None
+
+    def _snapshot(self):
+        times = psutil.cpu_times()
+        own = self.process.cpu_times()
+        disk = psutil.disk_io_counters()
+        try:
+            own_io = self.process.io_counters()
+            own_bytes = own_io.read_bytes + own_io.write_bytes
+        except (psutil.Error, AttributeError):
+            own_bytes = 0
+        return {
+            'time': time.monotonic(),
+            'cpu_total': sum(times),
+            'cpu_idle': times.idle + getattr(times, 'iowait', 0.0),
+            'cpu_own': own.user + own.system,
+            'disk_busy': (disk.read_time + disk.write_time) if disk else 0,
+            'disk_bytes': (disk.read_bytes + disk.write_bytes) if disk else 0,
+            'own_bytes': own_bytes
+        }
+
+    def sample(self):
+        """Retorna (CPU de primeiro plano em %, fila média de disco de primeiro plano)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._last and now - self._last['time'] < LOAD_SAMPLE_INTERVAL:
+                return self.foreground_cpu, self.disk_queue
+
+            current = self._snapshot()
+            if self._last:
+                total = current['cpu_total'] - self._last['cpu_total']
+                if total > 0:
+                    busy = total - (current['cpu_idle'] - self._last['cpu_idle'])
+                    own = current['cpu_own'] - self._last['cpu_own']
+                    self.foreground_cpu = max(0.0, (busy - own) * 100 / total)
+                # Tempo de I/O acumulado por tempo decorrido = tamanho médio da fila
+                elapsed_ms = (current['time'] - self._last['time']) * 1000
+                queue = (current['disk_busy'] - self._last['disk_busy']) / elapsed_ms
+                # O tempo de disco não é separado por processo: desconta a parcela
+                # dos bytes transferidos pelas próprias tarefas
+                disk_bytes = current['disk_bytes'] - self._last['disk_bytes']
+                own_bytes = current['own_bytes'] - self._last['own_bytes']
+                if disk_bytes > 0:
+                    queue *= 1 - min(max(own_bytes / disk_bytes, 0.0), 1.0)
+                self.disk_queue = queue
+            self._last = current
+            return self.foreground_cpu, self.disk_queue
+
+
+_load_monitor = None
+_load_monitor_lock = threading.Lock()
+
+
+def get_load_monitor():
+    """Retorna a instância global de LoadMonitor"""
+    global _load_monitor
+    with _load_monitor_lock:
+        if _load_monitor is None:
+            _load_monitor = LoadMonitor()
+        return _load_monitor
+
+
+class JobGovernor:
+    """Aplica prioridade baixa, limites de taxa e recuo a uma tarefa
+
+    Os limites vêm de governor.<job_type> (read_limit e write_limit em MB/s).
+    Use como gerenciador de contexto na thread principal da tarefa e chame
+    transfer() a cada bloco lido ou gravado, de qualquer thread.
+    """
+
+    def __init__(self, job_type):
+        self.job_type = job_type
+        limits = get_config_value(f'governor.{job_type}', {}) or {}
+        self.enabled = get_config_value('governor.enabled', True)
+        self.cpu_threshold = get_config_value('governor.cpu_backoff_threshold', 60)
+        self.queue_threshold = get_config_value('governor.disk_queue_backoff', 2.0)
+        self.backoff_share = get_config_value('governor.backoff_max_share', BACKOFF_MAX_SHARE)
+        self.read_bucket = TokenBucket(limits.get('read_limit', 0) * MB)
+        self.write_bucket = TokenBucket(limits.get('write_limit', 0) * MB)
+        self.stats = {
+            'read_bytes': 0,
+            'write_bytes': 0,
+            'seconds': 0.0,
+            'throttled_seconds': 0.0,
+            'backoff_seconds': 0.0
+        }
+        self._lock = threading.Lock()
+        self._previous = None
+        self._start = None
+        # Início e recuo acumulado da janela atual
+        self._window_start = time.monotonic()
+        self._window_backoff = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.finish()
+        return False
+
+    def start(self):
+        self._start = time.perf_counter()
+        if self.enabled:
+            self._previous = lower_thread_priority()
+
+    def finish(self):
+        """Restaura a prioridade e registra a vazão obtida"""
+        if self.enabled:
+            restore_thread_priority(self._previous)
+        return self.report()
+
+    def transfer(self, read=0, written=0):
+        """Contabiliza bytes lidos e gravados aplicando limites e recuo"""
+        with self._lock:
+            self.stats['read_bytes'] += read
+            self.stats['write_bytes'] += written
+        if not self.enabled:
+            return
+
+        throttled = self.read_bucket.consume(read) + self.write_bucket.consume(written)
+        backoff = self.backoff()
+        if throttled or backoff:
+            with self._lock:
+                self.stats['throttled_seconds'] += throttled
+                self.stats['backoff_seconds'] += backoff
+
+    def _reserve_backoff(self, seconds):
+        """Desconta a espera do limite da janela; retorna quanto pode esperar"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= BACKOFF_WINDOW:
+                self._window_start = now
+                self._window_backoff = 0.0
+            allowed = min(seconds, BACKOFF_WINDOW * self.backoff_share - self._window_backoff)
+            if allowed <= 0:
+                return 0.0
+            self._window_backoff += allowed
+            return allowed
+
+    def backoff(self):
+        """Espera enquanto o primeiro plano estiver ocupado; retorna a espera"""
+        waited = 0.0
+        step = BACKOFF_STEP
+        monitor = get_load_monitor()
+        # Espera limitada por chamada e por janela, para que a tarefa sempre avance
+        while waited < BACKOFF_MAX_WAIT:
+            cpu, queue = monitor.sample()
+            if cpu < self.cpu_threshold and queue < self.queue_threshold:
+                break
+            pause = self._reserve_backoff(step)
+            if not pause:
+                break
+            time.sleep(pause)
+            waited += pause
+            step = min(step * 2, BACKOFF_MAX_STEP)
+        return waited
+
+    def report(self):
+        """Retorna as estatísticas com as taxas médias em bytes por segundo"""
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        stats = dict(self.stats, seconds=elapsed)
+        stats['read_rate'] = stats['read_bytes'] / elapsed if elapsed else 0.0
+        stats['write_rate'] = stats['write_bytes'] / elapsed if elapsed else 0.0
+        logger.info(
+            f"Tarefa {self.job_type}: {stats['read_bytes'] / MB:.1f} MB lidos "
+            f"({stats['read_rate'] / MB:.1f} MB/s), {stats['write_bytes'] / MB:.1f} MB gravados "
+            f"({stats['write_rate'] / MB:.1f} MB/s) em {elapsed:.1f}s, "
+            f"{stats['throttled_seconds']:.1f}s limitada, {stats['backoff_seconds']:.1f}s em recuo"
+        )
+        return stats
@@ -0,0 +1,106 @@
+"""
+Serviço de hashing compartilhado do ADF System Manager.
+
+O hashlib libera o GIL para blocos grandes, então um pool de threads
+consegue calcular vários hashes em paralelo. Arquivos grandes são lidos
+via mmap para evitar cópias entre kernel e espaço do usuário.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .logger import get_logger
+from .governor import lower_thread_priority
+
+logger = get_logger(__name__)
+
+HASH_ALGORITHM = 'sha256'
+
+# Tamanho dos blocos entregues ao hashlib
+HASH_BUFFER_SIZE = 4 * 1024 * 1024
+
+# A partir deste tamanho o arquivo é mapeado em memória
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def hash_file(path, algorithm=HASH_ALGORITHM, progress_callback=None):
+    """Calcula o hash de um arquivo
+
+    progress_callback recebe a quantidade de bytes lidos a cada bloco.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, HASH_BUFFER_SIZE):
+                        block = view[offset:offset + HASH_BUFFER_SIZE]
+                        digest.update(block)
+                        if progress_callback:
+                            progress_callback(len(block))
+                        block.release()
+                finally:
+                    view.release()
+        else:
+            hash_stream(f, digest, progress_callback)
+
+    return digest.hexdigest()
+
+
+def hash_stream(stream, digest=None, progress_callback=None):
+    """Atualiza digest com o conteúdo de um objeto de arquivo"""
+    if digest is None:
+        digest = hashlib.new(HASH_ALGORITHM)
+    while True:
+        block = stream.read(HASH_BUFFER_SIZE)
+        if not block:
+            break
+        digest.update(block)
+        if progress_callback:
+            progress_callback(len(block))
+    return digest
+
+
+class HashService:
+    """Pool de threads para cálculo de hashes em segundo plano"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        # Threads do serviço rodam sempre com prioridade baixa
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='adf-hash',
+            initializer=lower_thread_priority
+        )
+
+    def submit(self, func, *args, **kwargs):
+        """Executa uma função qualquer no pool do serviço"""
+        return self.executor.submit(func, *args, **kwargs)
+
+    def hash_file(self, path, algorithm=HASH_ALGORITHM, progress_callback=None):
+        """Agenda o hash de um arquivo e retorna um Future"""
+        return self.executor.submit(hash_file, path, algorithm, progress_callback)
+
+    def map(self, func, iterable):
+        return self.executor.map(func, iterable)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+_hash_service = None
+_hash_service_lock = threading.Lock()
+
+
+def get_hash_service():
+    """Retorna a instância global de HashService"""
+    global _hash_service
+    with _hash_service_lock:
+        if _hash_service is None:
+            _hash_service = HashService()
+        return _hash_service
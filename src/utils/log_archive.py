@@ -0,0 +1,183 @@
+"""
+Compressão dos logs rotacionados do ADF System Manager.
+
+Depois de cada rotação o segmento antigo é comprimido (gzip, ou zstd se
+o pacote zstandard estiver instalado) por uma thread em segundo plano,
+sem atrasar a gravação do log. A leitura abre segmentos comprimidos e o
+arquivo atual da mesma forma, e a busca percorre todos em sequência sem
+descomprimir nada no disco.
+"""
+
+import gzip
+import io
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from .logger import get_log_path
+
+# Logger padrão em vez de get_logger: este módulo é importado durante a
+# criação dos handlers, antes de o sistema de log estar pronto
+logger = logging.getLogger(__name__)
+
+# Extensão de cada método de compressão
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Bloco copiado de cada vez na compressão
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def compression_method(method):
+    """Método efetivo: zstd sem o pacote instalado passa para gzip"""
+    if method == 'zstd' and zstandard is None:
+        return 'gzip'
+    return method if method in COMPRESSED_SUFFIXES else None
+
+
+def compress_segment(path, method):
+    """Comprime um segmento rotacionado e remove o original"""
+    target = path + COMPRESSED_SUFFIXES[method]
+    tmp_path = target + '.tmp'
+    with open(path, 'rb') as source:
+        if method == 'zstd':
+            with open(tmp_path, 'wb') as raw:
+                zstandard.ZstdCompressor(level=10).copy_stream(source, raw)
+        else:
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as target_file:
+                shutil.copyfileobj(source, target_file, COPY_BUFFER_SIZE)
+    os.replace(tmp_path, target)
+    os.remove(path)
+    return target
+
+
+def open_segment(path, mode='rb', encoding='utf-8', errors='replace'):
+    """Abre um segmento do log, comprimido ou não, só para leitura"""
+    if path.endswith('.gz'):
+        stream = gzip.open(path, 'rb')
+    elif path.endswith('.zst'):
+        if zstandard is None:
+            raise OSError(f"Pacote zstandard necessário para ler {path}")
+        stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    else:
+        stream = open(path, 'rb')
+    if mode == 'rb':
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, errors=errors)
+
+
+class LogCompressor:
+    """Thread única que comprime os segmentos rotacionados"""
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        # Mantido durante cada compressão; a rotação o usa para não mover
+        # um segmento que ainda está sendo comprimido
+        self.lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, path, method):
+        """Agenda a compressão de todos os segmentos rotacionados do log"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='adf-log-compressor', daemon=True)
+            self._thread.start()
+        self.pending.put((path, method))
+
+    def _run(self):
+        while True:
+            path, method = self.pending.get()
+            try:
+                self.compress_pending(path, method)
+            except Exception as e:
+                logger.error(f"Erro ao comprimir logs de {path}: {e}")
+            finally:
+                self.pending.task_done()
+
+    def compress_pending(self, path, method):
+        """Comprime os segmentos rotacionados que ainda não estão comprimidos
+
+        Percorre todos, e não só o último, para cobrir rotações seguidas e
+        segmentos deixados por versões anteriores.
+        """
+        for segment in segment_files(path):
+            if segment == path or segment.endswith(tuple(COMPRESSED_SUFFIXES.values())):
+                continue
+            with self.lock:
+                if os.path.exists(segment):
+                    compress_segment(segment, method)
+
+    def wait(self):
+        """Aguarda as compressões pendentes"""
+        if self._thread is not None and self._thread.is_alive():
+            self.pending.join()
+
+
+_compressor = None
+
+
+def get_log_compressor():
+    """Retorna o compressor global"""
+    global _compressor
+    if _compressor is None:
+        _compressor = LogCompressor()
+    return _compressor
+
+
+def segment_files(path):
+    """Segmentos do log, do mais antigo ao atual, comprimidos ou não"""
+    directory, name = os.path.split(path)
+    pattern = re.compile(re.escape(name) + r'\.(\d+)(\.gz|\.zst)?$')
+    segments = {}
+    try:
+        for entry in os.listdir(directory):
+            match = pattern.match(entry)
+            if match:
+                number = int(match.group(1))
+                # Durante a compressão os dois existem; o original vale até ser removido
+                if number not in segments or not match.group(2):
+                    segments[number] = os.path.join(directory, entry)
+    except OSError:
+        return []
+    files = [segments[number] for number in sorted(segments, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def open_current_segment(path, mode='rb'):
+    """Abre um segmento listado; se acabou de ser comprimido, abre a versão comprimida"""
+    try:
+        return open_segment(path, mode)
+    except FileNotFoundError:
+        for suffix in COMPRESSED_SUFFIXES.values():
+            if os.path.exists(path + suffix):
+                return open_segment(path + suffix, mode)
+        raise
+
+
+def iter_lines(path):
+    """Linhas de todos os segmentos do log, em ordem"""
+    for file in segment_files(path):
+        try:
+            with open_current_segment(file, 'rt') as f:
+                yield from f
+        except OSError:
+            continue
+
+
+def search_logs(text, path=None, ignore_case=True):
+    """Linhas do log atual e dos rotacionados que contêm o texto (ou casam a regex)"""
+    if path is None:
+        path = get_log_path()
+    if isinstance(text, str):
+        text = re.compile(re.escape(text), re.IGNORECASE if ignore_case else 0)
+    for line in iter_lines(path):
+        if text.search(line):
+            yield line
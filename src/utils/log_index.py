@@ -0,0 +1,198 @@
+"""
+Log estruturado (JSONL) com índice de tempo do ADF System Manager.
+
+Cada registro é gravado como uma linha JSON. A cada LOG_INDEX_INTERVAL
+registros, um arquivo auxiliar (.idx) recebe o horário e a posição em
+bytes do registro, e acompanha o log na rotação. As posições são do
+conteúdo descomprimido, então valem também para segmentos comprimidos.
+Uma consulta por período faz busca binária no índice e lê só o trecho
+correspondente de cada arquivo.
+"""
+
+import bisect
+import json
+import logging
+import os
+import time
+from .logger import BatchRotatingFileHandler, get_log_path
+from .log_archive import COMPRESSED_SUFFIXES, segment_files, open_current_segment
+
+# Registros entre duas entradas do índice
+LOG_INDEX_INTERVAL = 1000
+
+INDEX_SUFFIX = '.idx'
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def get_jsonl_path():
+    """Retorna o caminho do log estruturado, ao lado do log de texto"""
+    return os.path.splitext(get_log_path())[0] + '.jsonl'
+
+
+def index_path(path):
+    """Índice de um segmento; o mesmo antes e depois da compressão"""
+    for suffix in COMPRESSED_SUFFIXES.values():
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+            break
+    return path + INDEX_SUFFIX
+
+
+class JsonlFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class IndexedJsonlHandler(BatchRotatingFileHandler):
+    """Grava o log JSONL e o índice de horário -> posição em bytes"""
+
+    companions = (INDEX_SUFFIX,)
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, interval=LOG_INDEX_INTERVAL, compression=None):
+        super().__init__(
+            filename, maxBytes=maxBytes, backupCount=backupCount, encoding='utf-8', compression=compression
+        )
+        self.setFormatter(JsonlFormatter())
+        self.interval = interval
+        self.index_stream = None
+        # Registros desde o início do arquivo; o primeiro sempre entra no índice
+        self.count = 0
+        # Maior horário já gravado: mantém o índice crescente mesmo com
+        # registros de threads diferentes chegando fora de ordem
+        self.latest = 0.0
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.latest = max(self.latest, record.created)
+            if self.count % self.interval == 0:
+                self.write_index(self.latest, self.stream.tell())
+            self.count += 1
+            logging.FileHandler.emit(self, record)
+        except Exception:
+            self.handleError(record)
+
+    def write_index(self, timestamp, offset):
+        if self.index_stream is None:
+            self.index_stream = open(index_path(self.baseFilename), 'a', encoding='utf-8')
+        self.index_stream.write(f"{timestamp:.3f} {offset}\n")
+
+    def sync(self):
+        super().sync()
+        if self.index_stream is not None:
+            self.index_stream.flush()
+
+    def close_index(self):
+        if self.index_stream is not None:
+            self.index_stream.close()
+            self.index_stream = None
+
+    def doRollover(self):
+        """Roda o log e o índice juntos"""
+        self.close_index()
+        super().doRollover()
+        self.count = 0
+
+    def close(self):
+        self.acquire()
+        try:
+            self.close_index()
+        finally:
+            self.release()
+        super().close()
+
+
+def read_index(path):
+    """Retorna ([horários], [posições]) do índice de um arquivo de log"""
+    times, offsets = [], []
+    try:
+        with open(index_path(path), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    timestamp, offset = line.split()
+                    timestamp, offset = float(timestamp), int(offset)
+                except ValueError:
+                    continue
+                # Garante a ordem para a busca binária (ex.: relógio ajustado)
+                times.append(max(timestamp, times[-1]) if times else timestamp)
+                offsets.append(offset)
+    except OSError:
+        pass
+    return times, offsets
+
+
+def byte_range(times, offsets, start=None, end=None):
+    """Trecho (início, fim) do arquivo que contém o período; fim None = até o final"""
+    begin = 0
+    if start is not None:
+        # Última entrada cujos registros anteriores são todos antes do início
+        i = bisect.bisect_left(times, start) - 1
+        if i >= 0:
+            begin = offsets[i]
+    stop = None
+    if end is not None:
+        j = bisect.bisect_right(times, end)
+        if j < len(offsets):
+            stop = offsets[j]
+    return begin, stop
+
+
+def iter_file(path, start=None, end=None, level=None):
+    """Registros de um arquivo JSONL no período e nível pedidos"""
+    begin, stop = byte_range(*read_index(path), start, end)
+    if stop is not None and stop <= begin:
+        return
+    with open_current_segment(path) as f:
+        f.seek(begin)
+        position = begin
+        while stop is None or position < stop:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Linha incompleta (gravação interrompida)
+                continue
+            timestamp = entry.get('ts', 0)
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                continue
+            if level and entry.get('level') != level:
+                continue
+            yield entry
+
+
+def query_logs(start=None, end=None, level=None, path=None):
+    """Registros de todos os arquivos do log estruturado, em ordem
+
+    start e end são timestamps (segundos desde a época); level é o nome
+    exato do nível (ex.: 'ERROR').
+    """
+    for file in segment_files(path or get_jsonl_path()):
+        yield from iter_file(file, start, end, level)
+
+
+def format_entry(entry):
+    """Linha no mesmo formato do log de texto"""
+    timestamp = time.strftime(TIME_FORMAT, time.localtime(entry.get('ts', 0)))
+    line = f"{timestamp} - {entry.get('logger')} - {entry.get('level')} - {entry.get('message')}\n"
+    if entry.get('exception'):
+        line += entry['exception'] + '\n'
+    return line
@@ -0,0 +1,179 @@
+"""
+Leitura incremental do log do ADF System Manager.
+
+O arquivo atual é lido a partir da última posição conhecida, só com os
+bytes acrescentados desde a leitura anterior; uma linha incompleta fica
+guardada até a próxima. Se o arquivo for rotacionado, a leitura recomeça
+do início do novo arquivo. O histórico vem dos segmentos rotacionados
+(comprimidos ou não) e, no log estruturado, do índice de tempo.
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+from .logger import get_log_path
+from .log_archive import segment_files, open_current_segment
+from .log_index import TIME_FORMAT, get_jsonl_path, read_index, byte_range, iter_file
+
+# Bytes lidos de cada vez; um atraso grande é lido em vários blocos
+LOG_TAIL_CHUNK = 4 * 1024 * 1024
+
+# Níveis de log e seus valores numéricos
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+
+# Campos de cada entrada exibida
+SEQ, TIME, LEVEL, MODULE, MESSAGE = range(5)
+
+TEXT_LINE = re.compile(
+    r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (.*?) - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (.*)$'
+)
+
+
+def viewer_log_path(structured):
+    """Arquivo lido pelo visualizador: o JSONL, se ativado e existente, ou o de texto"""
+    if structured and os.path.exists(get_jsonl_path()):
+        return get_jsonl_path(), True
+    return get_log_path(), False
+
+
+class LogParser:
+    """Converte linhas do log em entradas (seq, hora, nível, módulo, mensagem)"""
+
+    def __init__(self, structured, seq=0):
+        self.structured = structured
+        self.seq = seq
+        # Última entrada: linhas de continuação (ex.: tracebacks) herdam seus campos
+        self.last = ('', '', '')
+
+    def parse(self, line):
+        if self.structured:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                return None
+            return self.from_record(record)
+        self.seq += 1
+        line = line.rstrip('\r\n')
+        match = TEXT_LINE.match(line)
+        if match is None:
+            return (self.seq, *self.last, line)
+        time_text, module, level, message = match.groups()
+        self.last = (time_text, level, module)
+        return (self.seq, time_text, level, module, message)
+
+    def from_record(self, record):
+        time_text = time.strftime(TIME_FORMAT, time.localtime(record.get('ts', 0)))
+        message = record.get('message', '')
+        if record.get('exception'):
+            message = f"{message}\n{record['exception']}"
+        self.seq += 1
+        return (self.seq, time_text, record.get('level', ''), record.get('logger', ''), message)
+
+
+class LogTail:
+    """Lê só os bytes acrescentados ao arquivo desde a última leitura"""
+
+    def __init__(self, path, parser, start=None):
+        self.path = path
+        self.parser = parser
+        # Entradas anteriores a este horário são descartadas
+        self.start_text = time.strftime(TIME_FORMAT, time.localtime(start)) if start else None
+        self.offset = 0
+        self.identity = None
+        self.partial = b''
+
+    def seek(self, offset):
+        """Continua a leitura a partir de offset no arquivo atual"""
+        try:
+            stat = os.stat(self.path)
+            self.identity = (stat.st_dev, stat.st_ino)
+        except OSError:
+            self.identity = None
+        self.offset = offset
+        self.partial = b''
+
+    def read(self):
+        """Retorna as entradas novas; até LOG_TAIL_CHUNK bytes por chamada"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self.identity or stat.st_size < self.offset:
+            # Arquivo rotacionado ou truncado: recomeça do início
+            self.identity = identity
+            self.offset = 0
+            self.partial = b''
+        if stat.st_size == self.offset:
+            return []
+        # Abre e fecha a cada leitura para não impedir a rotação no Windows
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(stat.st_size - self.offset, LOG_TAIL_CHUNK))
+        self.offset += len(data)
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        entries = []
+        for line in lines:
+            entry = self.parser.parse(line.decode('utf-8', errors='replace'))
+            if entry is not None and (not self.start_text or entry[TIME] >= self.start_text):
+                entries.append(entry)
+        return entries
+
+    def pending(self):
+        """Indica se ainda há bytes não lidos no arquivo"""
+        try:
+            return os.path.getsize(self.path) > self.offset
+        except OSError:
+            return False
+
+
+def load_history(path, parser, start=None, limit=None, cancelled=lambda: False):
+    """Entradas dos segmentos rotacionados desde start (timestamp)
+
+    Retorna a lista (no máximo as últimas limit) e a posição no arquivo
+    atual a partir da qual a leitura incremental deve continuar. No log
+    estruturado, o índice de tempo limita a leitura ao período; no de
+    texto, segmentos gravados pela última vez antes de start são ignorados.
+    """
+    start_text = time.strftime(TIME_FORMAT, time.localtime(start)) if start else None
+    entries = deque(maxlen=limit)
+    for segment in segment_files(path):
+        if cancelled():
+            return list(entries), 0
+        if segment == path:
+            break
+        try:
+            if parser.structured:
+                entries.extend(parser.from_record(record) for record in iter_file(segment, start))
+                continue
+            if start and os.path.getmtime(segment) < start:
+                continue
+            with open_current_segment(segment, 'rt') as f:
+                for line in f:
+                    entry = parser.parse(line)
+                    if not start_text or entry[TIME] >= start_text:
+                        entries.append(entry)
+        except OSError:
+            continue
+
+    offset = 0
+    if parser.structured and start:
+        offset = byte_range(*read_index(path), start)[0]
+    return list(entries), offset
+
+
+def matches(entry, level=0, text=''):
+    """Indica se a entrada passa pelos filtros de nível mínimo e texto (minúsculo)"""
+    if level and LEVELS.get(entry[LEVEL], 0) < level:
+        return False
+    return not text or text in entry[MODULE].lower() or text in entry[MESSAGE].lower()
+
+
+def filter_entries(entries, level=0, text=''):
+    """Entradas que passam pelos filtros, na mesma ordem"""
+    if not level and not text:
+        return list(entries)
+    return [entry for entry in entries if matches(entry, level, text)]
@@ -2,14 +2,27 @@
 Módulo de logging do ADF System Manager.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import re
+import threading
 from pathlib import Path
 from datetime import datetime
 from .constants import LOG_MAX_BYTES, LOG_BACKUP_COUNT
 from logging.handlers import RotatingFileHandler
 
+# Registros aguardando gravação; acima disso são descartados e contados
+LOG_QUEUE_SIZE = 10000
+
+# Registros gravados de uma vez pela thread de log
+LOG_BATCH_SIZE = 500
+
+# Início de uma linha do log de texto (data e hora)
+LOG_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
 def get_log_path():
     """Retorna o caminho do arquivo de log"""
     if os.name == 'nt':  # Windows
@@ -22,99 +35,297 @@ def get_log_path():
     
     return os.path.join(log_dir, 'adf-system-manager.log')
 
-def setup_logging(debug=False):
-    """Configura o sistema de logging"""
-    # Define o nível de log
-    level = logging.DEBUG if debug else logging.INFO
-    
-    # Configura o formato do log
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler que só grava no disco quando o lote termina
+
+    Com compression ('gzip' ou 'zstd'), os segmentos rotacionados são
+    comprimidos em segundo plano.
+    """
+
+    # Sufixos de arquivos auxiliares que acompanham o segmento na rotação
+    companions = ()
+
+    def __init__(self, *args, compression=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compression = compression
+
+    def flush(self):
+        # Chamado pelo emit a cada registro; a gravação fica para sync()
+        pass
+
+    def sync(self):
+        """Grava no disco os registros do lote"""
+        super().flush()
+
+    def doRollover(self):
+        """Roda os segmentos, comprimidos ou não, e agenda a compressão do novo"""
+        from .log_archive import COMPRESSED_SUFFIXES, get_log_compressor
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if self.backupCount > 0:
+            compressor = get_log_compressor()
+            base = self.baseFilename
+            suffixes = ('', *COMPRESSED_SUFFIXES.values(), *self.companions)
+            with compressor.lock:
+                for i in range(self.backupCount - 1, 0, -1):
+                    _replace_segment(f"{base}.{i}", f"{base}.{i + 1}", suffixes)
+                _replace_segment(base, f"{base}.1", ('', *self.companions))
+            if self.compression:
+                compressor.submit(base, self.compression)
+        if not self.delay:
+            self.stream = self._open()
+
+
+def _replace_segment(source, target, suffixes):
+    """Move o segmento source, em todas as variantes, para target
+
+    As variantes que o source não tem são removidas do target, para que
+    não fique, por exemplo, um .gz antigo ao lado do novo segmento.
+    """
+    if not any(os.path.exists(source + suffix) for suffix in suffixes):
+        return
+    for suffix in suffixes:
+        if os.path.exists(source + suffix):
+            os.replace(source + suffix, target + suffix)
+        elif os.path.exists(target + suffix):
+            os.remove(target + suffix)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Enfileira os registros sem bloquear; conta os descartados se a fila encher"""
+
+    def __init__(self, maxsize=LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class LogWriter:
+    """Thread única que grava os registros da fila em lotes"""
+
+    def __init__(self, queue_handler, handlers):
+        self.queue_handler = queue_handler
+        self.handlers = handlers
+        self.reported_drops = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='adf-log-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Grava o que resta na fila e encerra a thread"""
+        if self._thread is not None:
+            self.queue_handler.queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _write(self, batch):
+        for record in batch:
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    try:
+                        handler.handle(record)
+                    except Exception:
+                        handler.handleError(record)
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, BatchRotatingFileHandler):
+                    handler.sync()
+                else:
+                    handler.flush()
+            except Exception:
+                pass
+
+    def _drop_record(self):
+        """Registro que informa quantas mensagens foram descartadas desde o último aviso"""
+        dropped = self.queue_handler.dropped
+        if dropped == self.reported_drops:
+            return None
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"{dropped - self.reported_drops} mensagens de log descartadas (fila cheia)", None, None
+        )
+        self.reported_drops = dropped
+        return record
+
+    def _run(self):
+        records = self.queue_handler.queue
+        while True:
+            record = records.get()
+            stop = record is None
+            batch = [] if stop else [record]
+            # Junta o que já está na fila em um único lote
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    record = records.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            drop_record = self._drop_record()
+            if drop_record is not None:
+                batch.append(drop_record)
+            self._write(batch)
+            if stop:
+                break
+
+
+_pipeline_lock = threading.RLock()
+_queue_handler = None
+_writer = None
+_loggers = {}
+
+
+def _create_handlers(level):
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
-    # Configura o handler de arquivo
-    file_handler = logging.handlers.RotatingFileHandler(
+    try:
+        from .config import get_config_value
+        max_bytes = int(get_config_value('logging.max_size', LOG_MAX_BYTES // (1024 * 1024)) * 1024 * 1024)
+        backup_count = get_config_value('logging.backup_count', LOG_BACKUP_COUNT)
+        compression = get_config_value('logging.compression', 'gzip')
+    except Exception:
+        max_bytes, backup_count, compression = LOG_MAX_BYTES, LOG_BACKUP_COUNT, 'gzip'
+
+    from .log_archive import compression_method, get_log_compressor
+    compression = compression_method(compression)
+
+    # Um único destino por arquivo, gravado só pela thread de log
+    file_handler = BatchRotatingFileHandler(
         get_log_path(),
-        maxBytes=LOG_MAX_BYTES,
-        backupCount=LOG_BACKUP_COUNT,
-        encoding='utf-8'
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding='utf-8',
+        compression=compression
     )
+    file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    
-    # Configura o handler de console
+
     console_handler = logging.StreamHandler()
+    console_handler.setLevel(max(level, logging.INFO))
     console_handler.setFormatter(formatter)
-    
-    # Configura o logger root
-    root_logger = logging.getLogger()
-    root_logger.setLevel(level)
-    
-    # Remove handlers existentes
-    root_logger.handlers = []
-    
-    # Adiciona os handlers
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    
+    handlers = [file_handler, console_handler]
+
+    if _structured_enabled():
+        # Log estruturado opcional, com índice de tempo para exportações
+        from .log_index import IndexedJsonlHandler, get_jsonl_path
+        jsonl_handler = IndexedJsonlHandler(
+            get_jsonl_path(), maxBytes=max_bytes, backupCount=backup_count, compression=compression
+        )
+        jsonl_handler.setLevel(level)
+        handlers.append(jsonl_handler)
+
+    if compression:
+        # Segmentos que ficaram sem comprimir (versões anteriores, saída no meio da compressão)
+        for handler in handlers:
+            if isinstance(handler, BatchRotatingFileHandler):
+                get_log_compressor().submit(handler.baseFilename, compression)
+    return handlers
+
+
+def _structured_enabled():
+    try:
+        from .config import get_config_value
+        return bool(get_config_value('logging.structured', False))
+    except Exception:
+        return False
+
+
+def _configured_level():
+    try:
+        from .config import get_config_value
+        return getattr(logging, str(get_config_value('logging.level', 'INFO')).upper(), logging.INFO)
+    except Exception:
+        # Configuração ainda não disponível (ex.: durante a importação de config)
+        return logging.INFO
+
+
+def _start_pipeline(level):
+    global _queue_handler, _writer
+    # Fora do lock: ler a configuração pode importar módulos que registram logs
+    handlers = _create_handlers(level)
+    with _pipeline_lock:
+        if _writer is not None:
+            _writer.stop()
+            for handler in _writer.handlers:
+                handler.close()
+
+        _queue_handler = BoundedQueueHandler()
+        _writer = LogWriter(_queue_handler, handlers)
+        _writer.start()
+
+        # Remove handlers existentes; tudo passa pela fila
+        root_logger = logging.getLogger()
+        root_logger.handlers = [_queue_handler]
+        root_logger.setLevel(level)
+
+
+def setup_logging(debug=False):
+    """Configura o sistema de logging
+
+    Os registros de todas as threads vão para uma fila limitada e uma
+    única thread grava em lotes no arquivo e no console.
+    """
+    _start_pipeline(logging.DEBUG if debug else _configured_level())
+
     # Log inicial
+    root_logger = logging.getLogger()
     root_logger.info("Sistema de logging iniciado")
     if debug:
         root_logger.debug("Modo debug ativado")
 
-def get_logger(name):
-    """Retorna uma instância do logger."""
-    return Logger(name)
+
+def shutdown_logging():
+    """Grava os registros pendentes; chamado na saída da aplicação"""
+    with _pipeline_lock:
+        if _writer is not None:
+            _writer.stop()
+
+
+def get_log_stats():
+    """Retorna registros aguardando gravação e descartados"""
+    if _queue_handler is None:
+        return {'queued': 0, 'dropped': 0}
+    return {'queued': _queue_handler.queue.qsize(), 'dropped': _queue_handler.dropped}
+
+
+def _ensure_logging():
+    # Módulos importados antes do setup_logging também usam a fila
+    if _writer is None:
+        _start_pipeline(_configured_level())
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(name=None):
+    """Retorna a instância do logger, criada uma vez por nome"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name))
+    return logger
 
 class Logger:
     """Classe para gerenciamento de logs."""
     
     def __init__(self, name):
         """Inicializa o logger."""
+        _ensure_logging()
         self.logger = logging.getLogger(name)
         
-        if not self.logger.handlers:
-            self.setup_logger()
-            
-    def setup_logger(self):
-        """Configura o logger."""
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Cria o diretório de logs se não existir
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-            
-        # Nome do arquivo de log com data
-        log_file = os.path.join(
-            log_dir,
-            f"adf_{datetime.now().strftime('%Y%m%d')}.log"
-        )
-        
-        # Handler para arquivo com rotação
-        file_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=5*1024*1024,  # 5MB
-            backupCount=5,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Handler para console
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Formato do log
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Adiciona os handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        
     def debug(self, message):
         """Registra mensagem de debug."""
         self.logger.debug(message)
@@ -189,37 +400,47 @@ class LogManager:
             
     @staticmethod
     def export_logs(start_date=None, end_date=None, level=None):
-        """Exporta logs para um arquivo"""
+        """Exporta logs para um arquivo
+
+        Com o log estruturado ativado, o índice de tempo limita a leitura
+        ao trecho do período em cada arquivo; senão o log de texto é lido
+        linha a linha.
+        """
         try:
             log_path = get_log_path()
-            export_path = log_path.parent / f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-            
-            with open(log_path, 'r', encoding='utf-8') as source:
-                logs = source.readlines()
-                
-            filtered_logs = []
-            for log in logs:
-                # Filtra por data
-                if start_date or end_date:
-                    try:
-                        log_date = datetime.strptime(log[:19], '%Y-%m-%d %H:%M:%S')
-                        if start_date and log_date < start_date:
-                            continue
-                        if end_date and log_date > end_date:
-                            continue
-                    except:
-                        continue
-                
-                # Filtra por nível
-                if level:
-                    if f" - {level} - " not in log:
-                        continue
-                        
-                filtered_logs.append(log)
-                
+            export_path = Path(log_path).parent / f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+
+            from .log_index import get_jsonl_path, query_logs, format_entry
+            from .log_archive import segment_files, open_current_segment
+            exported = 0
             with open(export_path, 'w', encoding='utf-8') as target:
-                target.writelines(filtered_logs)
-                
+                if _structured_enabled() and os.path.exists(get_jsonl_path()):
+                    start = start_date.timestamp() if start_date else None
+                    end = end_date.timestamp() if end_date else None
+                    for entry in query_logs(start, end, level):
+                        target.write(format_entry(entry))
+                        exported += 1
+                else:
+                    # O formato de data tem largura fixa: a comparação de texto basta
+                    start = start_date.strftime('%Y-%m-%d %H:%M:%S') if start_date else None
+                    end = end_date.strftime('%Y-%m-%d %H:%M:%S') if end_date else None
+                    for file in segment_files(log_path):
+                        with open_current_segment(file, 'rt') as source:
+                            for log in source:
+                                log_date = log[:19]
+                                if (start or end) and not LOG_DATE_PATTERN.match(log_date):
+                                    continue
+                                if start and log_date < start:
+                                    continue
+                                if end and log_date > end:
+                                    continue
+                                # Filtra por nível
+                                if level and f" - {level} - " not in log:
+                                    continue
+                                target.write(log)
+                                exported += 1
+
+            get_logger().info(f"{exported} registros de log exportados para {export_path}")
             return str(export_path)
         except Exception as e:
             logger = get_logger()
@@ -230,10 +451,10 @@ class LogManager:
     def clear_old_logs():
         """Remove logs antigos"""
         try:
-            log_dir = get_log_path().parent
+            log_dir = Path(get_log_path()).parent
             current_time = datetime.now()
             
-            for file in log_dir.glob("*.log.*"):
+            for file in [*log_dir.glob("*.log.*"), *log_dir.glob("*.jsonl.*")]:
                 # Verifica se o arquivo é mais antigo que 30 dias
                 if (current_time - datetime.fromtimestamp(file.stat().st_mtime)).days > 30:
                     file.unlink()
@@ -242,4 +463,4 @@ class LogManager:
         except Exception as e:
             logger = get_logger()
             logger.error(f"Erro ao limpar logs antigos: {e}")
-            return False 
\ No newline at end of file
+            return False
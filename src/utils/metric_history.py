@@ -0,0 +1,163 @@
+"""
+Histórico de métricas e atribuição de picos do ADF System Manager.
+
+Guarda as últimas medições de CPU, memória e I/O de disco em um anel de
+tamanho fixo. Quando uma delas passa do limite configurado em
+'monitoring', registra quais processos mais usavam o recurso; uma nova
+captura do mesmo recurso só ocorre depois que ele volta abaixo do limite. A captura
+de CPU e de disco é feita em duas fases: na medição do pico só os
+contadores acumulados são lidos, e na seguinte as diferenças indicam os
+responsáveis. Cada recurso tem um intervalo mínimo entre capturas, para
+que a própria captura não agrave o pico.
+"""
+
+import heapq
+import json
+import os
+import time
+from collections import deque
+import psutil
+from .logger import get_logger
+from .config import get_config_value, get_cache_dir
+
+logger = get_logger(__name__)
+
+SPIKES_FILE_NAME = 'spikes.json'
+
+# Recursos monitorados e o atributo de processo usado na captura
+RESOURCES = {'cpu': 'cpu_times', 'memory': 'memory_info', 'disk_io': 'io_counters'}
+
+MB = 1024 * 1024
+
+
+def _process_value(resource, value):
+    """Valor acumulado (cpu, disco) ou instantâneo (memória) de um processo"""
+    if resource == 'cpu':
+        return value.user + value.system
+    if resource == 'memory':
+        return value.rss
+    return value.read_bytes + value.write_bytes
+
+
+def _read_processes(resource):
+    """Retorna {pid: (nome, valor)} de todos os processos acessíveis"""
+    attribute = RESOURCES[resource]
+    values = {}
+    for process in psutil.process_iter(['name', attribute]):
+        value = process.info.get(attribute)
+        if value is not None:
+            values[process.pid] = (process.info['name'] or '', _process_value(resource, value))
+    return values
+
+
+class MetricHistory:
+    """Anel de medições com os processos responsáveis por cada pico"""
+
+    def __init__(self, capacity=3600, top=5, path=None):
+        self.points = deque(maxlen=capacity)
+        self.spikes = deque(maxlen=get_config_value('monitoring.spike_history', 50))
+        self.top = top
+        self.cooldown = get_config_value('monitoring.spike_cooldown', 60)
+        self.thresholds = {
+            'cpu': get_config_value('monitoring.cpu_threshold', 80),
+            'memory': get_config_value('monitoring.memory_threshold', 80),
+            'disk_io': get_config_value('monitoring.disk_io_threshold', 100) * MB
+        }
+        self.path = path or os.path.join(get_cache_dir('monitoring'), SPIKES_FILE_NAME)
+        self.last_capture = {}
+        # Recursos acima do limite desde a última captura
+        self.above = set()
+        # Capturas em duas fases aguardando a próxima medição
+        self.pending = {}
+        self.last_disk = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.spikes.extend(json.load(f))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Histórico de picos inválido: {e}")
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self.spikes), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Erro ao gravar histórico de picos: {e}")
+
+    def disk_io_rate(self, now):
+        """Bytes lidos e gravados por segundo desde a última medição"""
+        counters = psutil.disk_io_counters()
+        if counters is None:
+            return 0
+        total = counters.read_bytes + counters.write_bytes
+        previous, self.last_disk = self.last_disk, (now, total)
+        if previous is None or now <= previous[0]:
+            return 0
+        return max(total - previous[1], 0) / (now - previous[0])
+
+    def record(self, cpu_percent, ram_percent):
+        """Registra uma medição; retorna os picos capturados nela"""
+        now = time.time()
+        values = {'cpu': cpu_percent, 'memory': ram_percent, 'disk_io': self.disk_io_rate(now)}
+        self.points.append((now, cpu_percent, ram_percent, values['disk_io']))
+
+        captured = []
+        for resource, (started, value, baseline) in list(self.pending.items()):
+            del self.pending[resource]
+            captured.append(self.finish_capture(resource, started, value, baseline, now))
+
+        for resource, value in values.items():
+            if value < self.thresholds[resource]:
+                # Abaixo do limite: o próximo cruzamento pode ser capturado
+                self.above.discard(resource)
+                continue
+            if resource in self.above or resource in self.pending:
+                continue
+            if now - self.last_capture.get(resource, 0) < self.cooldown:
+                continue
+            self.above.add(resource)
+            self.last_capture[resource] = now
+            if resource == 'memory':
+                # Memória é instantânea: uma leitura basta
+                captured.append(self.finish_capture(resource, now, value, None, now))
+            else:
+                self.pending[resource] = (now, value, _read_processes(resource))
+
+        if captured:
+            self.save()
+        return captured
+
+    def finish_capture(self, resource, started, value, baseline, now):
+        """Calcula os maiores processos e guarda o pico"""
+        current = _read_processes(resource)
+        if baseline is None:
+            usage = ((pid, name, amount) for pid, (name, amount) in current.items())
+        else:
+            elapsed = max(now - started, 0.001)
+            cpu_count = psutil.cpu_count() or 1
+            usage = []
+            for pid, (name, amount) in current.items():
+                if pid in baseline:
+                    rate = max(amount - baseline[pid][1], 0) / elapsed
+                    usage.append((pid, name, rate / cpu_count * 100 if resource == 'cpu' else rate))
+
+        processes = [item for item in heapq.nlargest(self.top, usage, key=lambda item: item[2]) if item[2] > 0]
+        spike = {
+            'time': started,
+            'resource': resource,
+            'value': value,
+            'threshold': self.thresholds[resource],
+            'processes': [[pid, name, round(amount, 1)] for pid, name, amount in processes]
+        }
+        self.spikes.append(spike)
+        logger.info(
+            f"Pico de {resource}: {value:.1f} (limite {self.thresholds[resource]}), "
+            f"principais: {', '.join(name for pid, name, amount in processes)}"
+        )
+        return spike
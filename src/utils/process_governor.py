@@ -0,0 +1,227 @@
+"""
+Governador de prioridade de processos do ADF System Manager.
+
+Aplica regras configuráveis (nome do processo, usuário e uso de CPU) que
+ajustam a prioridade de CPU, a prioridade de I/O e a afinidade. Os
+processos são acompanhados por PID e horário de criação: a cada ciclo só
+os processos novos são inspecionados (incluindo PIDs reutilizados, que
+têm outro horário de criação), com uma única leitura de atributos por
+processo (oneshot), e só os que aguardam uma condição de CPU são medidos
+de novo. O intervalo aumenta sozinho se um ciclo custar mais de 1% dele.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+import psutil
+from .logger import get_logger
+from .config import get_config_value
+from .constants import DEFAULT_PROCESS_RULES
+
+logger = get_logger(__name__)
+
+# Fração máxima do intervalo gasta em cada ciclo
+MAX_OVERHEAD = 0.01
+
+# Valores de nice equivalentes às classes de prioridade do Windows
+POSIX_NICE = {'idle': 19, 'below_normal': 10, 'normal': 0, 'above_normal': -5, 'high': -10}
+
+
+def _set_priority(process, priority):
+    if os.name == 'nt':
+        process.nice(getattr(psutil, f"{priority.upper()}_PRIORITY_CLASS"))
+    else:
+        process.nice(POSIX_NICE[priority])
+
+
+def _set_io_priority(process, io_priority):
+    if os.name == 'nt':
+        process.ionice({'very_low': psutil.IOPRIO_VERYLOW, 'low': psutil.IOPRIO_LOW,
+                        'normal': psutil.IOPRIO_NORMAL}[io_priority])
+    elif hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+        if io_priority == 'very_low':
+            process.ionice(psutil.IOPRIO_CLASS_IDLE)
+        else:
+            process.ionice(psutil.IOPRIO_CLASS_BE, 7 if io_priority == 'low' else 4)
+
+
+class ProcessRule:
+    """Regra compilada do governador"""
+
+    def __init__(self, rule):
+        self.name = rule.get('name') or rule['process']
+        self.process = re.compile(fnmatch.translate(rule['process'].lower()))
+        user = rule.get('user', '')
+        self.user = re.compile(fnmatch.translate(user.lower())) if user else None
+        # Uso mínimo de CPU, em % da máquina inteira
+        self.min_cpu = rule.get('min_cpu', 0)
+        self.priority = rule.get('priority', '')
+        self.io_priority = rule.get('io_priority', '')
+        self.affinity = rule.get('affinity', [])
+
+    def matches(self, name, user):
+        if not self.process.match(name):
+            return False
+        return self.user is None or (user is not None and bool(self.user.match(user)))
+
+    def apply(self, process):
+        """Aplica os ajustes da regra ao processo"""
+        if self.priority:
+            _set_priority(process, self.priority)
+        if self.io_priority:
+            _set_io_priority(process, self.io_priority)
+        if self.affinity:
+            cpus = [cpu for cpu in self.affinity if cpu < psutil.cpu_count()]
+            if cpus:
+                process.cpu_affinity(cpus)
+
+
+class ProcessGovernor:
+    """Aplica as regras aos processos em uma thread em segundo plano"""
+
+    def __init__(self, rules, interval=5):
+        self.rules = [ProcessRule(rule) for rule in rules]
+        self.needs_user = any(rule.user for rule in self.rules)
+        self.interval = interval
+        self.cpu_count = psutil.cpu_count() or 1
+        # PID -> horário de criação dos processos já inspecionados
+        self.known = {}
+        # PID -> (processo, regras que aguardam a condição de CPU)
+        self.watched = {}
+        self.applied = 0
+        self.busy_time = 0.0
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='adf-process-governor', daemon=True)
+        self._thread.start()
+        logger.info(f"Governador de processos iniciado com {len(self.rules)} regras")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _loop(self):
+        interval = self.interval
+        while not self._stop.is_set():
+            try:
+                elapsed = self.tick()
+                # Mantém o custo abaixo de MAX_OVERHEAD do intervalo
+                interval = max(self.interval, elapsed / MAX_OVERHEAD)
+            except Exception as e:
+                logger.error(f"Erro no governador de processos: {e}")
+            self._stop.wait(interval)
+
+    def tick(self):
+        """Executa um ciclo; retorna o tempo gasto em segundos"""
+        start = time.perf_counter()
+        pids = set()
+        for process in psutil.process_iter():
+            pids.add(process.pid)
+            try:
+                created = process.create_time()
+            except psutil.Error:
+                created = None
+            if process.pid in self.known and self.known[process.pid] == created:
+                continue
+            # Processo novo ou PID reutilizado por outro processo
+            self.watched.pop(process.pid, None)
+            self.known[process.pid] = created
+            self.inspect(process)
+        for pid in self.known.keys() - pids:
+            del self.known[pid]
+            self.watched.pop(pid, None)
+        self.check_cpu()
+
+        elapsed = time.perf_counter() - start
+        self.busy_time += elapsed
+        self.ticks += 1
+        return elapsed
+
+    def inspect(self, process):
+        """Lê um processo novo e aplica as regras que não dependem de CPU"""
+        pid = process.pid
+        try:
+            with process.oneshot():
+                name = process.name().lower()
+                user = None
+                if self.needs_user:
+                    try:
+                        user = process.username().lower()
+                    except psutil.AccessDenied:
+                        pass
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        if pid == os.getpid():
+            return
+
+        pending = []
+        for rule in self.rules:
+            if not rule.matches(name, user):
+                continue
+            if rule.min_cpu:
+                pending.append(rule)
+            else:
+                self.apply(process, rule)
+        if pending:
+            # A primeira leitura só inicia a medição
+            try:
+                process.cpu_percent(None)
+                self.watched[pid] = (process, pending)
+            except psutil.Error:
+                pass
+
+    def check_cpu(self):
+        """Aplica as regras de CPU aos processos que passaram do limite"""
+        for pid, (process, pending) in list(self.watched.items()):
+            try:
+                # is_running compara o horário de criação, detectando PID reutilizado
+                if not process.is_running():
+                    raise psutil.NoSuchProcess(pid)
+                share = process.cpu_percent(None) / self.cpu_count
+            except psutil.Error:
+                del self.watched[pid]
+                continue
+            for rule in [rule for rule in pending if share >= rule.min_cpu]:
+                self.apply(process, rule)
+                pending.remove(rule)
+            if not pending:
+                del self.watched[pid]
+
+    def apply(self, process, rule):
+        try:
+            rule.apply(process)
+            self.applied += 1
+            logger.info(f"Regra {rule.name} aplicada ao processo {process.pid}")
+        except (psutil.Error, KeyError, AttributeError, ValueError) as e:
+            logger.debug(f"Não foi possível aplicar a regra {rule.name} ao processo {process.pid}: {e}")
+
+    def overhead(self):
+        """Tempo médio de cada ciclo, em segundos"""
+        return self.busy_time / self.ticks if self.ticks else 0.0
+
+
+_process_governor = None
+
+
+def get_process_governor():
+    """Retorna o governador com as regras da configuração"""
+    global _process_governor
+    if _process_governor is None:
+        _process_governor = ProcessGovernor(
+            get_config_value('process_governor.rules', DEFAULT_PROCESS_RULES),
+            get_config_value('process_governor.interval', 5)
+        )
+    return _process_governor
@@ -0,0 +1,141 @@
+"""
+Amostragem de processos do ADF System Manager.
+
+A cada amostra os atributos de cada processo são lidos em um único bloco
+oneshot e comparados com a amostra anterior, guardada por PID, para
+calcular o uso de CPU, a taxa de leitura e gravação e a variação de
+memória. Só as linhas que mudaram são devolvidas; os maiores N por
+qualquer coluna saem de um heap, sem ordenar a tabela inteira.
+"""
+
+import heapq
+import os
+import time
+import psutil
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Colunas de cada linha da tabela de processos
+COLUMNS = ('pid', 'name', 'user', 'cpu', 'memory', 'memory_delta', 'read_rate', 'write_rate', 'threads')
+PID, NAME, USER, CPU, MEMORY, MEMORY_DELTA, READ_RATE, WRITE_RATE, THREADS = range(len(COLUMNS))
+
+
+def top_rows(rows, column, count=0, ascending=False, predicate=None):
+    """Retorna as count linhas com os maiores (ou menores) valores da coluna
+
+    count=0 retorna todas, ordenadas. predicate filtra as linhas antes.
+    """
+    candidates = rows if predicate is None else (row for row in rows if predicate(row))
+    key = lambda row: row[column]
+    if not count:
+        return sorted(candidates, key=key, reverse=not ascending)
+    if ascending:
+        return heapq.nsmallest(count, candidates, key=key)
+    return heapq.nlargest(count, candidates, key=key)
+
+
+class ProcessSampler:
+    """Tabela de processos atualizada de forma incremental"""
+
+    def __init__(self):
+        self.cpu_count = psutil.cpu_count() or 1
+        self.processes = {}
+        # PID -> (nome, usuário), lidos uma vez por processo
+        self.static = {}
+        # PID -> (instante, tempo de CPU, bytes lidos, bytes gravados, memória)
+        self.previous = {}
+        # PID -> linha atual
+        self.rows = {}
+
+    def _forget(self, pid):
+        self.processes.pop(pid, None)
+        self.static.pop(pid, None)
+        self.previous.pop(pid, None)
+        return self.rows.pop(pid, None) is not None
+
+    def _static_info(self, process):
+        try:
+            name = process.name()
+        except psutil.Error:
+            name = ''
+        try:
+            user = process.username()
+        except psutil.Error:
+            user = ''
+        # Remove o domínio do usuário (DOMINIO\\usuario)
+        return name, user.rsplit('\\', 1)[-1]
+
+    def sample(self):
+        """Lê todos os processos; retorna ({pid: linha alterada}, [pids encerrados])"""
+        now = time.monotonic()
+        pids = set(psutil.pids())
+        removed = [pid for pid in list(self.processes) if pid not in pids and self._forget(pid)]
+        changed = {}
+
+        for pid in pids:
+            process = self.processes.get(pid)
+            if process is None:
+                try:
+                    process = self.processes[pid] = psutil.Process(pid)
+                except psutil.Error:
+                    continue
+            try:
+                with process.oneshot():
+                    if pid not in self.static:
+                        self.static[pid] = self._static_info(process)
+                    cpu_times = process.cpu_times()
+                    memory = process.memory_info().rss
+                    threads = process.num_threads()
+                    try:
+                        io = process.io_counters()
+                        read_bytes, write_bytes = io.read_bytes, io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        read_bytes = write_bytes = 0
+            except psutil.NoSuchProcess:
+                if self._forget(pid):
+                    removed.append(pid)
+                continue
+            except psutil.Error:
+                # Sem acesso aos contadores: mantém só nome e usuário
+                cpu_times = None
+                memory = threads = read_bytes = write_bytes = 0
+                self.static.setdefault(pid, self._static_info(process))
+
+            cpu_total = cpu_times.user + cpu_times.system if cpu_times else 0.0
+            cpu = memory_delta = read_rate = write_rate = 0
+            previous = self.previous.get(pid)
+            if previous and cpu_total < previous[1]:
+                # Tempo de CPU menor que o anterior: o PID foi reutilizado
+                self.static[pid] = self._static_info(process)
+                previous = None
+            if previous:
+                elapsed = now - previous[0]
+                if elapsed > 0:
+                    cpu = round((cpu_total - previous[1]) / elapsed / self.cpu_count * 100, 1)
+                    read_rate = int(max(read_bytes - previous[2], 0) / elapsed)
+                    write_rate = int(max(write_bytes - previous[3], 0) / elapsed)
+                memory_delta = memory - previous[4]
+            self.previous[pid] = (now, cpu_total, read_bytes, write_bytes, memory)
+
+            name, user = self.static[pid]
+            row = (pid, name, user, cpu, memory, memory_delta, read_rate, write_rate, threads)
+            if self.rows.get(pid) != row:
+                self.rows[pid] = row
+                changed[pid] = row
+
+        return changed, removed
+
+    def top(self, column, count, ascending=False):
+        """Maiores count processos pela coluna"""
+        return top_rows(self.rows.values(), column, count, ascending)
+
+
+def terminate_process(pid):
+    """Encerra um processo; levanta psutil.Error se não for possível"""
+    if pid == os.getpid():
+        raise psutil.AccessDenied(pid)
+    process = psutil.Process(pid)
+    name = process.name()
+    process.terminate()
+    logger.info(f"Processo {pid} ({name}) encerrado pelo usuário")
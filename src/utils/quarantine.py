@@ -0,0 +1,288 @@
+"""
+Quarentena da limpeza do ADF System Manager.
+
+Em vez de apagar, a limpeza pode mover os arquivos com os.replace para uma
+pasta de quarentena no mesmo volume. A operação só altera entradas de
+diretório, então custa o mesmo que apagar e pode ser desfeita. Cada limpeza
+cria uma sessão com um manifesto por volume; sessões antigas são apagadas
+depois de N dias ou quando falta espaço.
+"""
+
+import ctypes
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+import psutil
+from .logger import get_logger
+from .config import get_cache_dir
+from .scheduler import JobLock
+
+logger = get_logger(__name__)
+
+QUARANTINE_DIR = '.adf_quarantine'
+MANIFEST_NAME = 'manifest.jsonl'
+
+_registry_lock = threading.Lock()
+
+
+@contextmanager
+def _registry_locked():
+    """Trava o registro entre threads e entre a interface e o modo --headless"""
+    with _registry_lock, JobLock('quarantine'):
+        yield
+
+
+def find_mount_point(path):
+    """Retorna a raiz do volume que contém path"""
+    path = os.path.abspath(path)
+    device = os.stat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path:
+            return path
+        try:
+            if os.stat(parent).st_dev != device:
+                return path
+        except OSError:
+            return path
+        path = parent
+
+
+def _registry_path():
+    return os.path.join(get_cache_dir('quarantine'), 'sessions.json')
+
+
+def load_sessions():
+    """Retorna {id: sessão} das sessões em quarentena"""
+    try:
+        with open(_registry_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Registro da quarentena inválido: {e}")
+        return {}
+
+
+def _save_sessions(sessions):
+    path = _registry_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(sessions, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def _hide(path):
+    if os.name == 'nt':
+        try:
+            ctypes.windll.kernel32.SetFileAttributesW(path, 0x2)  # FILE_ATTRIBUTE_HIDDEN
+        except Exception:
+            pass
+
+
+class QuarantineStore:
+    """Pasta de uma sessão em um volume, com o manifesto dos arquivos movidos"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        _hide(os.path.dirname(folder))
+        self.manifest = open(os.path.join(folder, MANIFEST_NAME), 'a', encoding='utf-8')
+        self.files = 0
+        self.bytes = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def move(self, path, size):
+        """Move o arquivo para a quarentena; levanta OSError se não for possível"""
+        with self._lock:
+            self._next += 1
+            name = f"{self._next:08d}"
+        # Mesmo volume: só a entrada de diretório muda
+        os.replace(path, os.path.join(self.folder, name))
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+            self.manifest.write(json.dumps({'name': name, 'path': path, 'size': size}) + '\n')
+            # Gravado a cada arquivo: se a limpeza for interrompida, o desfazer continua possível
+            self.manifest.flush()
+
+    def close(self):
+        self.manifest.close()
+
+
+class QuarantineSession:
+    """Uma limpeza em quarentena; as pastas são criadas por volume sob demanda"""
+
+    def __init__(self):
+        base_id = time.strftime('%Y%m%d_%H%M%S')
+        existing = load_sessions()
+        self.id = base_id
+        suffix = 1
+        # Duas limpezas no mesmo segundo não compartilham a sessão
+        while self.id in existing:
+            suffix += 1
+            self.id = f"{base_id}_{suffix}"
+        self.created = time.time()
+        self.stores = {}
+        self.registered = False
+        self._lock = threading.Lock()
+
+    def store_for(self, path):
+        """Retorna a pasta da sessão no volume de path"""
+        mount = find_mount_point(path)
+        with self._lock:
+            store = self.stores.get(mount)
+            if store is None:
+                store = self.stores[mount] = QuarantineStore(
+                    os.path.join(mount, QUARANTINE_DIR, self.id)
+                )
+                # Registrada antes do primeiro arquivo movido, para que uma limpeza
+                # interrompida ainda possa ser restaurada ou apagada
+                self._register([store.folder for store in self.stores.values()], 0, 0)
+            return store
+
+    def _register(self, folders, files, size):
+        with _registry_locked():
+            sessions = load_sessions()
+            if folders:
+                sessions[self.id] = {'created': self.created, 'folders': folders,
+                                     'files': files, 'bytes': size}
+            else:
+                sessions.pop(self.id, None)
+            _save_sessions(sessions)
+        self.registered = bool(folders)
+
+    def close(self):
+        """Fecha os manifestos e atualiza o registro da sessão; retorna (arquivos, bytes)"""
+        with self._lock:
+            stores = list(self.stores.values())
+        files = sum(store.files for store in stores)
+        size = sum(store.bytes for store in stores)
+        for store in stores:
+            store.close()
+            if not store.files:
+                shutil.rmtree(store.folder, ignore_errors=True)
+
+        folders = [store.folder for store in stores if store.files]
+        if folders or self.registered:
+            self._register(folders, files, size)
+        if folders:
+            logger.info(f"Quarentena {self.id}: {files} arquivos, {size} bytes")
+        return files, size
+
+
+def _read_manifest(folder):
+    entries = []
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Manifesto da quarentena ilegível em {folder}: {e}")
+    return entries
+
+
+def restore_session(session_id):
+    """Devolve os arquivos de uma sessão aos caminhos originais
+
+    Arquivos cujo caminho original voltou a existir ficam na quarentena.
+    Retorna {'restored', 'conflicts', 'errors'}.
+    """
+    result = {'restored': 0, 'conflicts': 0, 'errors': 0}
+    with _registry_locked():
+        sessions = load_sessions()
+        session = sessions.get(session_id)
+        if session is None:
+            return result
+
+        remaining_folders = []
+        files = 0
+        size = 0
+        for folder in session['folders']:
+            remaining = []
+            for entry in _read_manifest(folder):
+                stored = os.path.join(folder, entry['name'])
+                if not os.path.exists(stored):
+                    continue
+                if os.path.lexists(entry['path']):
+                    result['conflicts'] += 1
+                    remaining.append(entry)
+                    continue
+                try:
+                    os.makedirs(os.path.dirname(entry['path']), exist_ok=True)
+                    os.replace(stored, entry['path'])
+                    result['restored'] += 1
+                except OSError as e:
+                    logger.warning(f"Erro ao restaurar {entry['path']} da quarentena: {e}")
+                    result['errors'] += 1
+                    remaining.append(entry)
+
+            if remaining:
+                with open(os.path.join(folder, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+                    for entry in remaining:
+                        f.write(json.dumps(entry) + '\n')
+                remaining_folders.append(folder)
+                files += len(remaining)
+                size += sum(entry['size'] for entry in remaining)
+            else:
+                shutil.rmtree(folder, ignore_errors=True)
+
+        if remaining_folders:
+            session.update({'folders': remaining_folders, 'files': files, 'bytes': size})
+        else:
+            del sessions[session_id]
+        _save_sessions(sessions)
+
+    logger.info(
+        f"Quarentena {session_id} restaurada: {result['restored']} arquivos, "
+        f"{result['conflicts']} conflitos, {result['errors']} erros"
+    )
+    return result
+
+
+def purge_session(session_id):
+    """Apaga definitivamente uma sessão; retorna os bytes liberados"""
+    with _registry_locked():
+        sessions = load_sessions()
+        session = sessions.pop(session_id, None)
+        if session is None:
+            return 0
+        for folder in session['folders']:
+            shutil.rmtree(folder, ignore_errors=True)
+        _save_sessions(sessions)
+    logger.info(f"Quarentena {session_id} apagada: {session['files']} arquivos, {session['bytes']} bytes")
+    return session['bytes']
+
+
+def purge_quarantine(max_age_days, drive=None, min_free=0):
+    """Apaga as sessões vencidas e, se drive estiver abaixo de min_free bytes,
+    as mais antigas com arquivos nele até recuperar o espaço
+
+    Retorna {'sessions', 'bytes'}.
+    """
+    result = {'sessions': 0, 'bytes': 0}
+    cutoff = time.time() - max_age_days * 86400
+    sessions = sorted(load_sessions().items(), key=lambda item: item[1]['created'])
+
+    for session_id, session in sessions:
+        if session['created'] < cutoff:
+            result['bytes'] += purge_session(session_id)
+            result['sessions'] += 1
+
+    if drive and min_free:
+        mount = find_mount_point(drive)
+        for session_id, session in sessions:
+            if psutil.disk_usage(drive).free >= min_free:
+                break
+            if session['created'] < cutoff:
+                continue
+            if any(folder.startswith(os.path.join(mount, QUARANTINE_DIR)) for folder in session['folders']):
+                result['bytes'] += purge_session(session_id)
+                result['sessions'] += 1
+
+    return result
@@ -0,0 +1,201 @@
+"""
+Retenção de backups do ADF System Manager.
+
+Indexa os conjuntos de backup existentes no destino (``backup_*.zip``,
+pastas ``backup_*`` e snapshots do repositório deduplicado) e remove os
+que não são mais mantidos pela política configurada.
+"""
+
+import os
+import re
+import shutil
+from datetime import datetime
+from .logger import get_logger, LogManager
+from .backup_manifest import read_manifest, get_manifest_path
+from .chunkstore import ChunkStore, STORE_DIR_NAME
+from .fastcopy import COPY_JOURNAL_NAME
+from .governor import background_priority
+
+logger = get_logger(__name__)
+
+BACKUP_NAME_PATTERN = re.compile(r'^backup_(\d{8}_\d{6})(\.zip)?$')
+BACKUP_DATE_FORMAT = '%Y%m%d_%H%M%S'
+
+RETENTION_MODES = ('count', 'gfs')
+
+
+def _parse_backup_date(name):
+    match = BACKUP_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), BACKUP_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def index_backup_sets(destination):
+    """Lista os conjuntos de backup do destino, do mais novo ao mais antigo"""
+    backup_sets = []
+
+    try:
+        entries = list(os.scandir(destination))
+    except OSError as e:
+        logger.error(f"Erro ao listar backups em {destination}: {e}")
+        return backup_sets
+
+    for entry in entries:
+        created = _parse_backup_date(entry.name)
+        if created is None:
+            continue
+
+        if entry.name.endswith('.zip') and entry.is_file():
+            kind = 'zip'
+        elif entry.is_dir():
+            # Cópias interrompidas ficam fora da retenção até serem retomadas
+            if os.path.exists(os.path.join(entry.path, COPY_JOURNAL_NAME)):
+                continue
+            kind = 'folder'
+        else:
+            continue
+
+        manifest = None
+        try:
+            manifest = read_manifest(entry.path)
+        except Exception as e:
+            logger.warning(f"Manifesto inválido para {entry.name}: {e}")
+
+        backup_sets.append({
+            'name': entry.name[:-4] if kind == 'zip' else entry.name,
+            'kind': kind,
+            'path': entry.path,
+            'created': created,
+            'manifest': manifest
+        })
+
+    # Snapshots do repositório deduplicado
+    store_path = os.path.join(destination, STORE_DIR_NAME)
+    if os.path.isdir(os.path.join(store_path, 'snapshots')):
+        for name in os.listdir(os.path.join(store_path, 'snapshots')):
+            if not name.endswith('.json'):
+                continue
+            created = _parse_backup_date(name[:-5])
+            if created is None:
+                continue
+            backup_sets.append({
+                'name': name[:-5],
+                'kind': 'dedup',
+                'path': os.path.join(store_path, 'snapshots', name),
+                'created': created,
+                'manifest': None
+            })
+
+    backup_sets.sort(key=lambda backup_set: backup_set['created'], reverse=True)
+    return backup_sets
+
+
+def select_kept(backup_sets, mode='count', max_backups=5, daily=7, weekly=4, monthly=12):
+    """Retorna os nomes dos backups mantidos pela política
+
+    backup_sets deve estar ordenado do mais novo ao mais antigo.
+    """
+    if not backup_sets:
+        return set()
+
+    if mode == 'gfs':
+        kept = set()
+        # Para cada período mantém o backup mais novo dele
+        buckets = (
+            (daily, lambda d: d.date()),
+            (weekly, lambda d: d.isocalendar()[:2]),
+            (monthly, lambda d: (d.year, d.month))
+        )
+        for limit, period_of in buckets:
+            seen = set()
+            for backup_set in backup_sets:
+                if len(seen) >= limit:
+                    break
+                period = period_of(backup_set['created'])
+                if period not in seen:
+                    seen.add(period)
+                    kept.add(backup_set['name'])
+    else:
+        kept = {backup_set['name'] for backup_set in backup_sets[:max(max_backups, 1)]}
+
+    # O backup mais recente nunca é removido
+    kept.add(backup_sets[0]['name'])
+    return kept
+
+
+def delete_backup_set(backup_set, store=None):
+    """Remove um conjunto de backup e o seu manifesto"""
+    if backup_set['kind'] == 'zip':
+        os.remove(backup_set['path'])
+    elif backup_set['kind'] == 'folder':
+        shutil.rmtree(backup_set['path'])
+    elif backup_set['kind'] == 'dedup':
+        store.delete_snapshot(backup_set['name'])
+
+    manifest_path = get_manifest_path(backup_set['path'])
+    if backup_set['kind'] != 'dedup' and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+
+def apply_retention(destination, mode='count', max_backups=5, daily=7, weekly=4, monthly=12,
+                    dry_run=False):
+    """Aplica a política de retenção no destino
+
+    Retorna um dicionário com os backups mantidos, removidos e o espaço liberado.
+    """
+    result = {'kept': [], 'deleted': [], 'errors': [], 'space_freed': 0}
+
+    backup_sets = index_backup_sets(destination)
+    kept = select_kept(backup_sets, mode, max_backups, daily, weekly, monthly)
+    expired = [backup_set for backup_set in backup_sets if backup_set['name'] not in kept]
+    result['kept'] = [backup_set['name'] for backup_set in backup_sets if backup_set['name'] in kept]
+
+    if dry_run or not expired:
+        result['deleted'] = [backup_set['name'] for backup_set in expired]
+        return result
+
+    store = None
+    if any(backup_set['kind'] == 'dedup' for backup_set in expired):
+        store = ChunkStore(os.path.join(destination, STORE_DIR_NAME))
+
+    with background_priority():
+        for backup_set in expired:
+            try:
+                size = _backup_set_size(backup_set)
+                delete_backup_set(backup_set, store)
+                result['space_freed'] += size
+                result['deleted'].append(backup_set['name'])
+                LogManager.log_backup_operation("retenção", "removido", backup_set['name'])
+            except Exception as e:
+                logger.error(f"Erro ao remover backup {backup_set['name']}: {e}")
+                result['errors'].append(backup_set['name'])
+
+        # Os blocos só são apagados quando nenhum snapshot mantido os usa
+        if store is not None:
+            try:
+                result['space_freed'] += store.prune()
+            except Exception as e:
+                logger.error(f"Erro ao liberar blocos do repositório: {e}")
+
+    return result
+
+
+def _backup_set_size(backup_set):
+    """Calcula o espaço ocupado por um conjunto de backup"""
+    if backup_set['kind'] == 'zip':
+        return os.path.getsize(backup_set['path'])
+    if backup_set['kind'] == 'folder':
+        total = 0
+        for root, _, files in os.walk(backup_set['path']):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+    # Blocos de snapshots deduplicados são contabilizados no prune()
+    return 0
@@ -0,0 +1,315 @@
+"""
+Agendador das tarefas de manutenção do ADF System Manager.
+
+Os horários da última execução ficam gravados em disco, então execuções
+perdidas (aplicação fechada ou máquina suspensa) são feitas assim que
+possível. As tarefas só começam com a máquina ociosa. O estado é relido
+do disco a cada verificação e cada tarefa tem uma trava entre processos,
+para que a interface e o modo --headless não executem a mesma tarefa.
+"""
+
+import json
+import os
+import time
+import psutil
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from .logger import get_logger
+from .config import get_config_path, get_config_value, get_cache_dir
+from .governor import is_system_idle
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+logger = get_logger(__name__)
+
+STATE_FILE_NAME = 'scheduler.json'
+
+# Nova tentativa após falha ou tarefa sem configuração
+RETRY_DELAY = 60 * 60
+
+# Intervalo mínimo entre execuções antecipadas (ex.: pouco espaço livre)
+URGENT_COOLDOWN = 60 * 60
+
+# Espera máxima por uma trava usada com "with"
+LOCK_TIMEOUT = 60
+
+
+def get_system_drive():
+    """Retorna a raiz da unidade do sistema"""
+    return os.getenv('SystemDrive', '') + os.sep
+
+
+def get_state_path():
+    """Retorna o caminho do estado do agendador, ao lado da configuração"""
+    return os.path.join(os.path.dirname(get_config_path()), STATE_FILE_NAME)
+
+
+class JobLock:
+    """Trava de arquivo entre processos; liberada pelo sistema se o processo terminar"""
+
+    def __init__(self, name):
+        self.path = os.path.join(get_cache_dir('scheduler'), f"{name}.lock")
+        self._file = None
+
+    def acquire(self):
+        """Obtém a trava sem esperar; retorna False se outro processo a tiver"""
+        f = open(self.path, 'a+b')
+        try:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if os.name == 'nt':
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        # O LK_LOCK do Windows desiste depois de ~10 s: tenta sem bloquear até
+        # o prazo, igual nas duas plataformas, e nunca segue sem a trava
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while not self.acquire():
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Trava ocupada: {self.path}")
+            time.sleep(0.1)
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+def load_state(path=None):
+    """Lê o estado das tarefas gravado em disco"""
+    path = path or get_state_path()
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        logger.warning(f"Estado do agendador inválido, recomeçando: {e}")
+    return {}
+
+
+def _apply_job_changes(state, name, changes):
+    """Aplica as mudanças da tarefa no estado (None remove a chave)"""
+    job_state = state.setdefault(name, {})
+    for key, value in changes.items():
+        if value is None:
+            job_state.pop(key, None)
+        else:
+            job_state[key] = value
+    return state
+
+
+def update_job_state(name, changes, path=None):
+    """Relê o estado, aplica as mudanças da tarefa (None remove a chave) e grava
+
+    Retorna o estado completo atualizado.
+    """
+    path = path or get_state_path()
+    try:
+        # Serializa as gravações da interface e do modo --headless
+        with JobLock('state'):
+            state = _apply_job_changes(load_state(path), name, changes)
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, indent=4)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.error(f"Erro ao salvar estado do agendador: {e}")
+    except TimeoutError as e:
+        # Sem a trava o estado não é gravado, só atualizado em memória
+        logger.error(f"Estado do agendador não gravado: {e}")
+        state = _apply_job_changes(load_state(path), name, changes)
+    return state
+
+
+def record_job_run(name, success=True):
+    """Registra uma execução feita fora do agendador (ex.: backup manual)"""
+    if success:
+        update_job_state(name, {'last_run': time.time(), 'last_success': True, 'retry_at': None})
+
+
+class MaintenanceScheduler(QObject):
+    """Executa tarefas periódicas de manutenção em segundo plano
+
+    Cada tarefa é criada por uma fábrica que retorna um QThread com sinal
+    finished, ou None quando não há como executá-la no momento.
+    """
+
+    job_started = pyqtSignal(str)
+    job_finished = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None, state_path=None):
+        super().__init__(parent)
+        self.state_path = state_path or get_state_path()
+        self.state = load_state(self.state_path)
+        self.jobs = {}
+        self.current_job = None
+        self.current_worker = None
+        self.current_lock = None
+        self.last_check = None
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+
+    def register_job(self, name, factory, enabled_key, interval_key, urgent=None):
+        """Registra uma tarefa
+
+        enabled_key e interval_key (em horas) são lidas da configuração a cada
+        verificação; urgent é uma função que antecipa a execução quando retorna True.
+        """
+        self.jobs[name] = {
+            'factory': factory,
+            'enabled_key': enabled_key,
+            'interval_key': interval_key,
+            'urgent': urgent
+        }
+
+    def update_state(self, name, changes):
+        self.state = update_job_state(name, changes, self.state_path)
+
+    def start(self):
+        """Inicia as verificações periódicas"""
+        # Primeira medição de CPU serve apenas de referência para as próximas
+        psutil.cpu_percent(interval=None)
+        self.timer.start(get_config_value('scheduler.check_interval', 60) * 1000)
+        logger.info(f"Agendador de manutenção iniciado com {len(self.jobs)} tarefas")
+
+    def stop(self):
+        self.timer.stop()
+
+    def next_run(self, name):
+        """Retorna o horário (epoch) da próxima execução da tarefa"""
+        job = self.jobs[name]
+        job_state = self.state.get(name, {})
+        interval = get_config_value(job['interval_key'], 24) * 3600
+        # Calculado a partir da última execução para refletir mudanças no intervalo
+        return max(job_state.get('last_run', 0) + interval, job_state.get('retry_at', 0))
+
+    def due_jobs(self, now):
+        """Lista as tarefas vencidas como (atraso, nome, urgente)"""
+        due = []
+        for name, job in self.jobs.items():
+            if not get_config_value(job['enabled_key'], False):
+                continue
+
+            next_run = self.next_run(name)
+            if now >= next_run:
+                due.append((now - next_run, name, False))
+                continue
+
+            last_attempt = self.state.get(name, {}).get('last_attempt', 0)
+            if job['urgent'] and now - last_attempt >= URGENT_COOLDOWN:
+                try:
+                    if job['urgent']():
+                        due.append((0, name, True))
+                except Exception as e:
+                    logger.warning(f"Erro ao verificar condição da tarefa {name}: {e}")
+
+        # Urgentes primeiro, depois as mais atrasadas
+        due.sort(key=lambda item: (not item[2], -item[0]))
+        return due
+
+    def check(self):
+        """Verifica se alguma tarefa deve ser executada"""
+        now = time.time()
+        interval = self.timer.interval() / 1000
+        if self.last_check and now - self.last_check > interval * 3:
+            logger.info(f"Agendador retomado após {int(now - self.last_check)}s sem verificações")
+        self.last_check = now
+
+        if self.current_job:
+            return
+
+        # Execuções de outro processo ou manuais também contam
+        self.state = load_state(self.state_path)
+        due = self.due_jobs(now)
+        if not due:
+            return
+
+        overdue, name, urgent = due[0]
+        max_delay = get_config_value('scheduler.max_delay', 4) * 3600
+        idle = is_system_idle(
+            get_config_value('scheduler.idle_cpu_threshold', 20),
+            get_config_value('scheduler.idle_seconds', 300)
+        )
+        if not idle and overdue < max_delay:
+            logger.debug(f"Tarefa {name} aguardando a máquina ficar ociosa")
+            return
+
+        if not idle:
+            logger.info(f"Tarefa {name} atrasada há {int(overdue / 60)} min, executando mesmo sem ociosidade")
+        self.run_job(name, urgent)
+
+    def run_job(self, name, urgent=False):
+        """Cria e inicia o worker da tarefa"""
+        now = time.time()
+        lock = JobLock(name)
+        if not lock.acquire():
+            logger.info(f"Tarefa {name} já em execução em outro processo")
+            self.update_state(name, {'retry_at': now + RETRY_DELAY})
+            return
+
+        try:
+            worker = self.jobs[name]['factory']()
+        except Exception as e:
+            logger.error(f"Erro ao criar tarefa {name}: {e}")
+            worker = None
+
+        if worker is None:
+            lock.release()
+            self.update_state(name, {'last_attempt': now, 'retry_at': now + RETRY_DELAY})
+            return
+
+        self.update_state(name, {'last_attempt': now})
+        self.current_job = name
+        self.current_worker = worker
+        self.current_lock = lock
+        worker.finished.connect(lambda *args: self.job_done(name, args))
+
+        reason = "antecipada" if urgent else "agendada"
+        logger.info(f"Iniciando tarefa {name} ({reason})")
+        self.job_started.emit(name)
+        worker.start()
+
+    def job_done(self, name, args):
+        """Registra o resultado de uma tarefa"""
+        # Os workers emitem um bool ou um dicionário vazio em caso de erro
+        success = bool(args[0]) if args else True
+        now = time.time()
+
+        if success:
+            self.update_state(name, {'last_success': True, 'last_run': now, 'retry_at': None})
+        else:
+            self.update_state(name, {'last_success': False, 'retry_at': now + RETRY_DELAY})
+
+        self.current_worker.wait()
+        self.current_lock.release()
+        self.current_job = None
+        self.current_worker = None
+        self.current_lock = None
+
+        logger.info(f"Tarefa {name} {'concluída' if success else 'falhou'}")
+        self.job_finished.emit(name, success)
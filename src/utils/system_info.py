@@ -152,9 +152,13 @@ class SystemInfo:
                 'gateway': 'N/A'
             }
         
-    def get_performance_metrics(self):
-        """Obtém métricas de desempenho em tempo real"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+    def get_performance_metrics(self, cpu_interval=1):
+        """Obtém métricas de desempenho em tempo real
+
+        Com cpu_interval=None o uso de CPU é o acumulado desde a chamada
+        anterior, sem bloquear.
+        """
+        cpu_percent = psutil.cpu_percent(interval=cpu_interval)
         ram = psutil.virtual_memory()
         disk = psutil.disk_usage('C:\\')
         
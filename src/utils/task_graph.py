@@ -0,0 +1,193 @@
+"""
+Grafo de tarefas do ADF System Manager.
+
+Cada tarefa declara as tarefas das quais depende e uma classe de recurso
+('disk', 'cpu' ou 'network'). Tarefas independentes rodam ao mesmo tempo,
+respeitando um limite de tarefas simultâneas por recurso, para que
+operações pesadas de disco não disputem o mesmo volume enquanto as leves
+seguem em paralelo.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Estados de uma tarefa
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+CANCELLED = 'cancelled'
+
+FINAL_STATES = (DONE, FAILED, SKIPPED, CANCELLED)
+
+# Tarefas simultâneas por classe de recurso
+RESOURCE_LIMITS = {'disk': 1, 'cpu': 4, 'network': 2}
+
+
+class TaskCancelled(Exception):
+    """Levantada pela função de uma tarefa interrompida pelo usuário"""
+
+
+class Task:
+    """Uma etapa do grafo
+
+    func recebe uma função progress(fração) para informar o andamento e
+    deve levantar uma exceção em caso de falha, ou TaskCancelled se foi
+    interrompida.
+    """
+
+    def __init__(self, name, func, depends=(), resource='cpu'):
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+        self.resource = resource
+        self.state = PENDING
+        self.progress = 0.0
+        self.duration = 0.0
+        self.error = None
+
+
+class TaskGraph:
+    """Executa tarefas respeitando dependências e limites por recurso"""
+
+    def __init__(self, tasks, limits=None, callback=None):
+        """callback(tarefa) é chamado a cada mudança de estado ou andamento"""
+        self.tasks = {task.name: task for task in tasks}
+        self.limits = limits or RESOURCE_LIMITS
+        self.callback = callback
+        self.cancelled = False
+        self._condition = threading.Condition()
+        self._check()
+
+    def _check(self):
+        """Rejeita dependências desconhecidas e ciclos"""
+        for task in self.tasks.values():
+            for name in task.depends:
+                if name not in self.tasks:
+                    raise ValueError(f"Tarefa {task.name} depende de {name}, que não existe")
+
+        visiting = set()
+        visited = set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependência circular na tarefa {name}")
+            visiting.add(name)
+            for dependency in self.tasks[name].depends:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.tasks:
+            visit(name)
+
+    def select(self, names):
+        """Retorna um novo grafo só com as tarefas informadas
+
+        Dependências fora da seleção são consideradas satisfeitas.
+        """
+        tasks = []
+        for name in names:
+            task = self.tasks[name]
+            tasks.append(Task(task.name, task.func,
+                              [dependency for dependency in task.depends if dependency in names],
+                              task.resource))
+        return TaskGraph(tasks, self.limits, self.callback)
+
+    @property
+    def progress(self):
+        """Andamento total entre 0 e 1"""
+        if not self.tasks:
+            return 1.0
+        return sum(1.0 if task.state in FINAL_STATES else task.progress
+                   for task in self.tasks.values()) / len(self.tasks)
+
+    def cancel(self):
+        """Não inicia mais tarefas; as em execução terminam normalmente"""
+        with self._condition:
+            self.cancelled = True
+            self._condition.notify_all()
+
+    def _notify(self, task):
+        if self.callback:
+            try:
+                self.callback(task)
+            except Exception as e:
+                logger.debug(f"Erro no callback do grafo de tarefas: {e}")
+
+    def _execute(self, task):
+        start = time.monotonic()
+
+        def progress(fraction):
+            task.progress = min(max(fraction, 0.0), 1.0)
+            self._notify(task)
+
+        try:
+            task.func(progress)
+            state = DONE
+        except TaskCancelled:
+            state = CANCELLED
+        except Exception as e:
+            logger.error(f"Erro na tarefa {task.name}: {e}")
+            task.error = str(e)
+            state = FAILED
+        task.duration = time.monotonic() - start
+        with self._condition:
+            task.state = state
+            self._condition.notify_all()
+        logger.info(f"Tarefa {task.name}: {state} em {task.duration:.1f}s")
+        self._notify(task)
+
+    def _next_tasks(self, running):
+        """Marca as tarefas que não podem mais rodar e retorna as prontas"""
+        ready = []
+        changed = []
+        for task in self.tasks.values():
+            if task.state != PENDING:
+                continue
+            if self.cancelled:
+                task.state = CANCELLED
+                changed.append(task)
+                continue
+            states = [self.tasks[name].state for name in task.depends]
+            if any(state in (FAILED, SKIPPED, CANCELLED) for state in states):
+                task.state = SKIPPED
+                changed.append(task)
+            elif all(state == DONE for state in states):
+                limit = self.limits.get(task.resource, 1)
+                if running.get(task.resource, 0) < limit:
+                    running[task.resource] = running.get(task.resource, 0) + 1
+                    task.state = RUNNING
+                    ready.append(task)
+        return ready, changed
+
+    def run(self):
+        """Executa o grafo e retorna {nome: tarefa}"""
+        workers = max(1, min(len(self.tasks), sum(self.limits.values())))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='adf-task') as executor:
+            while True:
+                with self._condition:
+                    running = {}
+                    for task in self.tasks.values():
+                        if task.state == RUNNING:
+                            running[task.resource] = running.get(task.resource, 0) + 1
+                    ready, changed = self._next_tasks(running)
+                    finished = not ready and not running and not changed
+                    if not ready and running and not changed:
+                        self._condition.wait()
+
+                for task in changed:
+                    self._notify(task)
+                if finished:
+                    break
+                for task in ready:
+                    self._notify(task)
+                    executor.submit(self._execute, task)
+        return self.tasks
@@ -0,0 +1,154 @@
+"""
+Testes do armazenamento deduplicado (src/utils/chunkstore.py).
+"""
+
+import os
+import random
+
+import pytest
+
+from src.utils import chunkstore
+from src.utils.chunkstore import ChunkStore, CHUNK_MAX_SIZE, chunk_file, chunk_range
+
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Pasta de origem com um arquivo grande (vários blocos), um pequeno e um vazio"""
+    rng = random.Random(1)
+    folder = tmp_path / 'dados'
+    write_file(str(folder / 'grande.bin'), rng.randbytes(3 * CHUNK_MAX_SIZE))
+    write_file(str(folder / 'sub' / 'texto.txt'), b'ADF System Manager\n' * 1000)
+    write_file(str(folder / 'vazio.txt'), b'')
+    return folder
+
+
+def read_tree(folder):
+    """Conteúdo de todos os arquivos da pasta, por caminho relativo"""
+    files = {}
+    for root, _, filenames in os.walk(folder):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, folder)] = f.read()
+    return files
+
+
+def test_round_trip(tmp_path, source):
+    store = ChunkStore(str(tmp_path / 'repo'))
+    snapshot = store.create_snapshot('s1', [str(source)], max_workers=1)
+    assert snapshot['stats']['files'] == 3
+    assert len(snapshot['files']['dados/grande.bin'.replace('/', os.sep)]['chunks']) > 1
+
+    # Reabre o repositório para ler só o que foi persistido
+    store = ChunkStore(str(tmp_path / 'repo'))
+    result = store.restore_snapshot('s1', str(tmp_path / 'restaurado'))
+    assert result['restored'] == 3
+    assert read_tree(tmp_path / 'restaurado' / 'dados') == read_tree(source)
+
+
+def test_unchanged_files_are_not_stored_again(tmp_path, source):
+    store = ChunkStore(str(tmp_path / 'repo'))
+    store.create_snapshot('s1', [str(source)], max_workers=1)
+    snapshot = store.create_snapshot('s2', [str(source)], max_workers=1)
+    assert snapshot['stats']['unchanged_files'] == 3
+    assert snapshot['stats']['stored_bytes'] == 0
+
+
+def test_changed_file_is_not_stored(tmp_path, source):
+    path = str(source / 'grande.bin')
+    entry = {'size': os.path.getsize(path)}
+
+    # O arquivo cresce entre o os.stat da varredura e a leitura
+    with open(path, 'ab') as f:
+        f.write(b'\0' * 1024)
+    chunks = chunk_range(path, 0, entry['size'])
+
+    store = ChunkStore(str(tmp_path / 'repo'))
+    stats = {'stored_bytes': 0, 'new_chunks': 0, 'new_bytes': 0}
+    with pytest.raises(IOError):
+        store._store_file_chunks(path, entry, chunks, stats)
+    assert not store.has_chunk(chunks[0][2])
+
+
+def test_vectorized_cut_points_match_byte_loop(source, monkeypatch):
+    if chunkstore.numpy is None:
+        pytest.skip("numpy não instalado")
+    path = str(source / 'grande.bin')
+    vectorized = chunk_file(path)
+
+    monkeypatch.setattr(chunkstore, 'numpy', None)
+    assert chunk_file(path) == vectorized
+
+
+def test_segments_resync_to_sequential_cuts(tmp_path, source, monkeypatch):
+    path = str(source / 'grande.bin')
+    expected = [digest for _, digest in chunk_file(path)]
+
+    # Trechos pequenos e desalinhados para forçar a ressincronização
+    monkeypatch.setattr(chunkstore, 'SEGMENT_SIZE', CHUNK_MAX_SIZE // 3 + 12345)
+    store = ChunkStore(str(tmp_path / 'repo'))
+    snapshot = store.create_snapshot('s1', [str(source)], max_workers=2)
+    assert snapshot['files'][os.path.join('dados', 'grande.bin')]['chunks'] == expected
+
+    result = store.restore_snapshot('s1', str(tmp_path / 'restaurado'))
+    assert result['restored'] == 3
+    assert read_tree(tmp_path / 'restaurado' / 'dados') == read_tree(source)
+
+
+def test_corrupted_chunk_fails_only_its_file(tmp_path, source):
+    store = ChunkStore(str(tmp_path / 'repo'))
+    snapshot = store.create_snapshot('s1', [str(source)], max_workers=1)
+    name = os.path.join('dados', 'sub', 'texto.txt')
+    digest = snapshot['files'][name]['chunks'][0]
+
+    # Troca um byte do bloco no pacote
+    pack_name, offset = store.index[digest][:2]
+    with open(os.path.join(store.packs_dir, pack_name), 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    result = store.restore_snapshot('s1', str(tmp_path / 'restaurado'))
+    assert result['errors'] == 1
+    assert result['failed'] == [name]
+    assert result['restored'] == 2
+    assert not os.path.exists(tmp_path / 'restaurado' / name)
+
+
+def test_skip_unchanged_compares_chunks(tmp_path, source):
+    store = ChunkStore(str(tmp_path / 'repo'))
+    store.create_snapshot('s1', [str(source)], max_workers=1)
+    store.restore_snapshot('s1', str(tmp_path / 'restaurado'))
+
+    # Mesmo tamanho e data, conteúdo diferente: precisa ser regravado
+    path = tmp_path / 'restaurado' / 'dados' / 'sub' / 'texto.txt'
+    st = os.stat(path)
+    path.write_bytes(path.read_bytes().upper())
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    result = store.restore_snapshot('s1', str(tmp_path / 'restaurado'), skip_unchanged=True)
+    assert result['restored'] == 1
+    assert result['skipped'] == 2
+    assert read_tree(tmp_path / 'restaurado' / 'dados') == read_tree(source)
+
+
+def test_restore_stays_inside_target(tmp_path, source):
+    store = ChunkStore(str(tmp_path / 'repo'))
+    snapshot = store.create_snapshot('s1', [str(source)], max_workers=1)
+
+    # Snapshot adulterado com um caminho que sobe para fora do destino
+    name = os.path.join('dados', 'vazio.txt')
+    snapshot['files'] = {os.path.join('..', 'fora.txt'): snapshot['files'][name]}
+    store._write_json(os.path.join(store.snapshots_dir, 's2.json'), snapshot)
+
+    result = store.restore_snapshot('s2', str(tmp_path / 'restaurado'))
+    assert result['restored'] == 1
+    assert not os.path.exists(tmp_path / 'fora.txt')
+    assert os.path.exists(tmp_path / 'restaurado' / 'fora.txt')
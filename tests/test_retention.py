@@ -0,0 +1,76 @@
+"""
+Testes da política de retenção de backups (src/utils/retention.py).
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from src.utils.fastcopy import COPY_JOURNAL_NAME
+from src.utils.retention import BACKUP_DATE_FORMAT, apply_retention, select_kept
+
+
+def backup_sets(*dates):
+    """Conjuntos de backup com as datas informadas, do mais novo ao mais antigo"""
+    return [
+        {'name': f"backup_{created.strftime(BACKUP_DATE_FORMAT)}", 'created': created}
+        for created in sorted(dates, reverse=True)
+    ]
+
+
+def names(*dates):
+    return {f"backup_{created.strftime(BACKUP_DATE_FORMAT)}" for created in dates}
+
+
+def test_count_keeps_newest():
+    dates = [datetime(2024, 3, 1) + timedelta(hours=i) for i in range(10)]
+    sets = backup_sets(*dates)
+    assert select_kept(sets, 'count', max_backups=3) == names(*dates[-3:])
+    # O mais recente é mantido mesmo com limite zero
+    assert select_kept(sets, 'count', max_backups=0) == names(dates[-1])
+    assert select_kept([], 'count') == set()
+
+
+def test_gfs_across_day_week_and_month_boundaries():
+    monday_late = datetime(2024, 3, 11, 10, 0)
+    monday_early = datetime(2024, 3, 11, 8, 0)
+    sunday = datetime(2024, 3, 10, 23, 59)       # dia e semana ISO anteriores
+    march_first = datetime(2024, 3, 1, 0, 1)      # mesma semana de fevereiro 29
+    february_last = datetime(2024, 2, 29, 23, 59)
+    january = datetime(2024, 1, 31, 12, 0)
+    sets = backup_sets(monday_late, monday_early, sunday, march_first, february_last, january)
+
+    # Dias: 11 e 10; semanas: 11 e 10; meses: março e fevereiro
+    kept = select_kept(sets, 'gfs', daily=2, weekly=2, monthly=2)
+    assert kept == names(monday_late, sunday, february_last)
+
+    # Uma semana a mais alcança a semana 9, com o backup mais novo dela
+    kept = select_kept(sets, 'gfs', daily=2, weekly=3, monthly=2)
+    assert kept == names(monday_late, sunday, march_first, february_last)
+
+    # Um mês a mais alcança janeiro
+    kept = select_kept(sets, 'gfs', daily=1, weekly=1, monthly=3)
+    assert kept == names(monday_late, february_last, january)
+
+
+def test_gfs_always_keeps_newest():
+    sets = backup_sets(datetime(2024, 3, 11), datetime(2024, 3, 10))
+    assert select_kept(sets, 'gfs', daily=0, weekly=0, monthly=0) == names(datetime(2024, 3, 11))
+
+
+def test_incomplete_copies_are_never_deleted(tmp_path):
+    for day in range(1, 5):
+        os.makedirs(tmp_path / f"backup_2024030{day}_120000")
+    # Cópia interrompida mais antiga que todas as outras
+    interrupted = tmp_path / 'backup_20240220_120000'
+    os.makedirs(interrupted)
+    (interrupted / COPY_JOURNAL_NAME).write_text('')
+
+    result = apply_retention(str(tmp_path), 'count', max_backups=1)
+    assert result['kept'] == ['backup_20240304_120000']
+    assert sorted(result['deleted']) == [f"backup_2024030{day}_120000" for day in range(1, 4)]
+    assert interrupted.name not in result['deleted']
+    assert interrupted.is_dir()
+
+    result = apply_retention(str(tmp_path), 'gfs', daily=0, weekly=0, monthly=0)
+    assert result['deleted'] == []
+    assert interrupted.is_dir()